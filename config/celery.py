@@ -5,7 +5,11 @@ from celery.schedules import crontab
 from dbt_copilot_python.celery_health_check import healthcheck
 from django.conf import settings
 
-from web.mail.constants import SEND_AUTHORITY_EXPIRING_SECTION_5_TASK_NAME
+from web.mail.constants import (
+    DISPATCH_OUTBOX_EMAILS_TASK_NAME,
+    SEND_AUTHORITY_EXPIRING_SECTION_5_TASK_NAME,
+)
+from web.reports.constants import REFRESH_REPORT_ROLLUPS_TASK_NAME
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
@@ -39,6 +43,8 @@ def get_icms_prod_beat_schedule():
             "task": SEND_AUTHORITY_EXPIRING_SECTION_5_TASK_NAME,
             "schedule": crontab(hour=7),
         },
+        **get_report_rollups_beat_schedule(),
+        **get_email_outbox_beat_schedule(),
     }
 
 
@@ -53,4 +59,33 @@ def get_imcs_dev_beat_schedule():
             "task": "web.tasks.check_celery_beat_running",
             "schedule": crontab(minute="*/15"),
         },
+        **get_report_rollups_beat_schedule(),
+        **get_email_outbox_beat_schedule(),
+    }
+
+
+def get_report_rollups_beat_schedule():
+    """Refresh the recent report rollups hourly and all of them overnight."""
+
+    return {
+        "refresh_recent_report_rollups": {
+            "task": REFRESH_REPORT_ROLLUPS_TASK_NAME,
+            "schedule": crontab(minute=10),
+        },
+        "refresh_all_report_rollups": {
+            "task": REFRESH_REPORT_ROLLUPS_TASK_NAME,
+            "schedule": crontab(hour=2, minute=30),
+            "kwargs": {"full": True},
+        },
+    }
+
+
+def get_email_outbox_beat_schedule():
+    """Queue any emails left in the outbox every minute."""
+
+    return {
+        "dispatch_outbox_emails": {
+            "task": DISPATCH_OUTBOX_EMAILS_TASK_NAME,
+            "schedule": crontab(),
+        },
     }
@@ -57,6 +57,8 @@ class CloudFoundryEnvironment(BaseSettings):
     )
 
     database_url: CFPostgresDSN
+    # Optional read replica used by search and reports (see web.utils.replica)
+    database_replica_url: CFPostgresDSN | None = None
 
     # Cloud Foundry Environment Variables
     vcap_services: VCAPServices | None = None
@@ -142,6 +144,7 @@ class CloudFoundryEnvironment(BaseSettings):
     data_migration_email_domain_exclude: str = ""
 
     workbasket_per_page: int = 100
+    pdf_browser_max_renders: int = 100
     set_inactive_app_types_active: bool = False
     show_db_queries: bool = False
     show_debug_toolbar: bool = False
@@ -194,7 +197,12 @@ class CloudFoundryEnvironment(BaseSettings):
     @computed_field  # type: ignore[misc]
     @property
     def database_config(self) -> dict:
-        return {"default": dj_database_url.parse(str(self.database_url))}
+        config = {"default": dj_database_url.parse(str(self.database_url))}
+
+        if self.database_replica_url:
+            config["replica"] = dj_database_url.parse(str(self.database_replica_url))
+
+        return config
 
     @computed_field  # type: ignore[misc]
     @property
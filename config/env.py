@@ -112,6 +112,7 @@ class DBTPlatformEnvironment(BaseSettings):
     data_migration_email_domain_exclude: str = ""
 
     workbasket_per_page: int = 100
+    pdf_browser_max_renders: int = 100
     set_inactive_app_types_active: bool = False
     show_db_queries: bool = False
     show_debug_toolbar: bool = False
@@ -171,10 +172,18 @@ class DBTPlatformEnvironment(BaseSettings):
         if self.build_step:
             return {"default": {}}
 
-        return {
+        config = {
             "default": dj_database_url.parse(database_url_from_env("DATABASE_CREDENTIALS")),
         }
 
+        # Optional read replica used by search and reports (see web.utils.replica)
+        if "DATABASE_REPLICA_CREDENTIALS" in os.environ:
+            config["replica"] = dj_database_url.parse(
+                database_url_from_env("DATABASE_REPLICA_CREDENTIALS")
+            )
+
+        return config
+
     @computed_field  # type: ignore[misc]
     @property
     def s3_bucket_config(self) -> dict:
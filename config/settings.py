@@ -57,6 +57,7 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "django.contrib.sites",
+    "django.contrib.postgres",
     # STAFF-SSO client app
     "authbroker_client",
 ]
@@ -84,6 +85,7 @@ ROOT_URLCONF = "config.urls"
 DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
 
 DATABASES = env.database_config
+DATABASE_ROUTERS = ["web.utils.replica.ReplicaRouter"]
 
 # https://docs.djangoproject.com/en/4.2/ref/settings/#std-setting-FORM_RENDERER
 FORM_RENDERER = "django.forms.renderers.TemplatesSetting"
@@ -373,6 +375,9 @@ DATA_MIGRATION_EMAIL_DOMAIN_EXCLUDE = env.data_migration_email_domain_exclude
 # Workbasket pagination setting
 WORKBASKET_PER_PAGE = env.workbasket_per_page
 
+# Number of PDFs rendered by a Chromium browser before it is relaunched
+PDF_BROWSER_MAX_RENDERS = env.pdf_browser_max_renders
+
 # Set to true to mark inactive application types active when running add_dummy_data.py
 SET_INACTIVE_APP_TYPES_ACTIVE = env.set_inactive_app_types_active
 
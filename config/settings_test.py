@@ -16,6 +16,10 @@ RATELIMIT_ENABLE = False
 FILE_UPLOAD_HANDLERS = ("web.tests.file_upload_handler.DummyFileUploadHandler",)  # type: ignore[assignment]
 APP_ENV = "test"
 
+# A second connection to the test database standing in for the read replica (see the replica_db
+# fixture). Like a lagging replica, it can't see data written by a test that isn't committed.
+DATABASES["test_replica"] = DATABASES["default"] | {"TEST": {"MIRROR": "default"}}
+
 # Add so we can test the bypass chief views.
 ALLOW_BYPASS_CHIEF_NEVER_ENABLE_IN_PROD = True
 
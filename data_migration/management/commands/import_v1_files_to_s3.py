@@ -4,7 +4,7 @@ from io import BytesIO
 from typing import Any
 
 from botocore.exceptions import ClientError
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.core.serializers.json import DjangoJSONEncoder
 from tqdm import tqdm
 
@@ -24,6 +24,8 @@ def get_query_last_run_key(query_name: str) -> str:
 
 class Command(BaseCommand):
     DATETIME_FORMAT: str = "%Y-%m-%d %H:%M:%S"
+    part_size: int = s3_web.FILE_CHUNK_SIZE
+    upload_concurrency: int = s3_web.S3_UPLOAD_MAX_CONCURRENCY
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -58,6 +60,18 @@ class Command(BaseCommand):
             type=str,
             default=None,
         )
+        parser.add_argument(
+            "--part-size",
+            help="Size (MiB) of the parts used to upload large files, must be at least 5",
+            type=int,
+            default=s3_web.FILE_CHUNK_SIZE // 1024**2,
+        )
+        parser.add_argument(
+            "--upload-concurrency",
+            help="Number of parts of a large file uploaded at the same time",
+            type=int,
+            default=s3_web.S3_UPLOAD_MAX_CONCURRENCY,
+        )
         parser.add_argument(
             "--count-only",
             help="Retrieves a count of number of files that will be processed per query",
@@ -70,7 +84,12 @@ class Command(BaseCommand):
         return OracleDBProcessor(options["limit"], options["queries"], options["batchsize"])
 
     def handle(self, *args: Any, **options: Any) -> None:
+        if options["part_size"] < 5:
+            raise CommandError("The part size must be at least 5 MiB")
+
         self.run_data_batchsize = options["run_data_batchsize"]
+        self.part_size = options["part_size"] * 1024**2
+        self.upload_concurrency = options["upload_concurrency"]
         self.db = self.get_db(options)
         self.process_queries(options["ignore_last_run"], options["count_only"])
 
@@ -93,7 +112,7 @@ class Command(BaseCommand):
 
         For a given query
          - Selects all files to be added to s3
-         - Uploads blob file data to s3, if the file is larger than 5 MiB the file is uploaded in chunks
+         - Uploads blob file data to s3, if the file is larger than the part size the file is uploaded in chunks
         """
         number_of_files_to_be_processed = min(row_count, self.db.limit or row_count)
         data_dict = self.get_initial_run_data_dict(
@@ -103,7 +122,6 @@ class Command(BaseCommand):
         )
 
         pbar = tqdm(total=number_of_files_to_be_processed, desc=query_model.query_name)
-        file_size_limit = 5 * 1024**2
         sql = self.db.get_sql(query_model)
         with self.db.execute_query(sql, query_parameters) as rows:
             try:
@@ -113,8 +131,13 @@ class Command(BaseCommand):
                         # Required for report files, coverts clob to bytes stream so can be treated like other files
                         data = obj["CLOB_DATA"].read().encode()
                         obj["BLOB_DATA"] = BytesIO(data)
-                    if obj["FILE_SIZE"] > file_size_limit:
-                        s3_web.upload_file_obj_to_s3_in_parts(obj["BLOB_DATA"], obj["PATH"])
+                    if obj["FILE_SIZE"] > self.part_size:
+                        s3_web.upload_file_obj_to_s3_in_parts(
+                            obj["BLOB_DATA"],
+                            obj["PATH"],
+                            part_size=self.part_size,
+                            max_concurrency=self.upload_concurrency,
+                        )
                     else:
                         s3_web.upload_file_obj_to_s3(obj["BLOB_DATA"], obj["PATH"])
                     pbar.update(1)
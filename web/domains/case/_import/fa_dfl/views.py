@@ -296,7 +296,7 @@ def view_goods_certificate(
 
     # Permission checks in view_application_file
     return view_application_file(
-        request.user,
+        request,
         application,
         application.goods_certificates.filter(is_active=True),
         document_pk,
@@ -640,7 +640,7 @@ def view_upload_document(
     report_firearm: DFLSupplementaryReportFirearm = report.firearms.get(pk=report_firearm_pk)
     document = report_firearm.document
 
-    return view_application_file(request.user, application, File.objects, document.pk)
+    return view_application_file(request, application, File.objects, document.pk)
 
 
 @login_required
@@ -240,7 +240,7 @@ def view_document(
     application: IronSteelApplication = get_object_or_404(IronSteelApplication, pk=application_pk)
 
     return view_application_file(
-        request.user, application, application.supporting_documents, document_pk
+        request, application, application.supporting_documents, document_pk
     )
 
 
@@ -318,7 +318,7 @@ def view_certificate(
 ) -> HttpResponse:
     application = get_object_or_404(IronSteelApplication, pk=application_pk)
 
-    return view_application_file(request.user, application, application.certificates, document_pk)
+    return view_application_file(request, application, application.certificates, document_pk)
 
 
 @require_POST
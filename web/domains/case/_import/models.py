@@ -1,9 +1,11 @@
 import uuid
+from typing import Any
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
-from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.indexes import BTreeIndex, GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 
 from web.domains.case.models import ApplicationBase, DocumentPackBase, DownloadLinkBase
@@ -136,6 +138,16 @@ class ImportApplication(ApplicationBase):
             models.Index(
                 models.Q(submit_datetime__isnull=False), name="IA_submit_datetime_notnull_idx"
             ),
+            # Used for keyset pagination in search
+            models.Index(fields=["-submit_datetime", "-process_ptr"], name="IA_search_order_idx"),
+            # Used for case reference search (see web.utils.search.api.get_wildcard_filter)
+            models.Index(
+                OpClass(Upper("reference"), name="text_pattern_ops"),
+                name="IA_search_ref_upper_idx",
+            ),
+            GinIndex(
+                fields=["reference"], name="IA_search_ref_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
         ]
 
     applicant_reference = models.CharField(
@@ -411,6 +423,14 @@ class ImportApplicationLicence(DocumentPackBase):
         "CaseDocumentReference", related_query_name="import_application_licences"
     )
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+
+        # Keep the search results for the application up to date.
+        from web.domains.case.tasks import schedule_search_row_refresh
+
+        schedule_search_row_refresh([self.import_application_id])
+
     def __str__(self):
         ia_pk = self.import_application_id
         st = self.status
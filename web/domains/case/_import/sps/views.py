@@ -201,7 +201,7 @@ def view_supporting_document(
     )
 
     return view_application_file(
-        request.user, application, application.supporting_documents, document_pk
+        request, application, application.supporting_documents, document_pk
     )
 
 
@@ -295,7 +295,7 @@ def view_contract_document(
         return redirect(reverse("import:sps:edit", kwargs={"application_pk": application_pk}))
 
     return view_application_file(
-        request.user,
+        request,
         application,
         PriorSurveillanceContractFile.objects,
         application.contract_file_id,
@@ -130,7 +130,7 @@ def view_supporting_document(
     application = get_object_or_404(WoodQuotaApplication, pk=application_pk)
 
     return view_application_file(
-        request.user, application, application.supporting_documents, document_pk
+        request, application, application.supporting_documents, document_pk
     )
 
 
@@ -210,9 +210,7 @@ def view_contract_document(
 ) -> HttpResponse:
     application = get_object_or_404(WoodQuotaApplication, pk=application_pk)
 
-    return view_application_file(
-        request.user, application, application.contract_documents, document_pk
-    )
+    return view_application_file(request, application, application.contract_documents, document_pk)
 
 
 @require_POST
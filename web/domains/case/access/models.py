@@ -17,7 +17,10 @@ class AccessRequest(Process):
     RESPONSES = ((APPROVED, "Approved"), (REFUSED, "Refused"))
 
     class Meta:
-        indexes = [models.Index(fields=["status"], name="AccR_status_idx")]
+        indexes = [
+            models.Index(fields=["status"], name="AccR_status_idx"),
+            models.Index(fields=["submit_datetime"], name="AccR_submit_datetime_idx"),
+        ]
         ordering = ["submit_datetime"]
 
     class Statuses(TypedTextChoices):
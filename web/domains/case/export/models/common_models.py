@@ -1,7 +1,10 @@
+from typing import Any
+
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
-from django.contrib.postgres.indexes import BTreeIndex
+from django.contrib.postgres.indexes import BTreeIndex, GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
 
 from web.domains.case.models import ApplicationBase, DocumentPackBase
@@ -79,6 +82,14 @@ class ExportApplication(ExportApplicationABC, ApplicationBase):
                 opclasses=["text_pattern_ops"],
             ),
             models.Index(fields=["-submit_datetime"], name="EA_submit_datetime_idx"),
+            # Used for case reference search (see web.utils.search.api.get_wildcard_filter)
+            models.Index(
+                OpClass(Upper("reference"), name="text_pattern_ops"),
+                name="EA_search_ref_upper_idx",
+            ),
+            GinIndex(
+                fields=["reference"], name="EA_search_ref_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
         ]
 
     application_type = models.ForeignKey(
@@ -193,6 +204,14 @@ class ExportApplicationCertificate(DocumentPackBase):
     # Used in workbasket to clear certificates
     cleared_by = models.ManyToManyField("web.User")
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+
+        # Keep the search results for the application up to date.
+        from web.domains.case.tasks import schedule_search_row_refresh
+
+        schedule_search_row_refresh([self.export_application_id])
+
     def __str__(self):
         ea_pk, st, ca = (self.export_application_id, self.status, self.created_at)
         return f"ExportApplicationCertificate(export_application_id={ea_pk}, status={st}, created_at={ca})"
@@ -1025,7 +1025,7 @@ def view_gmp_document(
     )
 
     return view_application_file(
-        request.user, application, application.supporting_documents, document_pk
+        request, application, application.supporting_documents, document_pk
     )
 
 
@@ -1,15 +1,20 @@
 import uuid
 from random import randint
+from typing import Any
 
 from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db.models import Q, QuerySet
+from django.db.models.functions import Upper
 
 from web.flow.models import Process
 from web.mail.constants import CaseEmailCodes
+from web.models.shared import SearchRowFieldsMixin
 from web.types import TypedTextChoices
 
 from .shared import ImpExpStatus
@@ -194,7 +199,7 @@ class WithdrawApplication(models.Model):
         ]
 
 
-class ApplicationBase(Process):
+class ApplicationBase(SearchRowFieldsMixin, Process):
     """Common base class for Import/ExportApplication. Needed because some
     common code needs a Django model class to work with (see
     ResponsePreparationForm).
@@ -246,6 +251,15 @@ class ApplicationBase(Process):
         """Get the edit view name."""
         raise NotImplementedError
 
+    # Fields that change the search results (or search actions) of the application.
+    # Other fields are refreshed when the application is submitted (a status change).
+    SEARCH_ROW_FIELDS = ("status", "case_owner_id", "reference", "decision")
+
+    def refresh_search_rows(self, created: bool) -> None:
+        from web.domains.case.tasks import schedule_search_row_refresh
+
+        schedule_search_row_refresh([self.pk])
+
     def get_reference(self) -> str:
         return self.reference or self.DEFAULT_REF
 
@@ -393,8 +407,102 @@ class CaseDocumentReference(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["content_type", "object_id"]),
+            # Used for licence / certificate reference search
+            # (see web.utils.search.api.get_wildcard_filter)
+            models.Index(
+                OpClass(Upper("reference"), name="text_pattern_ops"),
+                name="CDR_search_ref_upper_idx",
+            ),
+            GinIndex(
+                fields=["reference"], name="CDR_search_ref_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+            # Used to find the licences in CHIEF usage data (see web.domains.chief.views)
+            models.Index(fields=["reference"], name="CDR_reference_idx"),
         ]
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+
+        # Licence and certificate references are shown in the search results.
+        from web.domains.case.tasks import schedule_search_row_refresh
+
+        pack = self.content_object
+        app_pk = getattr(pack, "import_application_id", None) or pack.export_application_id
+        schedule_search_row_refresh([app_pk])
+
     def __str__(self):
         o_id, dt, ref = (self.object_id, self.document_type, self.reference)
         return f"CaseDocumentReference(object_id={o_id}, document_type={dt}, reference={ref})"
+
+
+class ApplicationSearchRow(models.Model):
+    """Search result row for an import or export application.
+
+    Stores the data displayed on the search results page so a page of results can be read
+    with one query rather than rebuilding it from the application tables on every search.
+    Records are refreshed by web.utils.search.api.refresh_search_rows.
+    """
+
+    application = models.OneToOneField(
+        "web.Process", on_delete=models.CASCADE, primary_key=True, related_name="search_row"
+    )
+
+    case_type = models.CharField(max_length=6, choices=[("import", "Import"), ("export", "Export")])
+    process_type = models.CharField(max_length=50)
+    reference = models.CharField(max_length=100, null=True)
+    status = models.CharField(max_length=30, choices=ImpExpStatus.choices)
+
+    # Submitted date for import applications and submitted or created date for export applications
+    order_by_datetime = models.DateTimeField(null=True)
+
+    # The search result row without the actions (see web.utils.search.types.ResultRow)
+    result_data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    # Application fields used to get the search actions available to the user performing a search
+    action_data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        app_pk, ct, ref = (self.application_id, self.case_type, self.reference)
+        return f"ApplicationSearchRow(application_id={app_pk}, case_type={ct}, reference={ref})"
+
+
+class SearchResultsSpreadsheet(models.Model):
+    """Spreadsheet of application search results generated by a Celery task.
+
+    See web.domains.case.tasks.create_search_results_spreadsheet.
+    """
+
+    class Status(TypedTextChoices):
+        SUBMITTED = ("SUBMITTED", "Submitted")
+        PROCESSING = ("PROCESSING", "Processing")
+        COMPLETED = ("COMPLETED", "Completed")
+        FAILED = ("FAILED", "Failed")
+
+    case_type = models.CharField(max_length=6, choices=[("import", "Import"), ("export", "Export")])
+
+    # The search form data used to find the applications
+    search_data = models.JSONField(encoder=DjangoJSONEncoder)
+
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.PROTECT, related_name="+"
+    )
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.SUBMITTED)
+
+    # Progress of the task writing the spreadsheet
+    total_rows = models.IntegerField(null=True)
+    processed_rows = models.IntegerField(default=0)
+
+    document = models.OneToOneField("web.File", on_delete=models.CASCADE, null=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True)
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in [self.Status.COMPLETED, self.Status.FAILED]
+
+    def __str__(self):
+        pk, ct, st = (self.pk, self.case_type, self.status)
+        return f"SearchResultsSpreadsheet(pk={pk}, case_type={ct}, status={st})"
@@ -1,10 +1,21 @@
+import functools
 import io
+import operator
+import tempfile
+from collections.abc import Iterator
 
 from celery import chord
 from django.db import transaction
+from django.db.models import Q
+from django.http import QueryDict
 from django.utils import timezone
 
 from config.celery import app
+from web.domains.case.forms_search import (
+    ExportSearchAdvancedForm,
+    ImportSearchAdvancedForm,
+    get_search_terms_from_form,
+)
 from web.domains.case.services import case_progress, document_pack
 from web.domains.case.shared import ImpExpStatus
 from web.domains.case.types import ImpOrExp
@@ -13,16 +24,31 @@ from web.domains.chief import client
 from web.mail.emails import send_completed_application_process_notifications
 from web.models import (
     CaseDocumentReference,
+    ExportApplication,
     File,
+    ImportApplication,
     Process,
+    SearchResultsSpreadsheet,
     Task,
     User,
     VariationRequest,
 )
+from web.reports.constants import CELERY_REPORTS_QUEUE_NAME
 from web.types import DocumentTypes
 from web.utils.pdf import PdfGenerator, signer
-from web.utils.s3 import delete_file_from_s3, upload_file_obj_to_s3
+from web.utils.s3 import (
+    delete_file_from_s3,
+    upload_file_obj_to_s3,
+    upload_file_obj_to_s3_in_parts,
+)
+from web.utils.search import (
+    iter_search_results,
+    refresh_search_rows,
+    write_search_results_spreadsheet,
+)
+from web.utils.search.types import ResultRow
 from web.utils.sentry import capture_exception, capture_message
+from web.utils.spreadsheet import MIMETYPE
 
 
 def create_case_document_pack(application: ImpOrExp, user: User) -> None:
@@ -215,6 +241,133 @@ def upload_case_document_file(
     cdr.save()
 
 
+@app.task(name="web.domains.case.tasks.refresh_search_rows_task")
+def refresh_search_rows_task(app_pks: list[int]) -> None:
+    refresh_search_rows(app_pks)
+
+
+def schedule_search_row_refresh(app_pks: list[int]) -> None:
+    """Refresh the search rows of the supplied applications when the current transaction commits."""
+
+    transaction.on_commit(lambda: refresh_search_rows_task.delay(app_pks))
+
+
+# Number of applications refreshed at a time when a record shown in many search rows changes.
+RELATED_SEARCH_ROWS_BATCH_SIZE = 500
+
+
+@app.task(name="web.domains.case.tasks.refresh_related_search_rows_task")
+def refresh_related_search_rows_task(case_type: str | None, lookups: list[str], pk: int) -> None:
+    """Refresh the search rows of every application linked to a record by one of the lookups."""
+
+    app_models: list[type[ImportApplication] | type[ExportApplication]] = []
+    if case_type in ("import", None):
+        app_models.append(ImportApplication)
+    if case_type in ("export", None):
+        app_models.append(ExportApplication)
+
+    query = functools.reduce(operator.or_, (Q(**{lookup: pk}) for lookup in lookups))
+
+    for model in app_models:
+        app_pks = list(model.objects.filter(query).order_by("pk").values_list("pk", flat=True))
+
+        for i in range(0, len(app_pks), RELATED_SEARCH_ROWS_BATCH_SIZE):
+            refresh_search_rows(app_pks[i : i + RELATED_SEARCH_ROWS_BATCH_SIZE])
+
+
+def schedule_related_search_row_refresh(case_type: str | None, lookups: list[str], pk: int) -> None:
+    """Refresh the search rows of the applications linked to a record when the current transaction commits.
+
+    :param case_type: "import", "export" or None for both
+    :param lookups: Application fields linking to the record (e.g. ["importer", "agent"])
+    :param pk: Primary key of the record
+    """
+
+    transaction.on_commit(lambda: refresh_related_search_rows_task.delay(case_type, lookups, pk))
+
+
+# Number of search records fetched at a time when writing a search results spreadsheet.
+SEARCH_SPREADSHEET_CHUNK_SIZE = 500
+
+
+@app.task(
+    name="web.domains.case.tasks.create_search_results_spreadsheet",
+    queue=CELERY_REPORTS_QUEUE_NAME,
+)
+def create_search_results_spreadsheet(spreadsheet_pk: int) -> None:
+    spreadsheet = SearchResultsSpreadsheet.objects.select_related("requested_by").get(
+        pk=spreadsheet_pk
+    )
+    spreadsheet.status = SearchResultsSpreadsheet.Status.PROCESSING
+    spreadsheet.save(update_fields=["status"])
+
+    try:
+        write_search_results_spreadsheet_file(spreadsheet)
+        spreadsheet.status = SearchResultsSpreadsheet.Status.COMPLETED
+
+    except Exception:
+        capture_exception()
+        spreadsheet.status = SearchResultsSpreadsheet.Status.FAILED
+
+    spreadsheet.finished_at = timezone.now()
+    spreadsheet.save(update_fields=["status", "finished_at"])
+
+
+def write_search_results_spreadsheet_file(spreadsheet: SearchResultsSpreadsheet) -> None:
+    """Write every application matching the spreadsheet search to an xlsx file stored in s3.
+
+    Search records are fetched SEARCH_SPREADSHEET_CHUNK_SIZE at a time and written to a
+    temporary file in constant memory mode, so memory use doesn't grow with the number of rows.
+    """
+
+    form_class = (
+        ImportSearchAdvancedForm if spreadsheet.case_type == "import" else ExportSearchAdvancedForm
+    )
+    search_data = QueryDict(mutable=True)
+    for key, values in spreadsheet.search_data.items():
+        search_data.setlist(key, values)
+
+    form = form_class(search_data)
+
+    if not form.is_valid():
+        raise ValueError(f"Invalid search data: {form.errors.as_json()}")
+
+    terms = get_search_terms_from_form(spreadsheet.case_type, form)
+
+    def get_records() -> Iterator[ResultRow]:
+        pages = iter_search_results(
+            terms, spreadsheet.requested_by, page_size=SEARCH_SPREADSHEET_CHUNK_SIZE
+        )
+
+        for results in pages:
+            if spreadsheet.total_rows is None:
+                spreadsheet.total_rows = results.total_rows
+
+            yield from results.records
+
+            spreadsheet.processed_rows += len(results.records)
+            spreadsheet.save(update_fields=["total_rows", "processed_rows"])
+
+    # Always store timestamp in UTC (e.g. Don't use datetime_format())
+    time_stamp = timezone.now().strftime("%Y%m%d%H%M%S")
+    filename = f"{spreadsheet.case_type}_application_download_{time_stamp}.xlsx"
+    key = f"SEARCH_RESULTS/{spreadsheet.pk}/{filename}"
+
+    with tempfile.TemporaryFile() as file_obj:
+        write_search_results_spreadsheet(spreadsheet.case_type, get_records(), file_obj)
+        file_size = upload_file_obj_to_s3_in_parts(file_obj, key)
+
+    spreadsheet.document = File.objects.create(
+        is_active=True,
+        filename=filename,
+        content_type=MIMETYPE.XLSX,
+        file_size=file_size,
+        path=key,
+        created_by=spreadsheet.requested_by,
+    )
+    spreadsheet.save(update_fields=["document"])
+
+
 # NOTE: Leaving this here for now as it's useful to easily test celery tasks.
 # def chord_testing(application_id):
 #     callback = on_chord_success.si(application_id).on_error(
@@ -33,6 +33,16 @@ search_urls = [
         views_search.download_spreadsheet,
         name="search-download-spreadsheet",
     ),
+    path(
+        "search-spreadsheet/<int:spreadsheet_pk>/",
+        views_search.search_spreadsheet_detail,
+        name="search-spreadsheet-detail",
+    ),
+    path(
+        "search-spreadsheet/<int:spreadsheet_pk>/download/",
+        views_search.search_spreadsheet_download,
+        name="search-spreadsheet-download",
+    ),
     path(
         "search-reassign-case-owner",
         views_search.reassign_case_owner,
@@ -6,11 +6,13 @@ from django.contrib import messages
 from django.core.exceptions import PermissionDenied
 from django.forms.models import model_to_dict
 from django.http import HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils import timezone
 
 from web.domains.case.services import document_pack, reference
+from web.domains.file.utils import get_file_download_response
 from web.flow.models import ProcessTypes
 from web.mail.emails import send_application_update_response_email
 from web.models import (
@@ -29,7 +31,6 @@ from web.models import (
 from web.permissions import AppChecker
 from web.types import AuthenticatedHttpRequest
 from web.utils import datetime_format
-from web.utils.s3 import get_file_from_s3
 
 from .types import (
     ApplicationsWithCaseEmail,
@@ -56,20 +57,18 @@ def end_process_task(task: Task, user: Optional["User"] = None) -> None:
 
 
 def view_application_file(
-    user: User, application: ImpOrExp, related_file_model: Any, file_pk: int
-) -> HttpResponse:
-    checker = AppChecker(user, application)
+    request: AuthenticatedHttpRequest,
+    application: ImpOrExp,
+    related_file_model: Any,
+    file_pk: int,
+) -> HttpResponseBase:
+    checker = AppChecker(request.user, application)
 
     if not checker.can_view():
         raise PermissionDenied
 
     document = related_file_model.get(pk=file_pk)
-    file_content = get_file_from_s3(document.path)
-
-    response = HttpResponse(content=file_content, content_type=document.content_type)
-    response["Content-Disposition"] = f'attachment; filename="{document.filename}"'
-
-    return response
+    return get_file_download_response(request, document)
 
 
 def get_case_page_title(case_type: str, application: ImpOrExpOrAccess, page: str) -> str:
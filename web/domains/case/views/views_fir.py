@@ -5,6 +5,7 @@ from django.core.exceptions import PermissionDenied
 from django.db import transaction
 from django.db.models import Q
 from django.http import HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
@@ -18,7 +19,7 @@ from web.domains.case.forms import DocumentForm
 from web.domains.case.services import case_progress
 from web.domains.case.types import ImpOrExpOrAccess
 from web.domains.case.utils import get_case_page_title
-from web.domains.file.utils import create_file_model
+from web.domains.file.utils import create_file_model, get_file_download_response
 from web.domains.template.utils import get_fir_template_data
 from web.flow.models import ProcessTypes
 from web.mail.emails import (
@@ -29,7 +30,6 @@ from web.mail.emails import (
 from web.models import AccessRequest, FurtherInformationRequest, User
 from web.permissions import AppChecker, Perms
 from web.types import AuthenticatedHttpRequest
-from web.utils.s3 import get_file_from_s3
 
 from .utils import (
     get_caseworker_view_readonly_status,
@@ -374,7 +374,7 @@ def view_fir_file(
     fir_pk: int,
     file_pk: int,
     case_type: CASE_TYPES,
-) -> HttpResponse:
+) -> HttpResponseBase:
     model_class = get_class_imp_or_exp_or_access(case_type)
     application: ImpOrExpOrAccess = get_object_or_404(model_class, pk=application_pk)
 
@@ -384,12 +384,7 @@ def view_fir_file(
     fir = get_object_or_404(application.further_information_requests, pk=fir_pk)
 
     document = fir.files.get(pk=file_pk)
-    file_content = get_file_from_s3(document.path)
-
-    response = HttpResponse(content=file_content, content_type=document.content_type)
-    response["Content-Disposition"] = f'attachment; filename="{document.filename}"'
-
-    return response
+    return get_file_download_response(request, document)
 
 
 @login_required
@@ -2,6 +2,7 @@ from django.contrib import messages
 from django.contrib.auth.decorators import login_required, permission_required
 from django.db import transaction
 from django.http import HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_GET, require_POST
@@ -10,10 +11,9 @@ from web.domains.case import forms
 from web.domains.case.services import case_progress
 from web.domains.case.types import ImpOrExp
 from web.domains.case.utils import get_case_page_title
-from web.domains.file.utils import create_file_model
+from web.domains.file.utils import create_file_model, get_file_download_response
 from web.permissions import Perms
 from web.types import AuthenticatedHttpRequest
-from web.utils.s3 import get_file_from_s3
 
 from .utils import get_caseworker_view_readonly_status, get_class_imp_or_exp
 
@@ -244,18 +244,13 @@ def view_note_document(
     note_pk: int,
     file_pk: int,
     case_type: str,
-) -> HttpResponse:
+) -> HttpResponseBase:
     model_class = get_class_imp_or_exp(case_type)
 
     application: ImpOrExp = get_object_or_404(model_class, pk=application_pk)
     note = application.case_notes.get(pk=note_pk)
     document = note.files.get(pk=file_pk)
-    file_content = get_file_from_s3(document.path)
-
-    response = HttpResponse(content=file_content, content_type=document.content_type)
-    response["Content-Disposition"] = f'attachment; filename="{document.filename}"'
-
-    return response
+    return get_file_download_response(request, document)
 
 
 @login_required
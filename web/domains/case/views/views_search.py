@@ -9,6 +9,7 @@ from django.db import transaction
 from django.db.models import QuerySet, Window
 from django.db.models.functions import RowNumber
 from django.http import HttpResponse, HttpResponseRedirect
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, render
 from django.urls import reverse
 from django.utils import timezone
@@ -34,13 +35,19 @@ from web.domains.case.forms_search import (
     ImportSearchAdvancedForm,
     ImportSearchForm,
     ReassignmentUserForm,
+    get_search_terms_from_form,
 )
 from web.domains.case.services import case_progress, document_pack, reference
 from web.domains.case.shared import ImpExpStatus
+from web.domains.case.tasks import (
+    create_search_results_spreadsheet,
+    schedule_search_row_refresh,
+)
 from web.domains.cat.forms import CreateCATForm
 from web.domains.cat.models import CertificateApplicationTemplate
 from web.domains.cat.utils import create_cat
 from web.domains.chief import client
+from web.domains.file.utils import get_file_download_response
 from web.flow.models import ProcessTypes
 from web.mail.emails import (
     send_application_reopened_email,
@@ -57,6 +64,7 @@ from web.models import (
     ImportApplication,
     ImportApplicationType,
     Process,
+    SearchResultsSpreadsheet,
     Task,
     User,
     VariationRequest,
@@ -68,11 +76,8 @@ from web.permissions import (
     get_org_obj_permissions,
 )
 from web.types import AuthenticatedHttpRequest
-from web.utils.search import (
-    SearchTerms,
-    get_search_results_spreadsheet,
-    search_applications,
-)
+from web.utils.replica import request_read_your_writes, set_read_your_writes
+from web.utils.search import SearchCursor, SearchTotal, search_applications
 from web.utils.sentry import capture_exception
 
 from .mixins import ApplicationTaskMixin
@@ -105,19 +110,44 @@ def search_cases(
     app_type = "Import" if case_type == "import" else "Certificate"
     show_search_results = False
     total_rows = 0
+    total_rows_capped = False
     search_records = []
     show_application_sub_type = False
+    first_page_url = next_page_url = count_all_url = None
 
     form = form_class(request.GET)
 
     if form.is_valid() and get_results:
         show_search_results = True
-        terms = _get_search_terms_from_form(case_type, form)
-        results = search_applications(terms, request.user)
+        terms = get_search_terms_from_form(case_type, form)
+        cursor = SearchCursor.decode(request.GET.get("cursor", ""))
+        exact_total = request.GET.get("exact_total") == "1"
+        # Later pages reuse the total counted by the first page
+        total = SearchTotal.decode(request.GET.get("total", "")) if cursor else None
+        # Search the default database when the user has just changed an application
+        with request_read_your_writes(request):
+            results = search_applications(
+                terms, request.user, cursor=cursor, exact_total=exact_total, total=total
+            )
 
         total_rows = results.total_rows
+        total_rows_capped = results.total_rows_capped
         search_records = results.records
 
+        if cursor:
+            first_page_url = _get_search_page_url(request, None, exact_total)
+
+        if results.next_cursor:
+            next_page_url = _get_search_page_url(
+                request,
+                results.next_cursor,
+                exact_total,
+                SearchTotal(total_rows, total_rows_capped),
+            )
+
+        if total_rows_capped:
+            count_all_url = _get_search_page_url(request, cursor, exact_total=True)
+
         show_application_sub_type = (
             form.cleaned_data.get("application_type") == ImportApplicationType.Types.FIREARMS
         )
@@ -136,7 +166,11 @@ def search_cases(
         "show_search_results": show_search_results,
         "show_application_sub_type": show_application_sub_type,
         "total_rows": total_rows,
+        "total_rows_capped": total_rows_capped,
         "search_records": search_records,
+        "first_page_url": first_page_url,
+        "next_page_url": next_page_url,
+        "count_all_url": count_all_url,
         "reassignment_search": reassignment_search_enabled and form["reassignment"].value(),
         "reassignment_enabled": reassignment_search_enabled,
     }
@@ -148,6 +182,31 @@ def search_cases(
     )
 
 
+def _get_search_page_url(
+    request: AuthenticatedHttpRequest,
+    cursor: SearchCursor | None,
+    exact_total: bool,
+    total: SearchTotal | None = None,
+) -> str:
+    """Return the current search url starting from the supplied cursor."""
+
+    query_params = request.GET.copy()
+    query_params.pop("cursor", None)
+    query_params.pop("exact_total", None)
+    query_params.pop("total", None)
+
+    if cursor:
+        query_params["cursor"] = cursor.encode()
+
+    if total:
+        query_params["total"] = total.encode()
+
+    if exact_total:
+        query_params["exact_total"] = "1"
+
+    return "".join((request.path, "?", query_params.urlencode()))
+
+
 @require_POST
 @login_required
 @permission_required(Perms.sys.ilb_admin, raise_exception=True)
@@ -168,6 +227,12 @@ def reassign_case_owner(request: AuthenticatedHttpRequest, *, case_type: str) ->
 
             now = timezone.now()
             apps.update(case_owner=new_case_owner, order_datetime=now, reassign_datetime=now)
+
+            # update() doesn't call save so refresh the search rows here.
+            schedule_search_row_refresh(list(apps.values_list("pk", flat=True)))
+
+            # The search is reloaded to show the new case owner
+            set_read_your_writes(request)
         else:
             return HttpResponse(status=400)
 
@@ -179,7 +244,10 @@ def reassign_case_owner(request: AuthenticatedHttpRequest, *, case_type: str) ->
 def download_spreadsheet(
     request: AuthenticatedHttpRequest, *, case_type: Literal["import", "export"]
 ) -> HttpResponse:
-    """Generates and returns a spreadsheet using same form data as the search form."""
+    """Starts generating a spreadsheet using same form data as the search form.
+
+    The spreadsheet contains every matching application, so it is written by a Celery task.
+    """
     if not can_user_view_search_cases(request.user, case_type):
         raise PermissionDenied
 
@@ -191,17 +259,69 @@ def download_spreadsheet(
     if not form.is_valid():
         return HttpResponse(status=400)
 
-    mime_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    response = HttpResponse(content_type=mime_type)
+    search_data = {k: v for k, v in request.POST.lists() if k != "csrfmiddlewaretoken"}
+    spreadsheet = SearchResultsSpreadsheet.objects.create(
+        case_type=case_type, search_data=search_data, requested_by=request.user
+    )
+    create_search_results_spreadsheet.delay(spreadsheet.pk)
+
+    return HttpResponseRedirect(
+        reverse(
+            "case:search-spreadsheet-detail",
+            kwargs={"case_type": case_type, "spreadsheet_pk": spreadsheet.pk},
+        )
+    )
+
+
+@require_GET
+@login_required
+def search_spreadsheet_detail(
+    request: AuthenticatedHttpRequest,
+    *,
+    case_type: Literal["import", "export"],
+    spreadsheet_pk: int,
+) -> HttpResponse:
+    """Show the progress of a search results spreadsheet and a link to download it when complete."""
+
+    if not can_user_view_search_cases(request.user, case_type):
+        raise PermissionDenied
+
+    spreadsheet = get_object_or_404(
+        SearchResultsSpreadsheet.objects.select_related("document"),
+        pk=spreadsheet_pk,
+        case_type=case_type,
+        requested_by=request.user,
+    )
 
-    terms = _get_search_terms_from_form(case_type, form)
-    results = search_applications(terms, request.user)
-    search_spreadsheet = get_search_results_spreadsheet(case_type, results)
-    response.write(search_spreadsheet)
+    context = {
+        "page_title": "Search Results Spreadsheet",
+        "case_type": case_type,
+        "spreadsheet": spreadsheet,
+    }
+
+    return render(request, "web/domains/case/search/spreadsheet.html", context)
+
+
+@require_GET
+@login_required
+def search_spreadsheet_download(
+    request: AuthenticatedHttpRequest,
+    *,
+    case_type: Literal["import", "export"],
+    spreadsheet_pk: int,
+) -> HttpResponseBase:
+    if not can_user_view_search_cases(request.user, case_type):
+        raise PermissionDenied
 
-    response["Content-Disposition"] = f"attachment; filename={case_type}_application_download.xlsx"
+    spreadsheet = get_object_or_404(
+        SearchResultsSpreadsheet.objects.select_related("document"),
+        pk=spreadsheet_pk,
+        case_type=case_type,
+        requested_by=request.user,
+        status=SearchResultsSpreadsheet.Status.COMPLETED,
+    )
 
-    return response
+    return get_file_download_response(request, spreadsheet.document)
 
 
 @method_decorator(transaction.atomic, name="post")
@@ -234,6 +354,7 @@ class ReopenApplicationView(
             "The case has been reopened, and can be taken ownership of by any case manager.",
         )
         send_application_reopened_email(self.application)
+        set_read_your_writes(request)
 
         # The page reload is handled in JS to preserve the search form state.
         # see web/static/web/js/pages/search-common.js
@@ -254,6 +375,12 @@ class SearchActionFormBase(
 
         return super().get(request, *args, **kwargs)
 
+    def form_valid(self, form: Any) -> HttpResponseRedirect:
+        # The success url searches for the application that has just been changed
+        set_read_your_writes(self.request)
+
+        return super().form_valid(form)
+
     def get_context_data(self, **kwargs: dict[str, Any]) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
 
@@ -677,48 +804,3 @@ class CreateCATemplateFromExportApplicationView(
 
     def get_success_url(self) -> str:
         return reverse("cat:edit", kwargs={"cat_pk": self.new_cat.pk})
-
-
-def _get_search_terms_from_form(
-    case_type: Literal["import", "export"], form: SearchForm
-) -> SearchTerms:
-    """Load the SearchTerms from the form data."""
-
-    cd = form.cleaned_data
-
-    return SearchTerms(
-        case_type=case_type,
-        # ---- Common search fields (Import and Export applications) ----
-        app_type=cd.get("application_type"),
-        case_status=cd.get("status"),
-        case_ref=cd.get("case_ref"),
-        licence_ref=cd.get("licence_ref"),
-        application_contact=cd.get("application_contact"),
-        response_decision=cd.get("decision"),
-        submitted_date_start=cd.get("submitted_from"),
-        submitted_date_end=cd.get("submitted_to"),
-        pending_firs=cd.get("pending_firs"),
-        pending_update_reqs=cd.get("pending_update_reqs"),
-        reassignment_search=cd.get("reassignment"),
-        reassignment_user=cd.get("reassignment_user"),
-        # ---- Import application fields ----
-        # icms_legacy_cases = str = None
-        app_sub_type=cd.get("application_sub_type"),
-        applicant_ref=cd.get("applicant_ref"),
-        importer_agent_name=cd.get("importer_or_agent"),
-        licence_type=cd.get("licence_type"),
-        chief_usage_status=cd.get("chief_usage_status"),
-        origin_country=cd.get("origin_country"),
-        consignment_country=cd.get("consignment_country"),
-        shipping_year=cd.get("shipping_year"),
-        goods_category=cd.get("goods_category"),
-        commodity_code=cd.get("commodity_code"),
-        licence_date_start=cd.get("licence_from"),
-        licence_date_end=cd.get("licence_to"),
-        issue_date_start=cd.get("issue_from"),
-        issue_date_end=cd.get("issue_to"),
-        # ---- Export application fields ----
-        exporter_agent_name=cd.get("exporter_or_agent"),
-        certificate_country=cd.get("certificate_country"),
-        manufacture_country=cd.get("manufacture_country"),
-    )
@@ -9,7 +9,6 @@ from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.core import exceptions
-from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
 from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import redirect
@@ -22,7 +21,10 @@ from mohawk.util import parse_authorization_header, prepare_header_val
 
 from web.domains.case.services import case_progress
 from web.domains.case.shared import ImpExpStatus
-from web.domains.case.tasks import create_case_document_pack
+from web.domains.case.tasks import (
+    create_case_document_pack,
+    schedule_search_row_refresh,
+)
 from web.domains.case.views.mixins import ApplicationTaskMixin
 from web.models import (
     CaseDocumentReference,
@@ -179,27 +181,43 @@ class UsageDataCallbackView(HawkViewBase):
         response = types.ChiefUsageDataResponseData.model_validate_json(request.body)
 
         with transaction.atomic():
-            for rec in response.usage_data:
-                self._update_import_application_usage_status(rec)
+            self._update_import_application_usage_status(response.usage_data)
 
         return JsonResponse({}, status=http.HTTPStatus.OK)
 
-    def _update_import_application_usage_status(self, rec: types.UsageRecord) -> None:
-        try:
-            licence = ImportApplicationLicence.objects.get(
-                status=ImportApplicationLicence.Status.ACTIVE,
-                document_references__document_type=CaseDocumentReference.Type.LICENCE,
-                document_references__reference=rec.licence_ref,
+    def _update_import_application_usage_status(self, records: list[types.UsageRecord]) -> None:
+        # The last record for a licence wins, as it did when each record was saved in turn.
+        usage_status = {rec.licence_ref: rec.licence_status for rec in records}
+
+        licences = ImportApplicationLicence.objects.filter(
+            status=ImportApplicationLicence.Status.ACTIVE,
+            document_references__document_type=CaseDocumentReference.Type.LICENCE,
+            document_references__reference__in=usage_status,
+        ).values_list("document_references__reference", "import_application_id")
+
+        application_pks: dict[str, list[int]] = {}
+        found = set()
+
+        for licence_ref, application_pk in licences:
+            application_pks.setdefault(usage_status[licence_ref], []).append(application_pk)
+            found.add(licence_ref)
+
+        # One update per usage status (at most five) however many records there are.
+        now = timezone.now()
+        for status, pks in application_pks.items():
+            ImportApplication.objects.filter(pk__in=pks).update(
+                chief_usage_status=status, last_update_datetime=now
             )
-        except ObjectDoesNotExist:
+
+        if application_pks:
+            schedule_search_row_refresh([pk for pks in application_pks.values() for pk in pks])
+
+        not_found = sorted(usage_status.keys() - found)
+        if not_found:
             capture_message(
-                f"licence not found: Unable to set usage status for licence number: {rec.licence_ref}."
+                "licence not found: Unable to set usage status for licence numbers:"
+                f" {', '.join(not_found)}."
             )
-            return
-
-        application = licence.import_application
-        application.chief_usage_status = rec.licence_status
-        application.save()
 
 
 @method_decorator(transaction.atomic, name="post")
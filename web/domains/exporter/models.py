@@ -5,6 +5,8 @@ from django.db import models
 from django.urls import reverse
 from guardian.models import GroupObjectPermissionBase, UserObjectPermissionBase
 
+from web.models.shared import SearchRowFieldsMixin
+
 
 class ExporterObjectPerms:
     """Return object permissions linked to the exporter model.
@@ -38,7 +40,7 @@ class ExporterManager(models.Manager):
         return self.filter(main_exporter__isnull=False)
 
 
-class Exporter(models.Model):
+class Exporter(SearchRowFieldsMixin, models.Model):
     objects = ExporterManager()
 
     is_active = models.BooleanField(blank=False, null=False, default=True)
@@ -67,6 +69,17 @@ class Exporter(models.Model):
     def get_main_org(self):
         return self.main_exporter
 
+    # The organisation name is shown in the search results of its applications.
+    SEARCH_ROW_FIELDS = ("name",)
+
+    def refresh_search_rows(self, created: bool) -> None:
+        if created:
+            return
+
+        from web.domains.case.tasks import schedule_related_search_row_refresh
+
+        schedule_related_search_row_refresh("export", ["exporter", "agent"], self.pk)
+
     def __str__(self):
         if self.is_agent():
             return f"Agent - {self.name}"
@@ -1,16 +1,35 @@
+import datetime as dt
 import os.path
-from collections.abc import Callable, Iterable
-from typing import Any
+import re
+from collections.abc import Callable, Iterable, Iterator
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
 
+from botocore.exceptions import ClientError
 from django import forms
 from django.conf import settings
 from django.db import models
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
 from django.template.loader import render_to_string
+from django.utils.http import http_date, parse_http_date_safe
 from django_chunk_upload_handlers.clam_av import validate_virus_check_result
 from storages.backends.s3boto3 import S3Boto3StorageFile
 
-from web.models import User
-from web.utils.s3 import delete_file_from_s3
+from web.models import File, User
+from web.utils.s3 import (
+    DOWNLOAD_CHUNK_SIZE,
+    delete_file_from_s3,
+    get_file_stream_from_s3,
+)
+
+if TYPE_CHECKING:
+    from botocore.response import StreamingBody
 
 FILE_EXTENSION_ALLOW_LIST = [
     "bmp",
@@ -152,3 +171,123 @@ def create_file_model(
         created_by=created_by,
         **extra_args,
     )
+
+
+# A single byte range, S3 doesn't support requesting multiple ranges.
+SINGLE_BYTE_RANGE = re.compile(r"^bytes=\d*-\d*$")
+
+
+def get_file_download_response(request: HttpRequest, document: File) -> HttpResponseBase:
+    """Return a response streaming the file from s3 as an attachment.
+
+    The file is streamed in chunks so memory use doesn't depend on the file size.
+
+    Range and conditional (If-None-Match, If-Modified-Since & If-Range) request headers are passed
+    to s3, which returns the partial content or not modified response.
+    """
+
+    get_object_kwargs = _get_download_request_kwargs(request)
+
+    try:
+        try:
+            s3_file = get_file_stream_from_s3(document.path, **get_object_kwargs)
+        except ClientError as e:
+            # If-Range didn't match so return the whole file.
+            if _get_error_status(e) != HTTPStatus.PRECONDITION_FAILED or not (
+                {"IfMatch", "IfUnmodifiedSince"} & get_object_kwargs.keys()
+            ):
+                raise
+
+            for key in ["Range", "IfMatch", "IfUnmodifiedSince"]:
+                get_object_kwargs.pop(key, None)
+
+            s3_file = get_file_stream_from_s3(document.path, **get_object_kwargs)
+
+    except ClientError as e:
+        status = _get_error_status(e)
+
+        if status == HTTPStatus.NOT_MODIFIED:
+            response: HttpResponseBase = HttpResponseNotModified()
+            headers = e.response["ResponseMetadata"].get("HTTPHeaders", {})
+
+            for header in ["etag", "last-modified"]:
+                if header in headers:
+                    response[header] = headers[header]
+
+            return response
+
+        if status == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE:
+            response = HttpResponse(status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            response["Content-Range"] = f"bytes */{document.file_size}"
+
+            return response
+
+        raise
+
+    response = StreamingHttpResponse(
+        _iter_file_chunks(s3_file["Body"]),
+        content_type=document.content_type,
+        status=HTTPStatus.PARTIAL_CONTENT if "ContentRange" in s3_file else HTTPStatus.OK,
+    )
+    response["Content-Length"] = s3_file["ContentLength"]
+    response["Accept-Ranges"] = "bytes"
+    response["Content-Disposition"] = f'attachment; filename="{document.filename}"'
+
+    if "ContentRange" in s3_file:
+        response["Content-Range"] = s3_file["ContentRange"]
+
+    if "ETag" in s3_file:
+        response["ETag"] = s3_file["ETag"]
+
+    if "LastModified" in s3_file:
+        response["Last-Modified"] = http_date(s3_file["LastModified"].timestamp())
+
+    return response
+
+
+def _get_download_request_kwargs(request: HttpRequest) -> dict[str, Any]:
+    """Return the s3 get_object kwargs for the range & conditional headers of the request."""
+
+    kwargs: dict[str, Any] = {}
+
+    if etags := request.headers.get("If-None-Match"):
+        kwargs["IfNoneMatch"] = etags
+
+    if modified_since := _parse_http_date(request.headers.get("If-Modified-Since")):
+        kwargs["IfModifiedSince"] = modified_since
+
+    byte_range = request.headers.get("Range", "")
+
+    if not SINGLE_BYTE_RANGE.match(byte_range):
+        return kwargs
+
+    kwargs["Range"] = byte_range
+
+    # Only return the range if the file hasn't changed
+    if if_range := request.headers.get("If-Range"):
+        if if_range.startswith('"'):
+            kwargs["IfMatch"] = if_range
+        elif unmodified_since := _parse_http_date(if_range):
+            kwargs["IfUnmodifiedSince"] = unmodified_since
+        else:
+            # Weak or invalid validator, so the whole file is returned.
+            del kwargs["Range"]
+
+    return kwargs
+
+
+def _parse_http_date(value: str | None) -> dt.datetime | None:
+    timestamp = parse_http_date_safe(value) if value else None
+
+    return dt.datetime.fromtimestamp(timestamp, tz=dt.UTC) if timestamp is not None else None
+
+
+def _get_error_status(error: ClientError) -> int | None:
+    return error.response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+
+
+def _iter_file_chunks(body: "StreamingBody") -> Iterator[bytes]:
+    try:
+        yield from body.iter_chunks(DOWNLOAD_CHUNK_SIZE)
+    finally:
+        body.close()
@@ -8,17 +8,17 @@ from django.db import transaction
 from django.db.models import F, QuerySet
 from django.forms.models import inlineformset_factory
 from django.http import HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views.decorators.http import require_POST
 
 from web.domains.case.forms import DocumentForm
-from web.domains.file.utils import create_file_model
+from web.domains.file.utils import create_file_model, get_file_download_response
 from web.mail.emails import send_authority_archived_email
 from web.models import Importer, User
 from web.permissions import Perms, can_user_edit_firearm_authorities
 from web.types import AuthenticatedHttpRequest
-from web.utils.s3 import get_file_from_s3
 from web.views import ModelFilterView
 from web.views.actions import Archive, Edit, Unarchive
 
@@ -457,7 +457,7 @@ def add_document_firearms(request: AuthenticatedHttpRequest, pk: int) -> HttpRes
 @login_required
 def view_document_firearms(
     request: AuthenticatedHttpRequest, firearms_pk: int, document_pk: int
-) -> HttpResponse:
+) -> HttpResponseBase:
     if not can_user_edit_firearm_authorities(request.user) and not request.user.has_perm(
         Perms.sys.importer_regulator
     ):
@@ -466,12 +466,7 @@ def view_document_firearms(
     firearms: FirearmsAuthority = get_object_or_404(FirearmsAuthority, pk=firearms_pk)
 
     document = firearms.files.get(pk=document_pk)
-    file_content = get_file_from_s3(document.path)
-
-    response = HttpResponse(content=file_content, content_type=document.content_type)
-    response["Content-Disposition"] = f'attachment; filename="{document.filename}"'
-
-    return response
+    return get_file_download_response(request, document)
 
 
 @login_required
@@ -5,6 +5,8 @@ from django.db import models
 from django.urls import reverse
 from guardian.models import GroupObjectPermissionBase, UserObjectPermissionBase
 
+from web.models.shared import SearchRowFieldsMixin
+
 
 class ImporterObjectPerms:
     """Return object permissions linked to the importer model.
@@ -38,7 +40,7 @@ class ImporterManager(models.Manager):
         return self.filter(main_importer__isnull=False)
 
 
-class Importer(models.Model):
+class Importer(SearchRowFieldsMixin, models.Model):
     # Regions
     INDIVIDUAL = "INDIVIDUAL"
     ORGANISATION = "ORGANISATION"
@@ -108,6 +110,17 @@ class Importer(models.Model):
     def is_organisation(self):
         return self.type == self.ORGANISATION
 
+    # The organisation name is shown in the search results of its applications.
+    SEARCH_ROW_FIELDS = ("name",)
+
+    def refresh_search_rows(self, created: bool) -> None:
+        if created:
+            return
+
+        from web.domains.case.tasks import schedule_related_search_row_refresh
+
+        schedule_related_search_row_refresh("import", ["importer", "agent"], self.pk)
+
     def __str__(self):
         if self.is_agent():
             return f"Agent - {self.display_name}"
@@ -8,6 +8,7 @@ from django.core.exceptions import PermissionDenied
 from django.db.models import F
 from django.forms.models import inlineformset_factory
 from django.http import HttpResponse
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils.http import urlencode
@@ -17,7 +18,7 @@ from guardian.shortcuts import get_objects_for_user
 
 from web.domains.case.forms import DocumentForm
 from web.domains.contacts.forms import ContactForm
-from web.domains.file.utils import create_file_model
+from web.domains.file.utils import create_file_model, get_file_download_response
 from web.domains.importer.forms import (
     AgentIndividualForm,
     AgentIndividualNonILBForm,
@@ -48,7 +49,6 @@ from web.permissions import (
     organisation_get_contacts,
 )
 from web.types import AuthenticatedHttpRequest
-from web.utils.s3 import get_file_from_s3
 from web.views import ModelFilterView
 from web.views.actions import (
     Archive,
@@ -507,7 +507,7 @@ def add_document_section5(request: AuthenticatedHttpRequest, pk: int) -> HttpRes
 @require_GET
 def view_document_section5(
     request: AuthenticatedHttpRequest, section5_pk: int, document_pk: int
-) -> HttpResponse:
+) -> HttpResponseBase:
     if not can_user_edit_section5_authorities(request.user) and not request.user.has_perm(
         Perms.sys.importer_regulator
     ):
@@ -516,12 +516,7 @@ def view_document_section5(
     section5: Section5Authority = get_object_or_404(Section5Authority, pk=section5_pk)
 
     document = section5.files.get(pk=document_pk)
-    file_content = get_file_from_s3(document.path)
-
-    response = HttpResponse(content=file_content, content_type=document.content_type)
-    response["Content-Disposition"] = f'attachment; filename="{document.filename}"'
-
-    return response
+    return get_file_download_response(request, document)
 
 
 @login_required
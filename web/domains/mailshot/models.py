@@ -66,6 +66,11 @@ class Mailshot(models.Model):
     # Used in workbasket to clear mailshots
     cleared_by = models.ManyToManyField("web.User")
 
+    # Progress of the latest mailshot (or retraction) emails, updated by each batch of recipients
+    email_recipient_count = models.PositiveIntegerField(default=0)
+    email_sent_count = models.PositiveIntegerField(default=0)
+    email_failed_count = models.PositiveIntegerField(default=0)
+
     def get_reference(self) -> str:
         if not self.reference:
             return "Not Yet Assigned"
@@ -1,13 +1,15 @@
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
 from guardian.core import ObjectPermissionChecker
 from guardian.mixins import GuardianUserMixin
 
+from web.models.shared import SearchRowFieldsMixin
 from web.one_login.constants import ONE_LOGIN_UNSET_NAME
 
 
-class User(GuardianUserMixin, AbstractUser):
+class User(SearchRowFieldsMixin, GuardianUserMixin, AbstractUser):
     def __init__(self, *args, **kwargs):
         self.guardian_checker: ObjectPermissionChecker | None = None
 
@@ -42,6 +44,17 @@ class User(GuardianUserMixin, AbstractUser):
     # True for users that were migrated from V1.
     icms_v1_user = models.BooleanField(default=False)
 
+    # The name and email of application contacts and case owners are shown in the search results.
+    SEARCH_ROW_FIELDS = ("title", "first_name", "last_name", "email")
+
+    def refresh_search_rows(self, created: bool) -> None:
+        if created:
+            return
+
+        from web.domains.case.tasks import schedule_related_search_row_refresh
+
+        schedule_related_search_row_refresh(None, ["contact", "case_owner"], self.pk)
+
     def __str__(self):
         return self.full_name
 
@@ -69,6 +82,15 @@ class User(GuardianUserMixin, AbstractUser):
 
     class Meta:
         ordering = ("-is_active", "first_name")
+        indexes = [
+            # Used for application contact search (see web.utils.search.api.get_wildcard_filter)
+            GinIndex(
+                fields=["first_name"], name="USER_first_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+            GinIndex(
+                fields=["last_name"], name="USER_last_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ]
 
 
 class PhoneNumber(models.Model):
@@ -1,7 +1,19 @@
-from itertools import chain
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Any
 
 from django.contrib.postgres.aggregates import ArrayAgg, JSONBAgg
-from django.db.models import Exists, F, Func, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models import (
+    Exists,
+    F,
+    Func,
+    Model,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Value,
+)
 from guardian.shortcuts import get_objects_for_user
 
 from web.domains.case.shared import ImpExpStatus
@@ -92,6 +104,64 @@ def get_caseworker_app_filters(user: User) -> tuple[Q, ...]:
     )
 
 
+@dataclass(frozen=True)
+class WorkbasketQuery:
+    """The records shown in a workbasket and how to annotate them to render each row.
+
+    The annotations are expensive, so the records are ordered and paginated without them and
+    only the records on the page being rendered are annotated.
+    """
+
+    records: QuerySet
+    annotate: Callable[[QuerySet], QuerySet] = lambda qs: qs
+
+
+# (query index, pk, order_datetime) of each workbasket record.
+WorkbasketKey = tuple[int, int, Any]
+
+
+def get_workbasket_keys(queries: list[WorkbasketQuery]) -> "QuerySet[Any]":
+    """Return the key of every workbasket record, newest first.
+
+    The keys of each query are combined using UNION ALL so that the workbasket is ordered and
+    paginated by Postgres rather than loading every record.
+    """
+
+    keys = [
+        query.records.order_by()
+        .annotate(wb_query=Value(idx), wb_pk=F("pk"), wb_order_datetime=F("order_datetime"))
+        .values_list("wb_query", "wb_pk", "wb_order_datetime")
+        # Caseworker filters join the tasks table which can duplicate a record.
+        .distinct()
+        for idx, query in enumerate(queries)
+    ]
+
+    return keys[0].union(*keys[1:], all=True).order_by("-wb_order_datetime", "-wb_pk")
+
+
+def get_workbasket_records(
+    queries: list[WorkbasketQuery], keys: Iterable[WorkbasketKey]
+) -> list[Model]:
+    """Return the annotated workbasket records for the supplied keys (in the same order)."""
+
+    keys = list(keys)
+    pks_by_query: dict[int, list[int]] = {}
+
+    for idx, pk, _ in keys:
+        pks_by_query.setdefault(idx, []).append(pk)
+
+    records: dict[tuple[int, int], Model] = {}
+
+    for idx, pks in pks_by_query.items():
+        query = queries[idx]
+
+        for record in query.annotate(query.records.filter(pk__in=pks)):
+            records[idx, record.pk] = record
+
+    # A record may have left the workbasket since the keys were fetched.
+    return [records[idx, pk] for idx, pk, _ in keys if (idx, pk) in records]
+
+
 # Applicant statuses to show
 APP_STATUS_TO_SHOW = [
     ImpExpStatus.IN_PROGRESS,
@@ -108,15 +178,17 @@ APP_STATUS_TO_SHOW = [
 ]
 
 
-def get_ilb_admin_qs(user: User) -> chain[QuerySet]:
+def get_ilb_admin_qs(user: User) -> list[WorkbasketQuery]:
     submitted = AccessRequest.Statuses.SUBMITTED
 
     # Annotations used on every row to improve performance
     open_fir_pks_annotation = _get_open_firs_pk_annotation("further_information_requests")
 
-    exporter_access_requests = (
-        ExporterAccessRequest.objects.filter(is_active=True, status=submitted)
-        .annotate(
+    exporter_access_requests = WorkbasketQuery(
+        records=ExporterAccessRequest.objects.filter(
+            is_active=True, status=submitted
+        ).select_related("submitted_by"),
+        annotate=lambda qs: qs.annotate(
             annotation_open_fir_pks=open_fir_pks_annotation,
             annotation_has_open_approval_request=_get_approval_request_annotation(
                 ExporterApprovalRequest, ApprovalRequest.Statuses.OPEN
@@ -124,13 +196,14 @@ def get_ilb_admin_qs(user: User) -> chain[QuerySet]:
             annotation_has_complete_approval_request=_get_approval_request_annotation(
                 ExporterApprovalRequest, ApprovalRequest.Statuses.COMPLETED
             ),
-        )
-        .select_related("submitted_by")
+        ),
     )
 
-    importer_access_requests = (
-        ImporterAccessRequest.objects.filter(is_active=True, status=submitted)
-        .annotate(
+    importer_access_requests = WorkbasketQuery(
+        records=ImporterAccessRequest.objects.filter(
+            is_active=True, status=submitted
+        ).select_related("submitted_by"),
+        annotate=lambda qs: qs.annotate(
             annotation_open_fir_pks=open_fir_pks_annotation,
             annotation_has_open_approval_request=_get_approval_request_annotation(
                 ImporterApprovalRequest, ApprovalRequest.Statuses.OPEN
@@ -138,40 +211,35 @@ def get_ilb_admin_qs(user: User) -> chain[QuerySet]:
             annotation_has_complete_approval_request=_get_approval_request_annotation(
                 ImporterApprovalRequest, ApprovalRequest.Statuses.COMPLETED
             ),
-        )
-        .select_related("submitted_by")
+        ),
     )
 
     app_filters = get_caseworker_app_filters(user=user)
 
-    export_applications = (
-        ExportApplication.objects.filter(*app_filters)
+    export_applications = WorkbasketQuery(
+        records=ExportApplication.objects.filter(*app_filters)
         .exclude(decision=ExportApplication.REFUSE)
-        .select_related("exporter", "contact", "application_type", "submitted_by", "case_owner")
-        .annotate(
+        .select_related("exporter", "contact", "application_type", "submitted_by", "case_owner"),
+        annotate=lambda qs: qs.annotate(
             annotation_has_withdrawal=EXPORT_HAS_WITHDRAWAL_ANNOTATION,
             active_tasks=ACTIVE_TASK_ANNOTATION,
             annotation_open_fir_pks=open_fir_pks_annotation,
-        )
+        ),
     )
 
-    import_applications = (
-        ImportApplication.objects.filter(*app_filters)
+    import_applications = WorkbasketQuery(
+        records=ImportApplication.objects.filter(*app_filters)
         .exclude(decision=ImportApplication.REFUSE)
-        .select_related("importer", "contact", "application_type", "submitted_by", "case_owner")
-        .annotate(
-            active_tasks=ACTIVE_TASK_ANNOTATION,
-            annotation_has_withdrawal=IMPORT_HAS_WITHDRAWAL_ANNOTATION,
-            annotation_open_fir_pks=open_fir_pks_annotation,
-        )
+        .select_related("importer", "contact", "application_type", "submitted_by", "case_owner"),
+        annotate=_add_caseworker_import_annotations,
     )
 
-    return chain(
+    return [
         exporter_access_requests,
         importer_access_requests,
         export_applications,
         import_applications,
-    )
+    ]
 
 
 def _get_approval_request_annotation(
@@ -181,53 +249,58 @@ def _get_approval_request_annotation(
     return Exists(approval_cls.objects.filter(access_request=OuterRef("pk"), status=status))
 
 
-def get_sanctions_case_officer_qs(user: User) -> chain[QuerySet]:
+def get_sanctions_case_officer_qs(user: User) -> list[WorkbasketQuery]:
     app_filters = get_caseworker_app_filters(user)
-    # Annotations used on every row to improve performance
-    open_fir_pks_annotation = _get_open_firs_pk_annotation("further_information_requests")
 
-    import_applications = (
-        ImportApplication.objects.filter(*app_filters, process_type=ProcessTypes.SANCTIONS)
+    import_applications = WorkbasketQuery(
+        records=ImportApplication.objects.filter(*app_filters, process_type=ProcessTypes.SANCTIONS)
         .exclude(decision=ImportApplication.REFUSE)
-        .select_related("importer", "contact", "application_type", "submitted_by", "case_owner")
-        .annotate(
-            active_tasks=ACTIVE_TASK_ANNOTATION,
-            annotation_has_withdrawal=IMPORT_HAS_WITHDRAWAL_ANNOTATION,
-            annotation_open_fir_pks=open_fir_pks_annotation,
-        )
+        .select_related("importer", "contact", "application_type", "submitted_by", "case_owner"),
+        annotate=_add_caseworker_import_annotations,
     )
 
-    return chain(import_applications)
+    return [import_applications]
+
+
+def _add_caseworker_import_annotations(
+    applications: QuerySet[ImportApplication],
+) -> "QuerySet[ImportApplication]":
+    """Add caseworker workbasket annotations for import applications."""
+
+    return applications.annotate(
+        active_tasks=ACTIVE_TASK_ANNOTATION,
+        annotation_has_withdrawal=IMPORT_HAS_WITHDRAWAL_ANNOTATION,
+        annotation_open_fir_pks=_get_open_firs_pk_annotation("further_information_requests"),
+    )
 
 
-def get_applicant_qs(user: User) -> chain[QuerySet]:
+def get_applicant_qs(user: User) -> list[WorkbasketQuery]:
     # user/admin access requests and firs
     open_fir_pks_annotation = _get_open_firs_pk_annotation("further_information_requests")
 
-    access_requests = (
-        AccessRequest.objects.filter(
+    access_requests = WorkbasketQuery(
+        records=AccessRequest.objects.filter(
             submitted_by_id=user.pk,
             status__in=[AccessRequest.Statuses.SUBMITTED, AccessRequest.Statuses.FIR_REQUESTED],
-        )
-        .select_related("submitted_by")
-        .annotate(annotation_open_fir_pks=open_fir_pks_annotation)
+        ).select_related("submitted_by"),
+        annotate=lambda qs: qs.annotate(annotation_open_fir_pks=open_fir_pks_annotation),
     )
 
     # User access requests
-    chain_items = [access_requests]
+    queries = [access_requests]
 
     # Importer applications and approval requests
     if user.has_perm(Perms.sys.importer_access):
-        chain_items.extend(_get_importer_queryset(user))
+        queries.extend(_get_importer_queryset(user))
 
     # Exporter applications and approval requests.
     if user.has_perm(Perms.sys.exporter_access):
-        chain_items.extend(_get_exporter_queryset(user))
+        queries.extend(_get_exporter_queryset(user))
 
-    return chain(*chain_items)
+    return queries
 
 
-def _get_importer_queryset(user: User) -> list[QuerySet]:
+def _get_importer_queryset(user: User) -> list[WorkbasketQuery]:
     open_fir_pks_annotation = _get_open_firs_pk_annotation(
         "access_request__further_information_requests"
     )
@@ -250,27 +323,24 @@ def _get_importer_queryset(user: User) -> list[QuerySet]:
         any_perm=True,
     )
 
-    importer_approval_requests = (
-        ImporterApprovalRequest.objects.select_related(
+    importer_approval_requests = WorkbasketQuery(
+        records=ImporterApprovalRequest.objects.select_related(
             # get the importer associated with the approval request
             # join access_request and join importer from access_request
             "access_request__importeraccessrequest__link",
             "access_request__submitted_by",
-        )
-        .annotate(annotation_open_fir_pks=open_fir_pks_annotation)
-        .filter(
+        ).filter(
             is_active=True,
             status=ApprovalRequest.Statuses.OPEN,
             access_request__importeraccessrequest__link__in=main_importers,
-        )
+        ),
+        annotate=lambda qs: qs.annotate(annotation_open_fir_pks=open_fir_pks_annotation),
     )
 
     # Import Applications
     import_applications = ImportApplication.objects.select_related(
         "importer", "contact", "application_type", "submitted_by"
     )
-    # Add annotations
-    import_applications = _add_user_import_annotations(import_applications)
 
     import_applications = (
         import_applications.filter(is_active=True, status__in=APP_STATUS_TO_SHOW)
@@ -303,10 +373,14 @@ def _get_importer_queryset(user: User) -> list[QuerySet]:
         .exclude(cleared_by=user)
     )
 
-    return [importer_approval_requests, import_applications, mailshots]
+    return [
+        importer_approval_requests,
+        WorkbasketQuery(records=import_applications, annotate=_add_user_import_annotations),
+        WorkbasketQuery(records=mailshots),
+    ]
 
 
-def _get_exporter_queryset(user: User) -> list[QuerySet]:
+def _get_exporter_queryset(user: User) -> list[WorkbasketQuery]:
     open_fir_pks_annotation = _get_open_firs_pk_annotation(
         "access_request__further_information_requests"
     )
@@ -328,27 +402,24 @@ def _get_exporter_queryset(user: User) -> list[QuerySet]:
         any_perm=True,
     )
 
-    exporter_approval_requests = (
-        ExporterApprovalRequest.objects.select_related(
+    exporter_approval_requests = WorkbasketQuery(
+        records=ExporterApprovalRequest.objects.select_related(
             # get the exporter associated with the approval request
             # join access_request and join exporter from access_request
             "access_request__exporteraccessrequest__link",
             "access_request__submitted_by",
-        )
-        .annotate(annotation_open_fir_pks=open_fir_pks_annotation)
-        .filter(
+        ).filter(
             is_active=True,
             status=ApprovalRequest.Statuses.OPEN,
             access_request__exporteraccessrequest__link__in=main_exporters,
-        )
+        ),
+        annotate=lambda qs: qs.annotate(annotation_open_fir_pks=open_fir_pks_annotation),
     )
 
     # Export Applications
     export_applications = ExportApplication.objects.select_related(
         "exporter", "contact", "application_type", "submitted_by"
     )
-    # Add annotations
-    export_applications = _add_user_export_annotations(export_applications)
 
     # Apply filters
     export_applications = (
@@ -382,7 +453,11 @@ def _get_exporter_queryset(user: User) -> list[QuerySet]:
         .exclude(cleared_by=user)
     )
 
-    return [exporter_approval_requests, export_applications, mailshots]
+    return [
+        exporter_approval_requests,
+        WorkbasketQuery(records=export_applications, annotate=_add_user_export_annotations),
+        WorkbasketQuery(records=mailshots),
+    ]
 
 
 def _add_user_import_annotations(
@@ -1,5 +1,3 @@
-from operator import attrgetter
-
 from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
@@ -11,7 +9,13 @@ from web.sites import is_exporter_site, is_importer_site
 from web.types import AuthenticatedHttpRequest
 
 from .actions.applicant_actions import ShowWelcomeMessageAction
-from .app_data import get_applicant_qs, get_ilb_admin_qs, get_sanctions_case_officer_qs
+from .app_data import (
+    get_applicant_qs,
+    get_ilb_admin_qs,
+    get_sanctions_case_officer_qs,
+    get_workbasket_keys,
+    get_workbasket_records,
+)
 from .base import WorkbasketRow, WorkbasketSection
 from .row import get_workbasket_row_func
 
@@ -23,26 +27,22 @@ def show_workbasket(request: AuthenticatedHttpRequest) -> HttpResponse:
     # Users with sanctions_case_officer are also ilb_admin's so check this first.
     # The goal is to restrict the records shown to sanctions case officers.
     if request.user.has_perm(Perms.sys.sanctions_case_officer):
-        qs = get_sanctions_case_officer_qs(request.user)
+        queries = get_sanctions_case_officer_qs(request.user)
     elif is_ilb_admin:
-        qs = get_ilb_admin_qs(request.user)
+        queries = get_ilb_admin_qs(request.user)
     else:
-        qs = get_applicant_qs(request.user)
-
-    qs_list = list(qs)
-
-    # Order all records before pagination
-    qs_list.sort(key=attrgetter("order_datetime"), reverse=True)
+        queries = get_applicant_qs(request.user)
 
-    paginator = Paginator(qs_list, settings.WORKBASKET_PER_PAGE)
+    # Records are ordered and paginated in the database using the key of each record.
+    paginator = Paginator(get_workbasket_keys(queries), settings.WORKBASKET_PER_PAGE)
     page_number = request.GET.get("page", default=1)
 
     page_obj = paginator.get_page(page_number)
 
-    # Only call get_workbasket_row on the row's being rendered
+    # Only load the annotated records (and call get_workbasket_row) for the row's being rendered
     rows = []
 
-    for r in page_obj:
+    for r in get_workbasket_records(queries, page_obj):
         get_workbasket_row = get_workbasket_row_func(r.process_type)
         row = get_workbasket_row(r, request.user, is_ilb_admin)
 
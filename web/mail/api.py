@@ -1,5 +1,7 @@
+import logging
 from uuid import UUID
 
+from celery import Signature
 from celery.app.task import Task
 from django.conf import settings
 from notifications_python_client import NotificationsAPIClient
@@ -8,7 +10,14 @@ from notifications_python_client.errors import HTTPError
 from config.celery import app
 from web.utils.sentry import capture_exception
 
-from .constants import CELERY_MAIL_QUEUE_NAME, SEND_EMAIL_TASK_NAME
+from .constants import (
+    CELERY_MAIL_QUEUE_NAME,
+    SEND_EMAIL_TASK_NAME,
+    SEND_OUTBOX_EMAILS_TASK_NAME,
+)
+from .throttle import record_gov_notify_sends
+
+logger = logging.getLogger(__name__)
 
 
 class SendEmailTask(Task):
@@ -62,6 +71,70 @@ def is_valid_template_id(template_id: UUID) -> bool:
 @app.task(base=SendEmailTask, name=SEND_EMAIL_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME)
 def send_email(template_id: UUID, personalisation: dict, email_address: str) -> dict:
     client = get_gov_notify_client()
-    return client.send_email_notification(
+    response = client.send_email_notification(
         email_address, str(template_id), personalisation=personalisation
     )
+
+    # Mailshot batches are throttled by the emails sent by every worker
+    record_gov_notify_sends(1)
+
+    return response
+
+
+@app.task(name=SEND_OUTBOX_EMAILS_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME)
+def send_outbox_emails(emails: list[tuple[str, dict, str]]) -> None:
+    """Send a batch of (template_id, personalisation, email_address) emails from the outbox.
+
+    An email that fails is queued on its own with send_email, so it is retried with a backoff.
+    """
+
+    client = get_gov_notify_client()
+
+    for template_id, personalisation, email_address in emails:
+        try:
+            client.send_email_notification(
+                email_address, template_id, personalisation=personalisation
+            )
+        except HTTPError:
+            logger.warning("Failed to send email to %s, retrying", email_address)
+            send_email.apply_async(args=[template_id, personalisation, email_address])
+            continue
+
+        record_gov_notify_sends(1)
+
+
+def send_email_batch(
+    template_id: UUID,
+    personalisation: dict,
+    email_addresses: list[str],
+    on_retry_sent: Signature | None = None,
+    on_retry_failed: Signature | None = None,
+) -> int:
+    """Send an email to each address now, returning the number of addresses it was sent to.
+
+    Used by tasks that have already reserved the sends against the GOV.UK Notify limits.
+    An email that fails is queued on its own with send_email, so it is retried with a backoff.
+    on_retry_sent is called when a queued email is sent and on_retry_failed when it has run out
+    of retries.
+    """
+
+    client = get_gov_notify_client()
+    sent = 0
+
+    for email_address in email_addresses:
+        try:
+            client.send_email_notification(
+                email_address, str(template_id), personalisation=personalisation
+            )
+        except HTTPError:
+            logger.warning("Failed to send email to %s, retrying", email_address)
+            send_email.apply_async(
+                args=[str(template_id), personalisation, email_address],
+                link=on_retry_sent,
+                link_error=on_retry_failed,
+            )
+            continue
+
+        sent += 1
+
+    return sent
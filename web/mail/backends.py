@@ -1,20 +1,54 @@
 import logging
-from uuid import UUID
 
+from celery import Signature
 from django.core.mail.backends.base import BaseEmailBackend
 
-from .api import send_email
+from .api import send_email_batch
 from .messages import GOVNotifyEmailMessage
+from .models import OutboxEmail
+from .outbox import add_to_outbox
 
 logger = logging.getLogger(__name__)
 
 
 class GovNotifyEmailBackend(BaseEmailBackend):
     def send_messages(self, email_messages: list[GOVNotifyEmailMessage]) -> None:
+        outbox_emails = []
+
         for message in email_messages:
+            personalisation = message.get_personalisation()
+
             for recipient in message.recipients():
                 logger.info("Sending %s email to %s", message.name.label, recipient)
-                self._send_message(message.template_id, message.get_personalisation(), recipient)
+                outbox_emails.append(
+                    OutboxEmail(
+                        template_id=message.template_id,
+                        personalisation=personalisation,
+                        email_address=recipient,
+                    )
+                )
+
+        add_to_outbox(outbox_emails)
+
+    def send_batch(
+        self,
+        message: GOVNotifyEmailMessage,
+        on_retry_sent: Signature | None = None,
+        on_retry_failed: Signature | None = None,
+    ) -> int:
+        """Send the message to every recipient now rather than queuing a task for each one.
+
+        Returns the number of recipients the message was sent to, see send_email_batch for the
+        recipients it couldn't be sent to straight away.
+        """
+
+        recipients = message.recipients()
+        logger.info("Sending %s email to %s recipients", message.name.label, len(recipients))
 
-    def _send_message(self, template_id: UUID, personalisation: dict, recipient: str) -> None:
-        send_email.apply_async(args=[template_id, personalisation, recipient])
+        return send_email_batch(
+            message.template_id,
+            message.get_personalisation(),
+            recipients,
+            on_retry_sent,
+            on_retry_failed,
+        )
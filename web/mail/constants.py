@@ -4,13 +4,30 @@ from web.types import TypedTextChoices
 CELERY_MAIL_QUEUE_NAME = "mail"
 
 SEND_EMAIL_TASK_NAME = "web.mail.send_email"
+SEND_OUTBOX_EMAILS_TASK_NAME = "web.mail.send_outbox_emails"
+DISPATCH_OUTBOX_EMAILS_TASK_NAME = "web.mail.dispatch_outbox_emails"
 SEND_MAILSHOT_TASK_NAME = "web.mail.send_mailshot_email"
+SEND_MAILSHOT_BATCH_TASK_NAME = "web.mail.send_mailshot_email_batch"
 SEND_RETRACT_MAILSHOT_TASK_NAME = "web.mail.send_retract_mailshot_email"
+RECORD_MAILSHOT_EMAIL_RETRY_TASK_NAME = "web.mail.record_mailshot_email_retry"
 SEND_AUTHORITY_EXPIRING_SECTION_5_TASK_NAME = "web.mail.send_authority_expiring_section_5_email"
 SEND_AUTHORITY_EXPIRING_FIREARMS_TASK_NAME = "web.mail.send_authority_expiring_firearms_email"
 
 DATE_FORMAT = "%-d %B %Y"
 
+# GOV.UK Notify sending limits shared by every worker.
+GOV_NOTIFY_EMAILS_PER_MINUTE = 3000
+GOV_NOTIFY_EMAILS_PER_DAY = 250_000
+
+# Number of recipients sent a mailshot email by each batch task.
+MAILSHOT_BATCH_SIZE = 100
+
+# Number of outbox emails sent by each task.
+OUTBOX_BATCH_SIZE = 50
+
+# Age (in seconds) of the oldest email in the outbox before the outbox is reported as backed up.
+OUTBOX_MAX_AGE = 5 * 60
+
 
 class EmailTypes(TypedTextChoices):
     ACCESS_REQUEST = ("ACCESS_REQUEST", "Access Request")
@@ -1,7 +1,9 @@
 import datetime as dt
 
+from celery import Signature
 from django.contrib.sites.models import Site
-from django.db.models import QuerySet
+from django.core.mail import get_connection
+from django.db.models import F, QuerySet
 from django.utils import timezone
 
 from web.domains.case.types import (
@@ -39,7 +41,8 @@ from web.models import (
 from web.permissions import get_ilb_case_officers
 from web.sites import get_exporter_site_domain, get_importer_site_domain
 
-from .constants import EmailTypes
+from .backends import GovNotifyEmailBackend
+from .constants import MAILSHOT_BATCH_SIZE, EmailTypes
 from .messages import (
     AccessRequestApprovalCompleteEmail,
     AccessRequestClosedEmail,
@@ -99,6 +102,11 @@ from .recipients import (
 )
 from .types import ImporterDetails
 
+MAILSHOT_EMAIL_CLASSES: dict[str, type[MailshotEmail] | type[RetractMailshotEmail]] = {
+    EmailTypes.MAILSHOT: MailshotEmail,
+    EmailTypes.RETRACT_MAILSHOT: RetractMailshotEmail,
+}
+
 
 def send_new_user_welcome_email(user: User, site: Site) -> None:
     NewUserWelcomeEmail(user=user, site=site, to=[user.email]).send()
@@ -459,6 +467,7 @@ def send_application_further_information_request_email(
 
 
 def send_mailshot_email(mailshot: Mailshot) -> None:
+    _reset_mailshot_email_progress(mailshot)
     if mailshot.is_to_importers:
         send_mailshot_email_to_organisations(mailshot, Importer, get_importer_site_domain())
     if mailshot.is_to_exporters:
@@ -469,11 +478,11 @@ def send_mailshot_email_to_organisations(
     mailshot: Mailshot, organisation_class: type[Organisation], site_domain: str
 ) -> None:
     recipients = get_email_addresses_for_mailshot(organisation_class)
-    for recipient in recipients:
-        MailshotEmail(mailshot=mailshot, site_domain=site_domain, to=[recipient]).send()
+    queue_mailshot_email_batches(mailshot, EmailTypes.MAILSHOT, site_domain, recipients)
 
 
 def send_retract_mailshot_email(mailshot: Mailshot) -> None:
+    _reset_mailshot_email_progress(mailshot)
     if mailshot.is_to_importers:
         send_retract_mailshot_email_to_organisations(mailshot, Importer, get_importer_site_domain())
     if mailshot.is_to_exporters:
@@ -484,8 +493,62 @@ def send_retract_mailshot_email_to_organisations(
     mailshot: Mailshot, organisation_class: type[Organisation], site_domain: str
 ) -> None:
     recipients = get_email_addresses_for_mailshot(organisation_class)
-    for recipient in recipients:
-        RetractMailshotEmail(mailshot=mailshot, site_domain=site_domain, to=[recipient]).send()
+    queue_mailshot_email_batches(mailshot, EmailTypes.RETRACT_MAILSHOT, site_domain, recipients)
+
+
+def queue_mailshot_email_batches(
+    mailshot: Mailshot, email_type: EmailTypes, site_domain: str, recipients: list[str]
+) -> None:
+    """Queue a task to send the mailshot email to each batch of MAILSHOT_BATCH_SIZE recipients."""
+
+    from .tasks import send_mailshot_email_batch_task
+
+    Mailshot.objects.filter(pk=mailshot.pk).update(
+        email_recipient_count=F("email_recipient_count") + len(recipients)
+    )
+
+    for i in range(0, len(recipients), MAILSHOT_BATCH_SIZE):
+        send_mailshot_email_batch_task.delay(
+            mailshot.pk, email_type, site_domain, recipients[i : i + MAILSHOT_BATCH_SIZE]
+        )
+
+
+def send_mailshot_email_batch(
+    mailshot: Mailshot,
+    email_type: EmailTypes,
+    site_domain: str,
+    recipients: list[str],
+    on_retry_sent: Signature | None = None,
+    on_retry_failed: Signature | None = None,
+) -> int:
+    """Send the mailshot email to a batch of recipients, returning the number it was sent to.
+
+    Recipients the email couldn't be sent to straight away are retried, on_retry_sent or
+    on_retry_failed is called with the result of each retried email.
+    """
+
+    message_class = MAILSHOT_EMAIL_CLASSES[email_type]
+    connection = get_connection()
+
+    if isinstance(connection, GovNotifyEmailBackend):
+        # Every recipient has the same personalisation, so the message is only rendered once
+        return connection.send_batch(
+            message_class(mailshot=mailshot, site_domain=site_domain, to=recipients),
+            on_retry_sent,
+            on_retry_failed,
+        )
+
+    connection.send_messages(
+        [message_class(mailshot=mailshot, site_domain=site_domain, to=[r]) for r in recipients]
+    )
+
+    return len(recipients)
+
+
+def _reset_mailshot_email_progress(mailshot: Mailshot) -> None:
+    Mailshot.objects.filter(pk=mailshot.pk).update(
+        email_recipient_count=0, email_sent_count=0, email_failed_count=0
+    )
 
 
 def send_case_email(case_email: CaseEmailModel, sent_by: User) -> None:
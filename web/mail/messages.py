@@ -47,7 +47,7 @@ from web.sites import (
 from web.utils import datetime_format
 
 from .constants import DATE_FORMAT, CaseEmailCodes, EmailTypes
-from .models import EmailTemplate
+from .template_ids import get_template_id
 from .types import ImporterDetails
 from .url_helpers import (
     get_accept_org_invite_url,
@@ -79,7 +79,7 @@ class GOVNotifyEmailMessage(EmailMessage):
         self.template_id = self.get_template_id()
 
     def get_template_id(self) -> UUID:
-        return EmailTemplate.objects.get(name=self.name).gov_notify_template_id
+        return get_template_id(self.name)
 
     def message(self) -> SafeMIMEMultipart:
         """Adds the personalisation data to the message header, so it is visible when using the console backend."""
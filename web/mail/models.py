@@ -1,4 +1,7 @@
-from django.db import models
+from typing import Any
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 
 from .constants import EmailTypes
 
@@ -7,5 +10,27 @@ class EmailTemplate(models.Model):
     name = models.CharField(max_length=255, unique=True, choices=EmailTypes.choices)
     gov_notify_template_id = models.UUIDField()
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        super().save(*args, **kwargs)
+
+        # Reload the template ids cached by every process once the change is visible to them.
+        from .template_ids import clear_template_ids, invalidate_template_ids
+
+        clear_template_ids()
+        transaction.on_commit(invalidate_template_ids)
+
     def __str__(self) -> str:
         return self.get_name_display()
+
+
+class OutboxEmail(models.Model):
+    """An email waiting to be queued for sending by GOV.UK Notify.
+
+    Emails are added to the outbox in the same transaction as the change that sends them, and
+    queued in batches once that transaction has been committed (see web.mail.outbox).
+    """
+
+    template_id = models.UUIDField()
+    personalisation = models.JSONField(encoder=DjangoJSONEncoder)
+    email_address = models.CharField(max_length=254)
+    created_datetime = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,82 @@
+import json
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .api import send_outbox_emails
+from .constants import OUTBOX_BATCH_SIZE, OUTBOX_MAX_AGE
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def add_to_outbox(emails: list[OutboxEmail]) -> None:
+    """Add emails to the outbox, they are queued for sending once the transaction is committed.
+
+    Emails sent by a transaction that is rolled back are never queued.
+    """
+
+    OutboxEmail.objects.bulk_create(emails)
+    dispatch_outbox_emails_on_commit()
+
+
+def dispatch_outbox_emails_on_commit() -> None:
+    transaction.on_commit(dispatch_outbox_emails)
+
+
+def dispatch_outbox_emails() -> None:
+    """Queue a task to send each batch of OUTBOX_BATCH_SIZE emails in the outbox.
+
+    Identical emails (same template, personalisation and email address) are only sent once.
+    """
+
+    with transaction.atomic():
+        # Emails locked by another dispatch are left for it to queue
+        outbox_emails = list(OutboxEmail.objects.select_for_update(skip_locked=True).order_by("pk"))
+
+        if not outbox_emails:
+            return
+
+        emails: dict[tuple[str, str, str], tuple[str, dict, str]] = {}
+
+        for email in outbox_emails:
+            template_id = str(email.template_id)
+            key = (
+                template_id,
+                email.email_address,
+                json.dumps(email.personalisation, sort_keys=True),
+            )
+            emails.setdefault(key, (template_id, email.personalisation, email.email_address))
+
+        batch = list(emails.values())
+        for i in range(0, len(batch), OUTBOX_BATCH_SIZE):
+            send_outbox_emails.delay(batch[i : i + OUTBOX_BATCH_SIZE])
+
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in outbox_emails]).delete()
+
+    logger.info(
+        "Queued %s outbox emails (%s duplicates)", len(batch), len(outbox_emails) - len(batch)
+    )
+
+
+def get_outbox_metrics() -> dict[str, int]:
+    """Return the number of emails in the outbox and the age (in seconds) of the oldest one."""
+
+    outbox = OutboxEmail.objects.aggregate(depth=Count("pk"), oldest=Min("created_datetime"))
+    oldest = outbox["oldest"]
+
+    return {
+        "depth": outbox["depth"],
+        "oldest_age": round((timezone.now() - oldest).total_seconds()) if oldest else 0,
+    }
+
+
+def log_outbox_metrics() -> None:
+    metrics = get_outbox_metrics()
+
+    if metrics["oldest_age"] > OUTBOX_MAX_AGE:
+        logger.warning("Email outbox is backed up: %s", metrics)
+    else:
+        logger.info("Email outbox: %s", metrics)
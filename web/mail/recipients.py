@@ -1,24 +1,22 @@
 from collections.abc import Iterable
 
-from django.db.models import QuerySet
+from django.db.models import Exists, Q, QuerySet
 
 from web.domains.case.types import ImpOrExp, Organisation
 from web.flow.models import ProcessTypes
-from web.models import CaseEmail, Constabulary, Email, User
+from web.models import CaseEmail, Constabulary, Email, Exporter, Importer, User
 from web.permissions import (
     Perms,
     SysPerms,
     constabulary_get_contacts,
     get_all_case_officers,
     get_ilb_case_officers,
-    get_org_obj_permissions,
-    organisation_get_contacts,
 )
 
 from .decorators import override_recipients
 
 
-def get_user_emails_by_ids(user_ids: list[int]) -> list[str]:
+def get_user_emails_by_ids(user_ids: list[int] | QuerySet) -> list[str]:
     """Return a list emails for given users' ids"""
     return list(
         Email.objects.filter(user_id__in=user_ids)
@@ -36,8 +34,7 @@ def get_notification_emails(user: User) -> list[str]:
 
 
 def get_organisation_contacts(org: Organisation) -> QuerySet[User]:
-    obj_perms = get_org_obj_permissions(org)
-    return organisation_get_contacts(org, perms=[obj_perms.edit.codename])
+    return get_contacts_of_organisations(type(org), [org.pk])
 
 
 def get_application_contacts(application: ImpOrExp) -> QuerySet[User]:
@@ -48,11 +45,43 @@ def get_application_contacts(application: ImpOrExp) -> QuerySet[User]:
         org = application.agent or application.exporter
         exclusive_correspondence = application.exporter.exclusive_correspondence
     contacts = get_organisation_contacts(org)
-    if exclusive_correspondence and application.contact in contacts:
-        return contacts.filter(pk=application.contact.pk)
+    if exclusive_correspondence:
+        # Only the application contact (if they are still an organisation contact)
+        is_contact = Exists(contacts.filter(pk=application.contact_id))
+        return contacts.filter(Q(pk=application.contact_id) | ~is_contact)
     return contacts
 
 
+def get_contacts_of_organisations(
+    organisation_class: type[Organisation], org_pks: list[int] | QuerySet
+) -> QuerySet[User]:
+    """Active contacts (users with the edit object permission and org access) of organisations.
+
+    The object permissions are joined directly (rather than using django-guardian) so the
+    contacts can be used as a subquery, e.g. to get every contact email address in one query.
+    """
+
+    if issubclass(organisation_class, Importer):
+        obj_perm = "importeruserobjectpermission"
+        org_access = Perms.sys.importer_access.codename
+        edit = Perms.obj.importer.edit.codename
+    elif issubclass(organisation_class, Exporter):
+        obj_perm = "exporteruserobjectpermission"
+        org_access = Perms.sys.exporter_access.codename
+        edit = Perms.obj.exporter.edit.codename
+    else:
+        raise ValueError(f"Unknown organisation class {organisation_class}")
+
+    return User.objects.filter(
+        is_active=True,
+        groups__permissions__codename=org_access,
+        **{
+            f"{obj_perm}__content_object__in": org_pks,
+            f"{obj_perm}__permission__codename": edit,
+        },
+    ).distinct()
+
+
 def get_all_case_officers_email_addresses() -> list[str]:
     users = get_all_case_officers()
     return get_email_addresses_for_users(users)
@@ -82,10 +111,9 @@ def get_organisation_contact_email_addresses(org: Organisation) -> list[str]:
 
 
 def get_email_addresses_for_mailshot(organisation_class: type[Organisation]) -> list[str]:
-    emails = []
-    for org in organisation_class.objects.filter(is_active=True):
-        emails.extend(get_organisation_contact_email_addresses(org))
-    return list(set(emails))
+    active_orgs = organisation_class.objects.filter(is_active=True).values("pk")
+    users = get_contacts_of_organisations(organisation_class, active_orgs)
+    return get_email_addresses_for_users(users)
 
 
 def get_email_addresses_for_section_5_expiring_authorities() -> list[str]:
@@ -109,10 +137,9 @@ def get_shared_mailbox_for_constabulary(constabulary: Constabulary) -> list[str]
 
 @override_recipients
 def get_email_addresses_for_users(users: Iterable[User]) -> list[str]:
-    emails = []
-    for user in users:
-        emails.extend(get_notification_emails(user))
-    return list(set(emails))
+    # A queryset is used as a subquery, so the email addresses are fetched in one query
+    user_ids = users.values("pk") if isinstance(users, QuerySet) else [user.pk for user in users]
+    return get_user_emails_by_ids(user_ids)
 
 
 @override_recipients
@@ -1,6 +1,8 @@
 import datetime as dt
 
+from celery.app.task import Task
 from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import F
 from django.utils import timezone
 
 from config.celery import app
@@ -15,17 +17,24 @@ from web.models import (
 
 from .constants import (
     CELERY_MAIL_QUEUE_NAME,
+    DISPATCH_OUTBOX_EMAILS_TASK_NAME,
+    RECORD_MAILSHOT_EMAIL_RETRY_TASK_NAME,
     SEND_AUTHORITY_EXPIRING_FIREARMS_TASK_NAME,
     SEND_AUTHORITY_EXPIRING_SECTION_5_TASK_NAME,
+    SEND_MAILSHOT_BATCH_TASK_NAME,
     SEND_MAILSHOT_TASK_NAME,
     SEND_RETRACT_MAILSHOT_TASK_NAME,
+    EmailTypes,
 )
 from .emails import (
     send_authority_expiring_firearms_email,
     send_authority_expiring_section_5_email,
     send_mailshot_email,
+    send_mailshot_email_batch,
     send_retract_mailshot_email,
 )
+from .outbox import dispatch_outbox_emails, log_outbox_metrics
+from .throttle import reserve_gov_notify_sends
 from .types import ImporterDetails
 
 
@@ -35,12 +44,53 @@ def send_mailshot_email_task(mailshot_pk: int) -> None:
     send_mailshot_email(mailshot)
 
 
+@app.task(
+    bind=True, name=SEND_MAILSHOT_BATCH_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME, max_retries=None
+)
+def send_mailshot_email_batch_task(
+    self: Task, mailshot_pk: int, email_type: str, site_domain: str, recipients: list[str]
+) -> None:
+    # Wait until the batch can be sent without going over the GOV.UK Notify limits
+    countdown = reserve_gov_notify_sends(len(recipients))
+    if countdown:
+        raise self.retry(countdown=countdown)
+
+    mailshot = Mailshot.objects.get(pk=mailshot_pk)
+
+    # Emails that fail are retried on their own and only count as failed once out of retries
+    sent = send_mailshot_email_batch(
+        mailshot,
+        EmailTypes(email_type),
+        site_domain,
+        recipients,
+        on_retry_sent=record_mailshot_email_retry_task.si(mailshot_pk, True),
+        on_retry_failed=record_mailshot_email_retry_task.si(mailshot_pk, False),
+    )
+
+    Mailshot.objects.filter(pk=mailshot_pk).update(email_sent_count=F("email_sent_count") + sent)
+
+
+@app.task(name=RECORD_MAILSHOT_EMAIL_RETRY_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME)
+def record_mailshot_email_retry_task(mailshot_pk: int, sent: bool) -> None:
+    """Record the result of a mailshot email that was retried after failing in its batch."""
+
+    count_field = "email_sent_count" if sent else "email_failed_count"
+    Mailshot.objects.filter(pk=mailshot_pk).update(**{count_field: F(count_field) + 1})
+
+
 @app.task(name=SEND_RETRACT_MAILSHOT_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME)
 def send_retract_mailshot_email_task(mailshot_pk: int) -> None:
     mailshot = Mailshot.objects.get(pk=mailshot_pk)
     send_retract_mailshot_email(mailshot)
 
 
+@app.task(name=DISPATCH_OUTBOX_EMAILS_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME)
+def dispatch_outbox_emails_task() -> None:
+    """Queue emails left in the outbox, e.g. by a process that stopped before it could queue them."""
+    log_outbox_metrics()
+    dispatch_outbox_emails()
+
+
 @app.task(name=SEND_AUTHORITY_EXPIRING_SECTION_5_TASK_NAME, queue=CELERY_MAIL_QUEUE_NAME)
 def send_authority_expiring_section_5_email_task() -> None:
     expiry_date = timezone.now().date() + dt.timedelta(days=30)
@@ -0,0 +1,55 @@
+import uuid
+from uuid import UUID
+
+from django.core.cache import cache
+
+from .constants import EmailTypes
+from .models import EmailTemplate
+
+# Redis key of the version of the email templates, changed whenever an EmailTemplate is saved.
+TEMPLATE_IDS_VERSION_KEY = "email_template_ids_version"
+
+# GOV.UK Notify template ids loaded by this process and the version they were loaded at.
+_template_ids: dict[str, UUID] = {}
+_template_ids_version: str | None = None
+
+
+def get_template_id(name: EmailTypes) -> UUID:
+    """Return the GOV.UK Notify template id of an email type.
+
+    The template ids are loaded once per process (rather than once per message) and only reloaded
+    when an EmailTemplate has been saved by any process.
+    """
+
+    version = cache.get(TEMPLATE_IDS_VERSION_KEY)
+
+    if version != _template_ids_version or name not in _template_ids:
+        _load_template_ids(version)
+
+    try:
+        return _template_ids[name]
+    except KeyError:
+        raise EmailTemplate.DoesNotExist(f"EmailTemplate {name} does not exist.")
+
+
+def invalidate_template_ids() -> None:
+    """Make every process reload the template ids the next time one is used."""
+
+    clear_template_ids()
+    cache.set(TEMPLATE_IDS_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def clear_template_ids() -> None:
+    """Clear the template ids loaded by this process."""
+
+    global _template_ids_version
+
+    _template_ids.clear()
+    _template_ids_version = None
+
+
+def _load_template_ids(version: str | None) -> None:
+    global _template_ids, _template_ids_version
+
+    _template_ids = dict(EmailTemplate.objects.values_list("name", "gov_notify_template_id"))
+    _template_ids_version = version
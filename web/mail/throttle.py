@@ -0,0 +1,61 @@
+import datetime as dt
+import math
+import time
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .constants import GOV_NOTIFY_EMAILS_PER_DAY, GOV_NOTIFY_EMAILS_PER_MINUTE
+
+# Redis keys of the number of emails sent to GOV.UK Notify in the current minute / day.
+MINUTE_SENDS_KEY = "gov_notify_sends:minute:{}"
+DAY_SENDS_KEY = "gov_notify_sends:day:{}"
+
+
+def reserve_gov_notify_sends(count: int) -> int:
+    """Reserve count emails against the GOV.UK Notify sending limits shared by every worker.
+
+    Returns 0 when the emails can be sent now, otherwise the number of seconds to wait before
+    trying again (nothing is reserved).
+    """
+
+    now = time.time()
+    minute_key, day_key = _get_sends_keys(now)
+
+    if _incr(minute_key, count, timeout=60 * 2) > GOV_NOTIFY_EMAILS_PER_MINUTE:
+        cache.decr(minute_key, count)
+        return math.ceil(60 - now % 60)
+
+    if _incr(day_key, count, timeout=60 * 60 * 25) > GOV_NOTIFY_EMAILS_PER_DAY:
+        cache.decr(minute_key, count)
+        cache.decr(day_key, count)
+        return _seconds_until_tomorrow()
+
+    return 0
+
+
+def record_gov_notify_sends(count: int) -> None:
+    """Record emails sent without a reservation, so they count towards the shared limits."""
+
+    minute_key, day_key = _get_sends_keys(time.time())
+    _incr(minute_key, count, timeout=60 * 2)
+    _incr(day_key, count, timeout=60 * 60 * 25)
+
+
+def _get_sends_keys(now: float) -> tuple[str, str]:
+    return MINUTE_SENDS_KEY.format(int(now // 60)), DAY_SENDS_KEY.format(timezone.localdate())
+
+
+def _incr(key: str, count: int, timeout: int) -> int:
+    # add is a no-op when the key exists, so the counter is only created (and expired) once
+    cache.add(key, 0, timeout=timeout)
+    return cache.incr(key, count)
+
+
+def _seconds_until_tomorrow() -> int:
+    now = timezone.localtime()
+    tomorrow = timezone.make_aware(
+        dt.datetime.combine(now.date() + dt.timedelta(days=1), dt.time.min)
+    )
+
+    return math.ceil((tomorrow - now).total_seconds())
@@ -10,6 +10,7 @@ from django.db import models
 from django.utils import timezone
 
 from web.domains.country.models import Country
+from web.management.commands.utils.add_report_data import add_report_data
 from web.management.commands.utils.load_data import load_app_test_data
 from web.models import (
     ActQuantity,
@@ -143,6 +144,12 @@ class Command(BaseCommand):
             help="You must specify this to enable the command to run",
             required=True,
         )
+        parser.add_argument(
+            "--report-rows",
+            type=int,
+            default=0,
+            help="Number of applications, access requests and users to add in bulk for reports.",
+        )
 
     def add_ilb_admin_users(self, password: str) -> None:
         ilb_admin_group = Group.objects.get(name="ILB Case Officer")
@@ -559,6 +566,14 @@ class Command(BaseCommand):
             name="Dummy 'Is Biocidal Claim legislation'", is_biocidal_claim=True
         )
 
+        if options["report_rows"]:
+            add_report_data(
+                options["report_rows"],
+                User.objects.get(username="ilb_admin"),
+                Importer.objects.get(name="Dummy importer 1"),
+            )
+            self.stdout.write(f"Created {options['report_rows']} rows of report data")
+
     def create_user(
         self,
         username: str,
@@ -0,0 +1,63 @@
+import argparse
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from playwright.sync_api import sync_playwright
+
+from web.types import DocumentTypes
+from web.utils.pdf import StaticPdfGenerator
+from web.utils.pdf.browser import get_browser_pool, html_to_pdf
+
+
+def _html_to_pdf_without_pool(document_html: str) -> bytes:
+    """Render a PDF by launching a new browser for the document (the behaviour before pooling)."""
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        context = browser.new_context()
+        page = context.new_page()
+        page.set_content(document_html)
+
+        return page.pdf(format="A4")
+
+
+# To run: make manage args="benchmark_pdf_generation --count 50"
+class Command(BaseCommand):
+    help = """Compare the PDFs rendered per second with and without the Chromium browser pool."""
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=20,
+            help="Number of documents to render with each method.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count = options["count"]
+        document_html = StaticPdfGenerator(DocumentTypes.CFS_COVER_LETTER).get_document_html()
+
+        # Start with a cold pool so the first browser launch is included in the timing.
+        get_browser_pool().close()
+
+        for label, render in [
+            ("Without browser pool", _html_to_pdf_without_pool),
+            ("With browser pool", html_to_pdf),
+        ]:
+            elapsed = self._time_renders(render, document_html, count)
+
+            self.stdout.write(
+                f"{label}: {count} documents in {elapsed:.2f}s"
+                f" ({count / elapsed:.2f} documents/second)"
+            )
+
+    @staticmethod
+    def _time_renders(render: Callable[[str], bytes], document_html: str, count: int) -> float:
+        start = time.perf_counter()
+
+        for _ in range(count):
+            render(document_html)
+
+        return time.perf_counter() - start
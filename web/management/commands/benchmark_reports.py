@@ -0,0 +1,166 @@
+import argparse
+import datetime as dt
+import json
+import time
+import tracemalloc
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from pydantic import BaseModel
+
+from web.management.commands.utils.add_report_data import (
+    SUBMITTED_OVER_DAYS,
+    add_report_data,
+)
+from web.models import Importer, Report, ScheduleReport, User
+from web.reports import interfaces
+from web.reports.constants import DateFilterType, UserDateFilterType
+from web.reports.interfaces import ImportLicenceFilter, ReportInterface, UserFilter
+
+# The date each report's rows are filtered by, for reports with a choice of date filter.
+DATE_FILTER_TYPES: dict[type[BaseModel], str] = {
+    ImportLicenceFilter: DateFilterType.SUBMITTED,
+    UserFilter: UserDateFilterType.DATE_JOINED,
+}
+
+
+def get_report_interfaces() -> list[type[ReportInterface]]:
+    """Return every report interface (that is used by a report) defined in web.reports.interfaces."""
+
+    report_interfaces = []
+    subclasses = ReportInterface.__subclasses__()
+
+    while subclasses:
+        interface_class = subclasses.pop(0)
+        subclasses.extend(interface_class.__subclasses__())
+
+        if interface_class.__module__ == interfaces.__name__ and hasattr(interface_class, "name"):
+            report_interfaces.append(interface_class)
+
+    return report_interfaces
+
+
+# To run: make manage args="benchmark_reports --seed 10000 --output reports.json"
+class Command(BaseCommand):
+    help = """Run every report interface, recording the query plan, rows, runtime and peak memory.
+
+    The query plan of each report is captured with EXPLAIN (ANALYZE, BUFFERS) and the results are
+    written as JSON so they can be compared between runs.
+    """
+
+    def add_arguments(self, parser: argparse.ArgumentParser) -> None:
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Number of applications, access requests and users to add before benchmarking.",
+        )
+        parser.add_argument(
+            "--seed-user",
+            default="ilb_admin",
+            help="Username of the user that submitted the seeded applications.",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=SUBMITTED_OVER_DAYS,
+            help="Number of days before today the reports cover.",
+        )
+        parser.add_argument(
+            "--output",
+            type=argparse.FileType("w"),
+            help="File to write the JSON results to (defaults to stdout).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["seed"]:
+            self._seed(options["seed"], options["seed_user"])
+
+        date_to = timezone.localdate()
+        date_from = date_to - dt.timedelta(days=options["days"])
+        results = [
+            self._benchmark(interface_class, date_from, date_to)
+            for interface_class in get_report_interfaces()
+        ]
+
+        output = options["output"] or self.stdout
+        json.dump(results, output, indent=2)
+        output.write("\n")
+
+    def _seed(self, count: int, username: str) -> None:
+        if settings.APP_ENV in ["hotfix", "production"]:
+            raise CommandError("Can only add report data in non-production environments.")
+
+        user = User.objects.get(username=username)
+        importer = Importer.objects.filter(is_active=True, offices__isnull=False).first()
+
+        if not importer:
+            raise CommandError("An importer with an office is needed to add report data.")
+
+        add_report_data(count, user, importer)
+        self.stderr.write(f"Added {count} applications, access requests and users.")
+
+    def _benchmark(
+        self, interface_class: type[ReportInterface], date_from: dt.date, date_to: dt.date
+    ) -> dict[str, Any]:
+        scheduled_report = ScheduleReport(
+            title="Benchmark",
+            report=Report.objects.first(),
+            parameters=_get_parameters(interface_class, date_from, date_to),
+        )
+
+        plan = json.loads(
+            interface_class(scheduled_report)
+            .get_queryset()
+            .explain(analyze=True, buffers=True, format="json")
+        )[0]
+
+        # Timed without tracing memory allocations as tracemalloc slows the report down
+        interface = interface_class(scheduled_report)
+        start = time.perf_counter()
+        rows = sum(1 for _ in interface.iter_rows())
+        runtime = time.perf_counter() - start
+
+        tracemalloc.start()
+        try:
+            for _ in interface_class(scheduled_report).iter_rows():
+                pass
+
+            _, peak_memory = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.stderr.write(f"{interface_class.name}: {rows} rows in {runtime:.2f}s")
+
+        return {
+            "interface": interface_class.name,
+            "parameters": scheduled_report.parameters,
+            "rows": rows,
+            "errors": len(interface.errors),
+            "runtime_seconds": round(runtime, 3),
+            "timings": {phase: round(t, 3) for phase, t in interface.timer.timings.items()},
+            "peak_memory_bytes": peak_memory,
+            "planning_time_ms": plan["Planning Time"],
+            "execution_time_ms": plan["Execution Time"],
+            "plan": plan["Plan"],
+        }
+
+
+def _get_parameters(
+    interface_class: type[ReportInterface], date_from: dt.date, date_to: dt.date
+) -> dict[str, Any]:
+    """Return report parameters covering the date range for the filters of the interface."""
+
+    parameters: dict[str, Any] = {
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "application_type": "",
+        "legislation": [],
+    }
+
+    if date_filter_type := DATE_FILTER_TYPES.get(interface_class.ReportFilter):
+        parameters["date_filter_type"] = date_filter_type
+
+    return parameters
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, models, transaction
+
+from web.models import CaseDocumentReference, ExportApplication, ImportApplication, User
+from web.utils.search import get_wildcard_filter
+
+# (label, model, field, search pattern) for each wildcard search to compare.
+SEARCHES: list[tuple[str, type[models.Model], str, str]] = [
+    ("Import case reference (prefix)", ImportApplication, "reference", "IMA/2024/"),
+    ("Import case reference (inner wildcard)", ImportApplication, "reference", "IMA/%3/%3"),
+    ("Import case reference (leading wildcard)", ImportApplication, "reference", "%/00001"),
+    ("Export case reference (inner wildcard)", ExportApplication, "reference", "CA/%/0001"),
+    ("Licence reference (prefix)", CaseDocumentReference, "reference", "GBSIL"),
+    ("Licence reference (inner wildcard)", CaseDocumentReference, "reference", "GBSIL%123"),
+    ("Application contact first name", User, "first_name", "%ohn"),
+    ("Application contact last name", User, "last_name", "%mit%"),
+]
+
+
+# To run: make manage args="explain_search_indexes --analyze"
+class Command(BaseCommand):
+    help = """Compare query plans of wildcard searches with and without the search indexes."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Run each query with EXPLAIN (ANALYZE, BUFFERS) to record actual timings.",
+        )
+
+    def handle(self, *args, **options):
+        explain_options = {"analyze": True, "buffers": True} if options["analyze"] else {}
+
+        for label, model, field, pattern in SEARCHES:
+            qs = model.objects.filter(get_wildcard_filter(field, pattern)).values("pk")
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{label}: {pattern!r}"))
+            self.stdout.write(self.style.MIGRATE_LABEL("With search indexes:"))
+            self.stdout.write(qs.explain(**explain_options))
+
+            self.stdout.write(self.style.MIGRATE_LABEL("Without search indexes:"))
+            self.stdout.write(self._explain_without_indexes(qs, explain_options))
+            self.stdout.write("")
+
+    @staticmethod
+    def _explain_without_indexes(qs: models.QuerySet, explain_options: dict[str, bool]) -> str:
+        """Return the query plan when Postgres isn't allowed to use an index."""
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_indexscan = off")
+                cursor.execute("SET LOCAL enable_bitmapscan = off")
+                cursor.execute("SET LOCAL enable_indexonlyscan = off")
+
+            return qs.explain(**explain_options)
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from web.models import ExportApplication, ImportApplication
+from web.utils.search import refresh_search_rows
+
+
+# To run: make manage args="rebuild_search_rows"
+class Command(BaseCommand):
+    help = """Rebuild the search rows used to display application search results."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of applications to refresh in each batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+
+        for model in [ImportApplication, ExportApplication]:
+            app_pks = list(model.objects.order_by("pk").values_list("pk", flat=True))
+
+            for i in range(0, len(app_pks), batch_size):
+                refresh_search_rows(app_pks[i : i + batch_size])
+
+            self.stdout.write(f"Rebuilt {len(app_pks)} {model._meta.verbose_name} search rows.")
@@ -0,0 +1,243 @@
+import datetime as dt
+from typing import TypeVar
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models, router, transaction
+from django.utils import timezone
+
+from web.domains.case.shared import ImpExpStatus
+from web.flow.models import Process, ProcessTypes
+from web.models import (
+    AccessRequest,
+    CaseDocumentReference,
+    Country,
+    ExporterAccessRequest,
+    ImportApplicationLicence,
+    ImportApplicationType,
+    Importer,
+    ImporterAccessRequest,
+    Section5Clause,
+    SILApplication,
+    SILGoodsSection1,
+    SILGoodsSection2,
+    SILGoodsSection5,
+    User,
+)
+
+ProcessT = TypeVar("ProcessT", bound=Process)
+
+BATCH_SIZE = 1000
+
+# Applications and access requests are submitted over this many days before today.
+SUBMITTED_OVER_DAYS = 365
+
+# Time between an application being submitted and completed.
+PROCESSING_TIME = dt.timedelta(days=5)
+
+
+def add_report_data(count: int, user: User, importer: Importer) -> None:
+    """Add count SIL applications, importer & exporter access requests and users for the reports.
+
+    Rows are inserted in bulk so a dataset large enough to benchmark the report queries can be
+    added quickly.
+    """
+
+    submit_datetimes = _get_submit_datetimes(count)
+
+    _add_sil_applications(submit_datetimes, user, importer)
+    _add_access_requests(ImporterAccessRequest, submit_datetimes, user)
+    _add_access_requests(ExporterAccessRequest, submit_datetimes, user)
+    _add_users(submit_datetimes)
+
+
+def bulk_create_processes(objs: list[ProcessT]) -> list[ProcessT]:
+    """Bulk create Process subclasses.
+
+    bulk_create doesn't support multi-table inheritance, so the rows are inserted into the table of
+    each model in the inheritance chain in turn (the same way Model.save does for a single row).
+    """
+
+    if not objs:
+        return objs
+
+    model = type(objs[0])
+    table_models = [*reversed(model._meta.get_parent_list()), model]
+    using = router.db_for_write(model)
+
+    with transaction.atomic(using=using):
+        for i in range(0, len(objs), BATCH_SIZE):
+            batch = objs[i : i + BATCH_SIZE]
+
+            for table_model in table_models:
+                _insert_table_rows(table_model, batch, using)
+
+    return objs
+
+
+def _insert_table_rows(table_model: type[models.Model], objs: list, using: str) -> None:
+    opts = table_model._meta
+    fields = [f for f in opts.local_concrete_fields if f not in opts.db_returning_fields]
+
+    if not opts.db_returning_fields:
+        table_model._base_manager._insert(objs, fields=fields, using=using)
+        return
+
+    # The root of the inheritance chain creates the primary key of every table
+    rows = table_model._base_manager._insert(
+        objs, fields=fields, returning_fields=opts.db_returning_fields, using=using
+    )
+
+    for obj, (pk, *_) in zip(objs, rows):
+        # Set the primary key (or parent link) of each table in the chain
+        for obj_model in [type(obj), *type(obj)._meta.get_parent_list()]:
+            setattr(obj, obj_model._meta.pk.attname, pk)
+
+        obj._state.adding = False
+        obj._state.db = using
+
+
+def _get_submit_datetimes(count: int) -> list[dt.datetime]:
+    # Submitted at least PROCESSING_TIME ago so every application has been completed
+    latest = timezone.now() - PROCESSING_TIME
+    interval = (dt.timedelta(days=SUBMITTED_OVER_DAYS) - PROCESSING_TIME) / max(count, 1)
+
+    return [latest - interval * i for i in range(count)]
+
+
+def _add_sil_applications(
+    submit_datetimes: list[dt.datetime], user: User, importer: Importer
+) -> None:
+    application_type = ImportApplicationType.objects.get(
+        type=ImportApplicationType.Types.FIREARMS,
+        sub_type=ImportApplicationType.SubTypes.SIL,
+    )
+    country = Country.objects.filter(is_active=True).first()
+    office = importer.offices.first()
+    section_5_clause = Section5Clause.objects.first()
+    start = SILApplication.objects.count()
+
+    applications = bulk_create_processes(
+        [
+            SILApplication(
+                process_type=ProcessTypes.FA_SIL,
+                application_type=application_type,
+                status=ImpExpStatus.COMPLETED,
+                decision=SILApplication.APPROVE,
+                reference=f"IMA/{submitted.year}/B{start + i:07}",
+                submit_datetime=submitted,
+                last_submit_datetime=submitted,
+                importer=importer,
+                importer_office=office,
+                contact=user,
+                submitted_by=user,
+                created_by=user,
+                last_updated_by=user,
+                origin_country=country,
+                consignment_country=country,
+            )
+            for i, submitted in enumerate(submit_datetimes, start=1)
+        ]
+    )
+
+    licences = ImportApplicationLicence.objects.bulk_create(
+        [
+            ImportApplicationLicence(
+                import_application=app,
+                status=ImportApplicationLicence.Status.ACTIVE,
+                case_reference=app.reference,
+                issue_paper_licence_only=False,
+                licence_start_date=app.submit_datetime.date(),
+                licence_end_date=app.submit_datetime.date() + dt.timedelta(days=365),
+                case_completion_datetime=app.submit_datetime + PROCESSING_TIME,
+            )
+            for app in applications
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    licence_content_type = ContentType.objects.get_for_model(ImportApplicationLicence)
+    CaseDocumentReference.objects.bulk_create(
+        [
+            CaseDocumentReference(
+                document_type=CaseDocumentReference.Type.LICENCE,
+                content_type=licence_content_type,
+                object_id=licence.pk,
+                reference=f"GBSIL{licence.pk:07}B",
+            )
+            for licence in licences
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+    for goods_model in [SILGoodsSection1, SILGoodsSection2]:
+        goods_model.objects.bulk_create(
+            [
+                goods_model(import_application=app, description="Test firearm", quantity=10)
+                for app in applications
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+    if section_5_clause:
+        SILGoodsSection5.objects.bulk_create(
+            [
+                SILGoodsSection5(
+                    import_application=app,
+                    description="Test section 5 firearm",
+                    quantity=5,
+                    section_5_clause=section_5_clause,
+                )
+                for app in applications
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+def _add_access_requests(
+    model: type[ImporterAccessRequest] | type[ExporterAccessRequest],
+    submit_datetimes: list[dt.datetime],
+    user: User,
+) -> None:
+    start = model.objects.count()
+
+    bulk_create_processes(
+        [
+            model(
+                process_type=model.PROCESS_TYPE,
+                reference=f"{model.REQUEST_TYPE[0]}ar/B{start + i}",
+                status=AccessRequest.Statuses.CLOSED,
+                request_type=model.AGENT_ACCESS if i % 2 else model.REQUEST_TYPES[0][0],
+                organisation_name=f"Benchmark organisation {i}",
+                organisation_address="1 Main Street",
+                agent_name="Benchmark agent" if i % 2 else None,
+                agent_address="1 Agent House" if i % 2 else "",
+                request_reason="Benchmark",
+                response=AccessRequest.APPROVED if i % 3 else AccessRequest.REFUSED,
+                response_reason="" if i % 3 else "Benchmark refusal",
+                submit_datetime=submitted,
+                submitted_by=user,
+                last_updated_by=user,
+            )
+            for i, submitted in enumerate(submit_datetimes, start=1)
+        ]
+    )
+
+
+def _add_users(date_joined: list[dt.datetime]) -> None:
+    start = User.objects.count()
+
+    User.objects.bulk_create(
+        [
+            User(
+                username=f"report_user_{start + i}",
+                email=f"report_user_{start + i}@example.com",  # /PS-IGNORE
+                first_name="Report",
+                last_name=f"User {start + i}",
+                date_joined=joined,
+                last_login=joined,
+                password="!",
+            )
+            for i, joined in enumerate(date_joined, start=1)
+        ],
+        batch_size=BATCH_SIZE,
+    )
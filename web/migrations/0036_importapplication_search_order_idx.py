@@ -0,0 +1,19 @@
+# Generated by Django 4.2.16 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0035_casedocumentreference_web_casedoc_content_e7f950_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="importapplication",
+            index=models.Index(
+                fields=["-submit_datetime", "-process_ptr"], name="IA_search_order_idx"
+            ),
+        ),
+    ]
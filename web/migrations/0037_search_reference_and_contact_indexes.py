@@ -0,0 +1,74 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:09
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0036_importapplication_search_order_idx"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="casedocumentreference",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("reference"), name="text_pattern_ops"
+                ),
+                name="CDR_search_ref_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="casedocumentreference",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["reference"], name="CDR_search_ref_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exportapplication",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("reference"), name="text_pattern_ops"
+                ),
+                name="EA_search_ref_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="exportapplication",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["reference"], name="EA_search_ref_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importapplication",
+            index=models.Index(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("reference"), name="text_pattern_ops"
+                ),
+                name="IA_search_ref_upper_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="importapplication",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["reference"], name="IA_search_ref_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["first_name"], name="USER_first_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="user",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["last_name"], name="USER_last_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+    ]
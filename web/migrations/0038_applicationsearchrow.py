@@ -0,0 +1,65 @@
+# Generated by Django 4.2.16 on 2026-10-18 02:17
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0037_search_reference_and_contact_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ApplicationSearchRow",
+            fields=[
+                (
+                    "application",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_row",
+                        serialize=False,
+                        to="web.process",
+                    ),
+                ),
+                (
+                    "case_type",
+                    models.CharField(
+                        choices=[("import", "Import"), ("export", "Export")], max_length=6
+                    ),
+                ),
+                ("process_type", models.CharField(max_length=50)),
+                ("reference", models.CharField(max_length=100, null=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("COMPLETED", "Completed"),
+                            ("DELETED", "Deleted"),
+                            ("IN_PROGRESS", "In Progress"),
+                            ("PROCESSING", "Processing"),
+                            ("REVOKED", "Revoked"),
+                            ("STOPPED", "Stopped"),
+                            ("SUBMITTED", "Submitted"),
+                            ("VARIATION_REQUESTED", "Variation Requested"),
+                            ("WITHDRAWN", "Withdrawn"),
+                        ],
+                        max_length=30,
+                    ),
+                ),
+                ("order_by_datetime", models.DateTimeField(null=True)),
+                (
+                    "result_data",
+                    models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                (
+                    "action_data",
+                    models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0039_searchresultsspreadsheet"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ScheduleReportProgress",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("index", models.PositiveSmallIntegerField()),
+                ("name", models.CharField(max_length=255)),
+                ("rows_processed", models.PositiveIntegerField(default=0)),
+                ("total_rows_estimate", models.PositiveIntegerField(null=True)),
+                ("timings", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="progress",
+                        to="web.schedulereport",
+                    ),
+                ),
+            ],
+        ),
+    ]
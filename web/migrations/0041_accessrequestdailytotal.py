@@ -0,0 +1,38 @@
+# Generated by Django 4.2.16 on 2026-10-18 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0040_schedulereportprogress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccessRequestDailyTotal",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("process_type", models.CharField(max_length=50)),
+                ("response", models.CharField(max_length=20)),
+                ("total", models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="accessrequest",
+            index=models.Index(fields=["submit_datetime"], name="AccR_submit_datetime_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="accessrequestdailytotal",
+            constraint=models.UniqueConstraint(
+                fields=("day", "process_type", "response"), name="unique_access_request_day_total"
+            ),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.16 on 2026-10-18 04:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0041_accessrequestdailytotal"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mailshot",
+            name="email_failed_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mailshot",
+            name="email_recipient_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mailshot",
+            name="email_sent_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
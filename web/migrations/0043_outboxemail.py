@@ -0,0 +1,32 @@
+# Generated by Django 4.2.16 on 2026-10-18 04:28
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0042_mailshot_email_progress"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OutboxEmail",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("template_id", models.UUIDField()),
+                (
+                    "personalisation",
+                    models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder),
+                ),
+                ("email_address", models.CharField(max_length=254)),
+                ("created_datetime", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.16 on 2026-10-18 04:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0043_outboxemail"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="casedocumentreference",
+            index=models.Index(fields=["reference"], name="CDR_reference_idx"),
+        ),
+    ]
@@ -99,10 +99,12 @@ from web.domains.case.export.models import (
 )
 from web.domains.case.fir.models import FurtherInformationRequest
 from web.domains.case.models import (
+    ApplicationSearchRow,
     CaseDocumentReference,
     CaseEmail,
     CaseEmailDownloadLink,
     CaseNote,
+    SearchResultsSpreadsheet,
     UpdateRequest,
     VariationRequest,
     WithdrawApplication,
@@ -166,13 +168,21 @@ from web.domains.signature.models import Signature
 from web.domains.template.models import CFSScheduleParagraph, Template
 from web.domains.user.models import Email, PhoneNumber, User
 from web.flow.models import Process, Task
-from web.mail.models import EmailTemplate
+from web.mail.models import EmailTemplate, OutboxEmail
 from web.models.models import GlobalPermission, UniqueReference
-from web.reports.models import GeneratedReport, Report, ScheduleReport
+from web.reports.models import (
+    AccessRequestDailyTotal,
+    GeneratedReport,
+    Report,
+    ScheduleReport,
+    ScheduleReportProgress,
+)
 
 __all__ = [
     "AccessRequest",
+    "AccessRequestDailyTotal",
     "ActQuantity",
+    "ApplicationSearchRow",
     "ApprovalRequest",
     "CFSProduct",
     "CFSProductTemplate",
@@ -257,6 +267,7 @@ __all__ = [
     "ObsoleteCalibreGroup",
     "Office",
     "OpenIndividualLicenceApplication",
+    "OutboxEmail",
     "OutwardProcessingTradeApplication",
     "OutwardProcessingTradeFile",
     "OverseasRegion",
@@ -267,6 +278,8 @@ __all__ = [
     "ProductLegislation",
     "Report",
     "ScheduleReport",
+    "ScheduleReportProgress",
+    "SearchResultsSpreadsheet",
     "SIGLTransmission",
     "SILApplication",
     "SILChecklist",
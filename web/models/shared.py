@@ -1,7 +1,9 @@
 import enum
+from typing import Any
 
 from django.core.serializers.json import DjangoJSONEncoder
 from django.core.validators import MinValueValidator
+from django.db.models import DEFERRED
 
 from web.types import TypedTextChoices
 
@@ -46,3 +48,42 @@ class EnumJsonEncoder(DjangoJSONEncoder):
             return o.value
         else:
             return super().default(o)
+
+
+class SearchRowFieldsMixin:
+    """Refresh the application search rows showing a record when the fields they use change.
+
+    SEARCH_ROW_FIELDS are the attnames of the fields copied into the search rows
+    (see web.models.ApplicationSearchRow).
+    """
+
+    SEARCH_ROW_FIELDS: tuple[str, ...] = ()
+
+    _search_row_values: tuple[Any, ...] | None = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)  # type:ignore[misc]
+        instance._search_row_values = instance._get_search_row_values()
+
+        return instance
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        created = self._state.adding  # type:ignore[attr-defined]
+        changed = self._get_search_row_values() != self._search_row_values
+
+        super().save(*args, **kwargs)  # type:ignore[misc]
+
+        self._search_row_values = self._get_search_row_values()
+
+        if changed:
+            self.refresh_search_rows(created)
+
+    def refresh_search_rows(self, created: bool) -> None:
+        """Schedule a refresh of the search rows showing this record."""
+
+        raise NotImplementedError
+
+    def _get_search_row_values(self) -> tuple[Any, ...]:
+        # Read from __dict__ so deferred fields aren't loaded.
+        return tuple(self.__dict__.get(field, DEFERRED) for field in self.SEARCH_ROW_FIELDS)
@@ -6,6 +6,9 @@ NO = "No"
 CELERY_REPORTS_QUEUE_NAME = "reports"
 
 GENERATE_REPORT_TASK_NAME = "web.reports.generate_report"
+GENERATE_REPORT_SHEET_TASK_NAME = "web.reports.generate_report_sheet"
+MERGE_REPORT_SHEETS_TASK_NAME = "web.reports.merge_report_sheets"
+REFRESH_REPORT_ROLLUPS_TASK_NAME = "web.reports.refresh_report_rollups"
 
 
 class ReportStatus(TypedTextChoices):
@@ -16,6 +19,16 @@ class ReportStatus(TypedTextChoices):
     SUBMITTED = ("SUBMITTED", "Submitted")
 
 
+class ReportPhase(TypedTextChoices):
+    QUERY = ("QUERY", "Query")
+    SERIALISE = ("SERIALISE", "Serialise")
+    CSV = ("CSV", "CSV")
+    XLSX = ("XLSX", "XLSX")
+    UPLOAD = ("UPLOAD", "Upload")
+    CACHE = ("CACHE", "Cache")
+    PARQUET = ("PARQUET", "Parquet")
+
+
 class ReportType(TypedTextChoices):
     ISSUED_CERTIFICATES = ("ISSUED_CERTIFICATES", "Issued Certificates")
     ACCESS_REQUESTS = ("ACCESS_REQUESTS", "Access Requests")
@@ -1,13 +1,24 @@
-import csv
-from io import StringIO
-
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from functools import partial
+from itertools import chain
+from typing import IO, Any, TypedDict
+
+import xlsxwriter
 from django.utils import timezone
 
 from web.models import File, GeneratedReport, ScheduleReport
-from web.utils.s3 import put_object_in_s3
-from web.utils.spreadsheet import MIMETYPE, XlsxSheetConfig, generate_xlsx_file
+from web.utils.s3 import (
+    delete_file_from_s3,
+    get_file_stream_from_s3,
+    get_s3_client,
+    put_object_in_s3,
+    upload_file_obj_to_s3_in_parts,
+)
+from web.utils.spreadsheet import MIMETYPE, CsvWriter, XlsxSheetConfig, XlsxSheetWriter
 
-from .constants import ReportStatus
+from .constants import ReportPhase, ReportStatus, ReportType
 from .interfaces import (
     AccessRequestTotalsInterface,
     ActiveStaffUserInterface,
@@ -23,7 +34,47 @@ from .interfaces import (
     SILFirearmsLicenceInterface,
     SupplementaryFirearmsInterface,
 )
-from .utils import get_error_serializer_header
+from .parquet import ReportParquetWriter
+from .partitions import iter_report_rows
+from .progress import PhaseTimer, ReportProgress
+from .utils import dumps_typed_json, get_error_serializer_header, loads_typed_json
+
+# Rows are flushed to a temporary file as they are written so the workbook uses constant memory.
+XLSX_WORKBOOK_OPTIONS = {"constant_memory": True, "remove_timezone": True}
+
+# Name of the progress recorded for writing the errors and uploading the xlsx file of a report.
+WORKBOOK_PROGRESS_NAME = "Workbook"
+
+# Reports with a sheet per interface, each sheet is generated by a separate task.
+MULTI_SHEET_REPORT_INTERFACES: dict[str, list[type[ReportInterface]]] = {
+    ReportType.ACCESS_REQUESTS: [
+        ImporterAccessRequestInterface,
+        ExporterAccessRequestInterface,
+        AccessRequestTotalsInterface,
+    ],
+    ReportType.FIREARMS_LICENCES: [
+        DFLFirearmsLicenceInterface,
+        SILFirearmsLicenceInterface,
+        OILFirearmsLicenceInterface,
+    ],
+    ReportType.ACTIVE_USERS: [
+        ActiveUserInterface,
+        ActiveStaffUserInterface,
+        RegisteredUserInterface,
+    ],
+}
+
+
+class ReportSheet(TypedDict):
+    """A sheet of a multi-sheet report, written by write_report_sheet.
+
+    The rows (and any errors) are stored in S3 as JSON lines until the sheets are merged.
+    """
+
+    name: str
+    header: list[str]
+    rows_path: str
+    errors_path: str | None
 
 
 def get_report_file_name(scheduled_report: ScheduleReport) -> str:
@@ -59,17 +110,6 @@ def generate_supplementary_firearms_report(scheduled_report: ScheduleReport) ->
     _end_processing_report(scheduled_report, has_errors)
 
 
-def generate_access_request_report(scheduled_report: ScheduleReport) -> None:
-    scheduled_report = _start_processing_report(scheduled_report)
-    import_report_interface = ImporterAccessRequestInterface(scheduled_report)
-    export_report_interface = ExporterAccessRequestInterface(scheduled_report)
-    totals = AccessRequestTotalsInterface(scheduled_report)
-    has_errors = write_files(
-        scheduled_report, [import_report_interface, export_report_interface, totals]
-    )
-    _end_processing_report(scheduled_report, has_errors)
-
-
 def generate_import_licence_report(scheduled_report: ScheduleReport) -> None:
     scheduled_report = _start_processing_report(scheduled_report)
     report_interface = ImportLicenceInterface(scheduled_report)
@@ -77,94 +117,358 @@ def generate_import_licence_report(scheduled_report: ScheduleReport) -> None:
     _end_processing_report(scheduled_report, has_errors)
 
 
-def generate_firearms_licences_report(scheduled_report: ScheduleReport) -> None:
-    scheduled_report = _start_processing_report(scheduled_report)
-    dfl_interface = DFLFirearmsLicenceInterface(scheduled_report)
-    sil_interface = SILFirearmsLicenceInterface(scheduled_report)
-    oil_interface = OILFirearmsLicenceInterface(scheduled_report)
-    has_errors = write_files(scheduled_report, [dfl_interface, sil_interface, oil_interface])
-    _end_processing_report(scheduled_report, has_errors)
+def start_multi_sheet_report(scheduled_report: ScheduleReport) -> int:
+    """Mark a multi-sheet report as in progress and return the number of sheets to generate."""
 
+    _start_processing_report(scheduled_report)
 
-def generate_active_users_report(scheduled_report: ScheduleReport) -> None:
-    scheduled_report = _start_processing_report(scheduled_report)
-    active_users_interface = ActiveUserInterface(scheduled_report)
-    active_staff_interface = ActiveStaffUserInterface(scheduled_report)
-    registered_users_interface = RegisteredUserInterface(scheduled_report)
-    has_errors = write_files(
-        scheduled_report,
-        [active_users_interface, active_staff_interface, registered_users_interface],
-    )
+    return len(MULTI_SHEET_REPORT_INTERFACES[scheduled_report.report.report_type])
+
+
+def generate_report_sheet(scheduled_report: ScheduleReport, index: int) -> ReportSheet:
+    """Generate a sheet of a multi-sheet report."""
+
+    interface_class = MULTI_SHEET_REPORT_INTERFACES[scheduled_report.report.report_type][index]
+
+    return write_report_sheet(scheduled_report, interface_class(scheduled_report), index)
+
+
+def finish_multi_sheet_report(scheduled_report: ScheduleReport, sheets: list[ReportSheet]) -> None:
+    """Merge the sheets of a multi-sheet report and mark the report as completed."""
+
+    has_errors = merge_report_sheets(scheduled_report, sheets)
     _end_processing_report(scheduled_report, has_errors)
 
 
 def write_files(scheduled_report: ScheduleReport, report_interfaces: list[ReportInterface]) -> bool:
-    workbook_sheets = []
-    errors = []
-    has_errors = False
-    for report_interface in report_interfaces:
-        data = report_interface.get_data()
-        csv_file_name = f"{scheduled_report.pk}_{report_interface.name}--{scheduled_report.title}"
-        _write_csv_file(scheduled_report, csv_file_name, data["results"], data["header"])
-        workbook_sheets.append(
-            _prepare_workbook_sheet(report_interface.name, data["results"], data["header"])
+    """Write a CSV file for each report interface and an xlsx file with a sheet for each of them.
+
+    Rows are streamed from each report interface and written to the CSV file and the xlsx sheet at
+    the same time, any errors are streamed to an errors CSV file and sheet. The files are written
+    to temporary files (the xlsx file in constant memory mode) and uploaded to S3 in parts so memory
+    use doesn't grow with the size of the report.
+    """
+
+    workbook_progress = _start_workbook_progress(scheduled_report, len(report_interfaces))
+    workbook_timer = workbook_progress.timer
+
+    with tempfile.TemporaryFile() as xlsx_file, tempfile.TemporaryFile() as errors_file:
+        error_count = 0
+
+        with _open_workbook(xlsx_file, workbook_timer) as workbook:
+            for index, report_interface in enumerate(report_interfaces):
+                progress = _start_report_progress(scheduled_report, index, report_interface)
+                header = report_interface.get_header()
+                sheet = _get_workbook_sheet_writer(workbook, report_interface.name, header)
+                error_count += _write_report_interface(
+                    scheduled_report,
+                    report_interface,
+                    header,
+                    sheet.write_row,
+                    errors_file,
+                    progress,
+                )
+                progress.finish()
+
+            if error_count:
+                errors_file.seek(0)
+                _write_error_files(scheduled_report, workbook, errors_file, workbook_progress)
+
+        with workbook_timer.time(ReportPhase.UPLOAD):
+            _upload_file(
+                scheduled_report, xlsx_file, _get_xlsx_file_name(scheduled_report), MIMETYPE.XLSX
+            )
+
+    workbook_progress.finish()
+
+    return error_count > 0
+
+
+def write_report_sheet(
+    scheduled_report: ScheduleReport, report_interface: ReportInterface, index: int
+) -> ReportSheet:
+    """Write the CSV file of a report interface and store its rows for merge_report_sheets."""
+
+    progress = _start_report_progress(scheduled_report, index, report_interface)
+    header = report_interface.get_header()
+    path_prefix = _get_report_file_path(scheduled_report, f"sheets/{scheduled_report.pk}_{index}")
+    rows_path = f"{path_prefix}_rows.jsonl"
+    errors_path = None
+
+    with tempfile.TemporaryFile() as rows_file, tempfile.TemporaryFile() as errors_file:
+        error_count = _write_report_interface(
+            scheduled_report,
+            report_interface,
+            header,
+            partial(_write_json_line, rows_file),
+            errors_file,
+            progress,
         )
-        errors.extend(data["errors"])
 
-    file_name_prefixes = [str(scheduled_report.pk), scheduled_report.report.report_type.title()]
-    file_name_suffix = f"--{scheduled_report.title}"
+        with progress.timer.time(ReportPhase.UPLOAD):
+            rows_file.seek(0)
+            upload_file_obj_to_s3_in_parts(rows_file, rows_path)
 
-    if errors:
-        error_file_name = "_".join(file_name_prefixes + ["Errors"]) + file_name_suffix
-        has_errors = True
-        error_header = get_error_serializer_header()
-        workbook_sheets.append(_prepare_workbook_sheet("Errors", errors, error_header))
-        _write_csv_file(
-            scheduled_report,
-            error_file_name,
-            errors,
-            error_header,
-        )
-    xlsx_file_name = "_".join(file_name_prefixes) + file_name_suffix
-    _write_xlsx_file(scheduled_report, xlsx_file_name, workbook_sheets)
-    return has_errors
+            if error_count:
+                errors_path = f"{path_prefix}_errors.jsonl"
+                errors_file.seek(0)
+                upload_file_obj_to_s3_in_parts(errors_file, errors_path)
+
+    # The progress is finished when the sheet has been merged into the xlsx file.
+    progress.save()
+
+    return {
+        "name": report_interface.name,
+        "header": header,
+        "rows_path": rows_path,
+        "errors_path": errors_path,
+    }
+
+
+def merge_report_sheets(scheduled_report: ScheduleReport, sheets: list[ReportSheet]) -> bool:
+    """Merge sheets written by write_report_sheet into the xlsx file (and errors file) of a report.
+
+    The stored rows of each sheet are deleted once they have been merged.
+    """
+
+    errors_paths = [sheet["errors_path"] for sheet in sheets if sheet["errors_path"]]
+    workbook_progress = _start_workbook_progress(scheduled_report, len(sheets))
+    workbook_timer = workbook_progress.timer
+
+    with tempfile.TemporaryFile() as xlsx_file:
+        with _open_workbook(xlsx_file, workbook_timer) as workbook:
+            for index, sheet in enumerate(sheets):
+                progress = ReportProgress.resume(scheduled_report, index, PhaseTimer())
+                sheet_writer = _get_workbook_sheet_writer(workbook, sheet["name"], sheet["header"])
+
+                with progress.timer.time(ReportPhase.XLSX):
+                    sheet_writer.write_rows(
+                        map(loads_typed_json, _iter_s3_file_lines(sheet["rows_path"]))
+                    )
+
+                progress.finish()
+
+            if errors_paths:
+                error_lines = chain.from_iterable(map(_iter_s3_file_lines, errors_paths))
+                _write_error_files(scheduled_report, workbook, error_lines, workbook_progress)
+
+        with workbook_timer.time(ReportPhase.UPLOAD):
+            _upload_file(
+                scheduled_report, xlsx_file, _get_xlsx_file_name(scheduled_report), MIMETYPE.XLSX
+            )
+
+    workbook_progress.finish()
+
+    client = get_s3_client()
+    for path in [sheet["rows_path"] for sheet in sheets] + errors_paths:
+        delete_file_from_s3(path, client)
+
+    return bool(errors_paths)
+
+
+def _write_report_interface(
+    scheduled_report: ScheduleReport,
+    report_interface: ReportInterface,
+    header: list[str],
+    write_row: Callable[[list[Any]], None],
+    errors_file: IO[bytes],
+    progress: ReportProgress,
+) -> int:
+    """Stream the rows of a report interface to its CSV (and parquet) file and to write_row.
+
+    Errors are written to errors_file (as JSON lines) as they occur and the number of errors is
+    returned. The rows written and the time spent writing them are recorded by progress.
+    """
+
+    file_name = f"{scheduled_report.pk}_{report_interface.name}--{scheduled_report.title}"
+    timer = progress.timer
+    error_count = 0
+
+    with tempfile.TemporaryFile() as csv_file, tempfile.TemporaryFile() as parquet_file:
+        writer = CsvWriter(csv_file, header)
+        parquet_writer = None
+
+        if report_interface.PARQUET_OUTPUT:
+            parquet_writer = ReportParquetWriter(
+                parquet_file, report_interface.ReportSerializer, header
+            )
+
+        for row in iter_report_rows(report_interface):
+            values = list(row.values())
+
+            with timer.time(ReportPhase.CSV):
+                writer.write_row(values)
+
+            with timer.time(ReportPhase.XLSX):
+                write_row(values)
+
+            if parquet_writer:
+                with timer.time(ReportPhase.PARQUET):
+                    parquet_writer.write_row(values)
+
+            progress.add_row()
+
+            # Write errors out as they happen rather than letting them build up in memory
+            error_count += _write_errors(report_interface, errors_file)
 
+        error_count += _write_errors(report_interface, errors_file)
 
-def _prepare_workbook_sheet(sheet_name: str, data: list, header: list) -> XlsxSheetConfig:
+        with timer.time(ReportPhase.UPLOAD):
+            _upload_file(scheduled_report, csv_file, f"{file_name}.csv", MIMETYPE.CSV)
+
+        if parquet_writer:
+            with timer.time(ReportPhase.PARQUET):
+                parquet_writer.close()
+
+            with timer.time(ReportPhase.UPLOAD):
+                _upload_file(
+                    scheduled_report, parquet_file, f"{file_name}.parquet", MIMETYPE.PARQUET
+                )
+
+    return error_count
+
+
+def _write_errors(report_interface: ReportInterface, errors_file: IO[bytes]) -> int:
+    errors = report_interface.errors
+
+    for error in errors:
+        _write_json_line(errors_file, list(error.model_dump(by_alias=True).values()))
+
+    error_count = len(errors)
+    errors.clear()
+
+    return error_count
+
+
+def _write_error_files(
+    scheduled_report: ScheduleReport,
+    workbook: xlsxwriter.Workbook,
+    error_lines: Iterable[bytes],
+    progress: ReportProgress,
+) -> None:
+    """Write the errors (JSON lines) to the Errors sheet of the workbook and the errors CSV file."""
+
+    header = get_error_serializer_header()
+    sheet = _get_workbook_sheet_writer(workbook, "Errors", header)
+    file_name = _get_file_name(scheduled_report, "Errors") + ".csv"
+    timer = progress.timer
+
+    with tempfile.TemporaryFile() as csv_file:
+        writer = CsvWriter(csv_file, header)
+
+        for line in error_lines:
+            values = loads_typed_json(line)
+
+            with timer.time(ReportPhase.CSV):
+                writer.write_row(values)
+
+            with timer.time(ReportPhase.XLSX):
+                sheet.write_row(values)
+
+            progress.add_row()
+
+        with timer.time(ReportPhase.UPLOAD):
+            _upload_file(scheduled_report, csv_file, file_name, MIMETYPE.CSV)
+
+
+def _write_json_line(file_obj: IO[bytes], values: list[Any]) -> None:
+    # Values are stored with their types so dates are still dates when the sheets are merged
+    file_obj.write(dumps_typed_json(values) + b"\n")
+
+
+def _iter_s3_file_lines(path: str) -> Iterator[bytes]:
+    body = get_file_stream_from_s3(path)["Body"]
+
+    try:
+        yield from filter(None, body.iter_lines())
+    finally:
+        body.close()
+
+
+def _start_report_progress(
+    scheduled_report: ScheduleReport, index: int, report_interface: ReportInterface
+) -> ReportProgress:
+    return ReportProgress.start(
+        scheduled_report,
+        index,
+        report_interface.name,
+        report_interface.timer,
+        report_interface.get_queryset(),
+    )
+
+
+def _start_workbook_progress(scheduled_report: ScheduleReport, index: int) -> ReportProgress:
+    return ReportProgress.start(scheduled_report, index, WORKBOOK_PROGRESS_NAME, PhaseTimer())
+
+
+@contextmanager
+def _open_workbook(file_obj: IO[bytes], timer: PhaseTimer) -> Iterator[xlsxwriter.Workbook]:
+    """Open a constant memory workbook, closing it (writing the xlsx file) when the block exits."""
+
+    workbook = xlsxwriter.Workbook(file_obj, XLSX_WORKBOOK_OPTIONS)
+
+    try:
+        yield workbook
+    finally:
+        with timer.time(ReportPhase.XLSX):
+            workbook.close()
+
+
+def _get_workbook_sheet_writer(
+    workbook: xlsxwriter.Workbook, sheet_name: str, header: list[str]
+) -> XlsxSheetWriter:
     config = XlsxSheetConfig()
     config.header.data = header
     config.header.styles = {"bold": True}
-    config.rows = [d.values() for d in data]
     config.column_width = 25
     config.sheet_name = sheet_name
-    return config
 
+    return XlsxSheetWriter(workbook, config)
 
-def _write_xlsx_file(
-    scheduled_report: ScheduleReport, file_name: str, sheets: list[XlsxSheetConfig]
-) -> None:
-    file_name = f"{file_name}.xlsx"
-    file_data = generate_xlsx_file(sheets, {"remove_timezone": True})
-    write_file_data(scheduled_report, file_data, file_name, MIMETYPE.XLSX)
 
+def _get_file_name(scheduled_report: ScheduleReport, *parts: str) -> str:
+    file_name_prefixes = [str(scheduled_report.pk), scheduled_report.report.report_type.title()]
+    file_name_suffix = f"--{scheduled_report.title}"
 
-def _write_csv_file(
-    scheduled_report: ScheduleReport, file_name: str, data: list, header: list
+    return "_".join(file_name_prefixes + list(parts)) + file_name_suffix
+
+
+def _get_xlsx_file_name(scheduled_report: ScheduleReport) -> str:
+    return _get_file_name(scheduled_report) + ".xlsx"
+
+
+def _upload_file(
+    scheduled_report: ScheduleReport, file_obj: IO[bytes], file_name: str, content_type: MIMETYPE
 ) -> None:
-    file_name = f"{file_name}.csv"
-    dest = StringIO()
-    writer = csv.DictWriter(dest, header)
-    writer.writeheader()
-    writer.writerows(data)
-    write_file_data(scheduled_report, dest.getvalue(), file_name, MIMETYPE.CSV)
-    dest.close()
+    """Upload a file written by the report to S3 in parts."""
+
+    path = _get_report_file_path(scheduled_report, file_name)
+    file_obj.seek(0)
+    file_size = upload_file_obj_to_s3_in_parts(file_obj, path)
+
+    _create_generated_report(scheduled_report, path, file_name, content_type, file_size)
 
 
 def write_file_data(
     scheduled_report: ScheduleReport, data: str | bytes, file_name: str, content_type: MIMETYPE
 ) -> GeneratedReport:
-    path = f"REPORTS/{scheduled_report.report.pk}/{file_name}"
+    path = _get_report_file_path(scheduled_report, file_name)
     file_size = put_object_in_s3(data, path)
+
+    return _create_generated_report(scheduled_report, path, file_name, content_type, file_size)
+
+
+def _get_report_file_path(scheduled_report: ScheduleReport, file_name: str) -> str:
+    return f"REPORTS/{scheduled_report.report.pk}/{file_name}"
+
+
+def _create_generated_report(
+    scheduled_report: ScheduleReport,
+    path: str,
+    file_name: str,
+    content_type: MIMETYPE,
+    file_size: int,
+) -> GeneratedReport:
     document = File.objects.create(
         is_active=True,
         filename=file_name,
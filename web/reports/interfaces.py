@@ -1,9 +1,10 @@
+import copy
 import datetime as dt
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from functools import wraps
-from itertools import chain
-from typing import Any, ClassVar, final
+from itertools import chain, islice
+from typing import Any, ClassVar, Self, final
 
 from django.contrib.postgres.aggregates import ArrayAgg
 from django.contrib.postgres.expressions import ArraySubquery
@@ -69,11 +70,14 @@ from web.models import (
 )
 from web.permissions import Perms, StaffUserGroups
 from web.utils.pdf.utils import get_fa_sil_goods_item
+from web.utils.replica import get_replica_db_alias
 from web.utils.search.app_data import _add_import_licence_data
 from web.utils.sentry import capture_exception
 
 from . import utils
-from .constants import NO, YES, DateFilterType, UserDateFilterType
+from .constants import NO, YES, DateFilterType, ReportPhase, UserDateFilterType
+from .progress import PhaseTimer
+from .rollups import get_access_request_totals
 from .serializers import (
     AccessRequestTotalsReportSerializer,
     DFLFirearmsLicenceSerializer,
@@ -97,17 +101,10 @@ def handle_error(f: Callable) -> Callable:
         try:
             return f(self, *args, **kwargs)
         except ValidationError as e:
+            identifier = self.get_row_identifier(*args, **kwargs)
+
             for error_dict in json.loads(e.json()):
-                self.errors.append(
-                    ErrorSerializer(
-                        report_name=self.name,
-                        identifier=self.get_row_identifier(*args, **kwargs),
-                        error_type="Validation Error",
-                        error_message=error_dict["msg"],
-                        column=", ".join(error_dict["loc"]),
-                        value=error_dict["input"],
-                    )
-                )
+                self.errors.append(_get_validation_error(self.name, identifier, error_dict))
         except Exception as e:
             capture_exception()
             self.errors.append(
@@ -125,6 +122,19 @@ def handle_error(f: Callable) -> Callable:
     return wrapper
 
 
+def _get_validation_error(
+    report_name: str, identifier: str, error_dict: dict[str, Any]
+) -> ErrorSerializer:
+    return ErrorSerializer(
+        report_name=report_name,
+        identifier=identifier,
+        error_type="Validation Error",
+        error_message=error_dict["msg"],
+        column=", ".join(map(str, error_dict["loc"])),
+        value=error_dict["input"],
+    )
+
+
 class IssuedCertificateReportFilter(BaseModel):
     model_config = ConfigDict(extra="ignore")
     application_type: str
@@ -167,10 +177,17 @@ class ReportInterface:
     ReportSerializer: ClassVar[type[BaseModel]]
     name: ClassVar[str]
 
+    # Number of rows read from the queryset and serialized together.
+    BATCH_SIZE: ClassVar[int] = 500
+
+    # Also write the rows to a parquet file, with column types from the ReportSerializer.
+    PARQUET_OUTPUT: ClassVar[bool] = False
+
     def __init__(self, scheduled_report: ScheduleReport) -> None:
         self.scheduled_report = scheduled_report
         self.filters = self.ReportFilter(**self.scheduled_report.parameters)
         self.errors: list[ErrorSerializer] = []
+        self.timer = PhaseTimer()
 
     def get_data(self) -> dict[str, Any]:
         return ReportResults(
@@ -179,27 +196,142 @@ class ReportInterface:
             errors=self.errors,
         ).model_dump(by_alias=True)
 
+    def iter_rows(self) -> Iterator[dict[str, Any]]:
+        """Yield each row of the report as a dict in turn.
+
+        Rows are serialized in batches as they are read from the queryset so the results are never
+        all held in memory, any errors are appended to self.errors as the rows are serialized.
+        The time spent reading and serializing the rows is recorded by self.timer.
+        """
+
+        batches = self.iter_batches()
+
+        while True:
+            with self.timer.time(ReportPhase.SERIALISE):
+                if (batch := next(batches, None)) is None:
+                    return
+
+                rows = self.dump_results(batch)
+
+            yield from rows
+
+    def iter_batches(self) -> Iterator[list[BaseModel]]:
+        """Yield the results of the report in batches of up to BATCH_SIZE results.
+
+        The values of each row are returned by serialize_rows and each batch is validated by a
+        single call to the ReportSerializer's compiled TypeAdapter rather than creating a model for
+        each row.
+        """
+
+        # The report query is read from the replica (if there is one) to keep it off the primary
+        queryset = self.get_queryset().using(get_replica_db_alias()).iterator(self.BATCH_SIZE)
+        row_values = (
+            (r, values)
+            for r in self.timer.iter(ReportPhase.QUERY, queryset)
+            for values in self.serialize_rows(r)
+            if values
+        )
+
+        while batch := list(islice(row_values, self.BATCH_SIZE)):
+            yield self.validate_rows(batch)
+
+    def validate_rows(self, batch: list[tuple[Model | dict, dict[str, Any]]]) -> list[BaseModel]:
+        """Validate a batch of (queryset record, row values) pairs with the ReportSerializer.
+
+        Rows that fail validation are left out and their errors appended to self.errors.
+        """
+
+        adapter = utils.get_rows_adapter(self.ReportSerializer)
+
+        try:
+            return adapter.validate_python([values for _, values in batch])
+        except ValidationError as e:
+            invalid_rows = set()
+
+            for error_dict in json.loads(e.json()):
+                index, *loc = error_dict["loc"]
+                invalid_rows.add(index)
+                identifier = self.get_row_identifier(batch[index][0])
+                self.errors.append(
+                    _get_validation_error(self.name, identifier, error_dict | {"loc": loc})
+                )
+
+            return adapter.validate_python(
+                [values for i, (_, values) in enumerate(batch) if i not in invalid_rows]
+            )
+
+    def dump_results(self, results: list[BaseModel]) -> list[dict[str, Any]]:
+        """Dump a batch of results to dicts keyed by column name.
+
+        Results of the report serializer are dumped by a single call to its compiled TypeAdapter
+        rather than calling model_dump on each result.
+        """
+
+        serializer = self.ReportSerializer
+
+        if all(type(result) is serializer for result in results):
+            return utils.get_rows_adapter(serializer).dump_python(results, by_alias=True)
+
+        return [result.model_dump(by_alias=True) for result in results]
+
+    def iter_results(self) -> Iterator[BaseModel]:
+        for batch in self.iter_batches():
+            yield from batch
+
     def process_results(self) -> list[BaseModel]:
-        results = []
-        for r in self.get_queryset().iterator(500):
-            results += self.serialize_rows(r)
-        return list(filter(None, results))
+        return list(self.iter_results())
 
     def get_header(self) -> list[str]:
-        schema = self.ReportSerializer.model_json_schema(by_alias=True, mode="serialization")
-        return schema["required"]
+        return utils.get_serializer_header(self.ReportSerializer)
+
+    def is_partitioned(self) -> bool:
+        """Return True if the report can be run for each month of its date range separately.
+
+        Each row must be in a single month, so the date filter must be on a single date of each row.
+        """
+
+        return False
+
+    def get_last_updated(self) -> dt.datetime | None:
+        """Return when the data of the rows in the report's date range last changed.
+
+        Used to find cached partitions that are out of date, None if it isn't known.
+        """
+
+        return None
+
+    def get_date_range(self) -> tuple[dt.date, dt.date]:
+        filters = self.filters.model_dump(include={"date_from", "date_to"})
+
+        return dt.date.fromisoformat(filters["date_from"]), dt.date.fromisoformat(
+            filters["date_to"]
+        )
+
+    def for_date_range(self, date_from: dt.date, date_to: dt.date) -> Self:
+        """Return a copy of the report interface for part of the report's date range.
+
+        The copy shares the errors and timer of the report interface.
+        """
+
+        interface = copy.copy(self)
+        interface.filters = self.filters.model_copy(
+            update={"date_from": date_from.isoformat(), "date_to": date_to.isoformat()}
+        )
+
+        return interface
 
     @handle_error
     def serialize_rows(self, r: Model | dict) -> list:
-        """r can either be a model or a dict.
+        """Return the values of each ReportSerializer row for r.
 
+        r can either be a model or a dict.
         When get_queryset returned a queryset r is a Model instance.
         When get_queryset returns queryset.values() r is a dict.
         """
 
         return [self.serialize_row(r)]
 
-    def serialize_row(self, *args: Any, **kwargs: Any) -> BaseModel:
+    def serialize_row(self, *args: Any, **kwargs: Any) -> dict[str, Any]:
         raise NotImplementedError
 
     def get_queryset(self) -> QuerySet:
@@ -286,6 +418,7 @@ class ReportInterface:
 class BaseFirearmsLicenceInterface(ReportInterface):
     ReportFilter = BasicReportFilter
     filters: BasicReportFilter
+    PARQUET_OUTPUT = True
 
     def get_application_filter(self) -> Q:
         raise NotImplementedError
@@ -422,13 +555,13 @@ class BaseFirearmsLicenceInterface(ReportInterface):
             "section_obsolete",
         )
 
-    def serialize_row(self, ia: dict) -> BaseModel:
+    def serialize_row(self, ia: dict) -> dict[str, Any]:
         licence = utils.get_licence_details(ia)
         import_user_name = utils.format_contact_name(
             ia["importer_title"], ia["importer_first_name"], ia["importer_last_name"]
         )
 
-        return self.ReportSerializer(
+        return dict(
             licence_reference=licence.reference,
             variation_number=utils.get_variation_number(ia["reference"]),
             case_reference=ia["reference"],
@@ -457,6 +590,7 @@ class IssuedCertificateReportInterface(ReportInterface):
     ReportSerializer = IssuedCertificateReportSerializer
     ReportFilter = IssuedCertificateReportFilter
     name = "Issued Certificates"
+    PARQUET_OUTPUT = True
 
     # Added to fix typing
     filters: IssuedCertificateReportFilter
@@ -465,6 +599,22 @@ class IssuedCertificateReportInterface(ReportInterface):
         super().__init__(*args, **kwargs)
         self.legislations = dict(ProductLegislation.objects.values_list("pk", "name"))
 
+    def is_partitioned(self) -> bool:
+        return True
+
+    def get_last_updated(self) -> dt.datetime | None:
+        # Revoking a certificate updates the status of its application
+        return (
+            ExportApplication.objects.using(get_replica_db_alias())
+            .filter(
+                certificates__case_completion_datetime__date__range=(
+                    self.filters.date_from,
+                    self.filters.date_to,
+                )
+            )
+            .aggregate(last_updated=Max("last_update_datetime"))["last_updated"]
+        )
+
     def get_export_application_query(self) -> QuerySet:
         return (
             ExportApplication.objects.filter(
@@ -590,7 +740,7 @@ class IssuedCertificateReportInterface(ReportInterface):
             queryset = queryset.filter(legislations__contains=self.filters.legislation)
         return queryset.order_by("-reference")
 
-    def serialize_row(self, cdr: dict) -> IssuedCertificateReportSerializer:
+    def serialize_row(self, cdr: dict) -> dict[str, Any]:
         export_application: dict = cdr["export_application"][0]
         export_application["countries_of_manufacture"] = ", ".join(
             filter(None, export_application["countries_of_manufacture"])
@@ -608,7 +758,7 @@ class IssuedCertificateReportInterface(ReportInterface):
         processing_time = self.get_total_processing_time(
             cdr["issue_datetime"], export_application["submitted_datetime"]
         )
-        return IssuedCertificateReportSerializer(
+        return dict(
             is_manufacturer=(
                 "" if not is_cfs else YES if export_application["is_manufacturer_count"] > 0 else NO
             ),
@@ -661,10 +811,10 @@ class ImporterAccessRequestInterface(ReportInterface):
             submit_datetime__date__range=(self.filters.date_from, self.filters.date_to),
         ).order_by("-submit_datetime")
 
-    def serialize_row(self, ar: ImpAccessOrExpAccess) -> ImporterAccessRequestReportSerializer:
+    def serialize_row(self, ar: ImpAccessOrExpAccess) -> dict[str, Any]:
         is_agent = ar.is_agent_request
         request_type = f"{ar.REQUEST_TYPE.title()} Access Request"
-        return self.ReportSerializer(
+        return dict(
             request_date=ar.submit_datetime.date(),
             request_type=f"Agent {request_type}" if is_agent else request_type,
             name=ar.organisation_name,
@@ -706,9 +856,8 @@ class AccessRequestTotalsInterface(ReportInterface):
 
     @handle_error
     def process_results(self) -> list[BaseModel]:
-        data = {}
-        for r in self.get_queryset():
-            data[r["response"]] = r["total"]
+        # Read from the daily totals rather than counting every access request in get_queryset
+        data = get_access_request_totals(*self.get_date_range())
         approved = data.get("APPROVED", 0)
         refused = data.get("REFUSED", 0)
         return [
@@ -719,6 +868,9 @@ class AccessRequestTotalsInterface(ReportInterface):
             )
         ]
 
+    def iter_batches(self) -> Iterator[list[BaseModel]]:
+        yield self.process_results()
+
     def get_row_identifier(self, **kwargs: Any) -> str:
         return "Totals"
 
@@ -729,6 +881,18 @@ class ImportLicenceInterface(ReportInterface):
     ReportSerializer = ImportLicenceSerializer
     ReportFilter = ImportLicenceFilter
     filters: ImportLicenceFilter
+    PARQUET_OUTPUT = True
+
+    def is_partitioned(self) -> bool:
+        # An application can have licences completed in different months
+        return self.filters.date_filter_type == DateFilterType.SUBMITTED
+
+    def get_last_updated(self) -> dt.datetime | None:
+        return (
+            ImportApplication.objects.using(get_replica_db_alias())
+            .filter(submit_datetime__date__range=(self.filters.date_from, self.filters.date_to))
+            .aggregate(last_updated=Max("last_update_datetime"))["last_updated"]
+        )
 
     def get_sanctions_goods_query(self) -> QuerySet:
         return (
@@ -819,7 +983,7 @@ class ImportLicenceInterface(ReportInterface):
     def get_row_identifier(self, ia: ImportApplication) -> str:
         return ia["reference"]
 
-    def serialize_row(self, ia: dict) -> ImportLicenceSerializer:
+    def serialize_row(self, ia: dict) -> dict[str, Any]:
         licence = utils.get_licence_details(ia)
         import_user_name = utils.format_contact_name(
             ia["importer_title"], ia["importer_first_name"], ia["importer_last_name"]
@@ -828,7 +992,7 @@ class ImportLicenceInterface(ReportInterface):
         contact_full_name = utils.format_contact_name(
             ia["contact_title"], ia["contact_first_name"], ia["contact_last_name"]
         )
-        return self.ReportSerializer(
+        return dict(
             case_reference=ia["reference"],
             licence_reference=licence.reference,
             licence_type=licence.licence_type,
@@ -886,6 +1050,7 @@ class SupplementaryFirearmsInterface(ReportInterface):
     ReportSerializer = SupplementaryFirearmsSerializer
     ReportFilter = BasicReportFilter
     filters: BasicReportFilter
+    PARQUET_OUTPUT = True
 
     def get_endorsements_query(self) -> QuerySet:
         return (
@@ -1032,14 +1197,14 @@ class SupplementaryFirearmsInterface(ReportInterface):
             ia["oil_reports"],
             ia["dfl_reports"],
         ):
-            results.append(self.serialize_row(report_firearms, ia))
+            results.append(self.serialize_row(ia, report_firearms))
         return results
 
-    def get_row_identifier(self, s: ReportFirearms, ia: FaImportApplication) -> str:
+    def get_row_identifier(self, ia: FaImportApplication, s: ReportFirearms | None = None) -> str:
         return ia["reference"]
 
     @handle_error
-    def serialize_row(self, s: ReportFirearms, ia: dict) -> SupplementaryFirearmsSerializer:
+    def serialize_row(self, ia: dict, s: ReportFirearms) -> dict[str, Any]:
         is_dfl = ia["process_type"] == ProcessTypes.FA_DFL
         is_sil = ia["process_type"] == ProcessTypes.FA_SIL
         is_oil = ia["process_type"] == ProcessTypes.FA_OIL
@@ -1080,7 +1245,7 @@ class SupplementaryFirearmsInterface(ReportInterface):
         )
         constabularies = ia["dfl_constabulary"] if is_dfl else ", ".join(ia["constabularies_list"])
 
-        return self.ReportSerializer(
+        return dict(
             licence_reference=licence.reference,
             case_reference=ia["reference"],
             case_type=ia["application_sub_type"],
@@ -1241,8 +1406,8 @@ class ActiveUserInterface(ReportInterface):
             .order_by("pk")
         )
 
-    def serialize_row(self, user: dict) -> UserSerializer:
-        return self.ReportSerializer(
+    def serialize_row(self, user: dict) -> dict[str, Any]:
+        return dict(
             first_name=user["first_name"],
             last_name=user["last_name"],
             email_address=user["email"],
@@ -1303,8 +1468,8 @@ class ActiveStaffUserInterface(ReportInterface):
             .order_by("pk")
         )
 
-    def serialize_row(self, user: dict) -> StaffUserSerializer:
-        return self.ReportSerializer(
+    def serialize_row(self, user: dict) -> dict[str, Any]:
+        return dict(
             first_name=user["first_name"],
             last_name=user["last_name"],
             email_address=user["email"],
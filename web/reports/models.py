@@ -4,7 +4,7 @@ from django.conf import settings
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
-from .constants import ReportStatus, ReportType
+from .constants import ReportPhase, ReportStatus, ReportType
 
 
 class Report(models.Model):
@@ -67,3 +67,42 @@ class GeneratedReport(models.Model):
         choices=ReportStatus.choices,
         default=ReportStatus.SUBMITTED,
     )
+
+
+class ScheduleReportProgress(models.Model):
+    """The progress and timings of a report interface (a sheet of the report) as it is generated."""
+
+    schedule = models.ForeignKey(ScheduleReport, on_delete=models.CASCADE, related_name="progress")
+    index = models.PositiveSmallIntegerField()
+    name = models.CharField(max_length=255)
+    rows_processed = models.PositiveIntegerField(default=0)
+    total_rows_estimate = models.PositiveIntegerField(null=True)
+
+    # Seconds spent in each ReportPhase
+    timings = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def get_timings_display(self) -> list[tuple[str, float]]:
+        return [
+            (phase.label, self.timings[phase]) for phase in ReportPhase if phase in self.timings
+        ]
+
+
+class AccessRequestDailyTotal(models.Model):
+    """The number of access requests submitted each day, by request type and response.
+
+    Refreshed by the refresh_report_rollups task so access request totals don't need to count the
+    whole access request table.
+    """
+
+    day = models.DateField()
+    process_type = models.CharField(max_length=50)
+    response = models.CharField(max_length=20)
+    total = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "process_type", "response"], name="unique_access_request_day_total"
+            )
+        ]
@@ -0,0 +1,116 @@
+from collections.abc import Iterable
+from typing import IO, Any, get_args
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from pydantic import BaseModel
+from pydantic.fields import FieldInfo
+
+from .serializers import date_or_empty, datetime_or_empty
+
+# Number of rows buffered before they are written to the parquet file as a row group.
+ROW_GROUP_SIZE = 10_000
+
+# Parquet column types of the JSON schema types of serialized report fields.
+JSON_SCHEMA_TYPES = {
+    "integer": pa.int64(),
+    "number": pa.float64(),
+    "boolean": pa.bool_(),
+    "string": pa.string(),
+}
+
+# Report dates are serialized as formatted strings, they are parsed back to typed parquet columns.
+DATETIME_FORMAT = "%d/%m/%Y %H:%M:%S"
+DATE_FORMAT = "%d/%m/%Y"
+DATETIME_METADATA = list(get_args(datetime_or_empty)[1:])
+DATE_METADATA = list(get_args(date_or_empty)[1:])
+
+
+def get_parquet_schema(serializer: type[BaseModel], header: list[str]) -> pa.Schema:
+    """Return the parquet schema of the header columns, typed from the report serializer fields."""
+
+    json_schema = serializer.model_json_schema(by_alias=True, mode="serialization")
+    fields = {
+        field.serialization_alias or name: field for name, field in serializer.model_fields.items()
+    }
+
+    return pa.schema(
+        [
+            (column, _get_column_type(fields[column], json_schema["properties"][column]))
+            for column in header
+        ]
+    )
+
+
+def _get_column_type(field: FieldInfo, field_schema: dict[str, Any]) -> pa.DataType:
+    if field.metadata == DATETIME_METADATA:
+        return pa.timestamp("s")
+
+    if field.metadata == DATE_METADATA:
+        return pa.date32()
+
+    # Fields with more than one type (no "type" in the schema) are written as strings
+    return JSON_SCHEMA_TYPES.get(field_schema.get("type", "string"), pa.string())
+
+
+class ReportParquetWriter:
+    """Writes the rows of a report to a parquet file, a row group at a time.
+
+    Only ROW_GROUP_SIZE rows are held in memory, so a report with any number of rows can be
+    written as its rows are produced.
+    """
+
+    def __init__(self, file_obj: IO[bytes], serializer: type[BaseModel], header: list[str]) -> None:
+        self.schema = get_parquet_schema(serializer, header)
+        self.writer = pq.ParquetWriter(file_obj, self.schema)
+        self.columns: list[list[Any]] = [[] for _ in header]
+        self.row_count = 0
+
+    def write_row(self, row_data: Iterable[Any]) -> None:
+        for column, data in zip(self.columns, row_data):
+            column.append(data)
+
+        self.row_count += 1
+
+        if len(self.columns[0]) >= ROW_GROUP_SIZE:
+            self._write_row_group()
+
+    def close(self) -> None:
+        """Write the remaining rows and the footer of the parquet file."""
+
+        if self.columns[0] or not self.row_count:
+            self._write_row_group()
+
+        self.writer.close()
+
+    def _write_row_group(self) -> None:
+        arrays = [
+            _get_column_array(column, field.type)
+            for column, field in zip(self.columns, self.schema)
+        ]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+        for column in self.columns:
+            column.clear()
+
+
+def _get_column_array(values: list[Any], column_type: pa.DataType) -> pa.Array:
+    if column_type == pa.timestamp("s"):
+        return _parse_dates(values, DATETIME_FORMAT)
+
+    if column_type == pa.date32():
+        return _parse_dates(values, DATE_FORMAT).cast(pa.date32())
+
+    try:
+        return pa.array(values, type=column_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # A string column of a field with more than one type (e.g. str | int)
+        return pa.array([v if v is None else str(v) for v in values], type=column_type)
+
+
+def _parse_dates(values: list[Any], date_format: str) -> pa.Array:
+    # Empty strings (no date) become nulls
+    return pc.strptime(
+        pa.array(values, type=pa.string()), format=date_format, unit="s", error_is_null=True
+    )
@@ -0,0 +1,181 @@
+import calendar
+import datetime as dt
+import hashlib
+import json
+import tempfile
+from collections.abc import Iterator
+from typing import IO, Any, NamedTuple
+
+from botocore.exceptions import ClientError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from web.utils.s3 import get_file_stream_from_s3, upload_file_obj_to_s3_in_parts
+
+from .constants import ReportPhase
+from .interfaces import ReportInterface
+from .serializers import ErrorSerializer
+from .utils import dumps_typed_json, loads_typed_json
+
+# Partitions are cached once they ended this long ago, by then the data in them rarely changes.
+CLOSED_PARTITION_AGE = dt.timedelta(days=60)
+
+# Cached partitions are rebuilt once they are this old. Changes to data outside the report's
+# records (e.g. the name of an importer) aren't found by ReportInterface.get_last_updated.
+PARTITION_CACHE_TTL = dt.timedelta(days=7)
+
+# Increment to stop using partitions cached before a change to the rows of a report.
+PARTITION_CACHE_VERSION = 2
+
+
+class DatePartition(NamedTuple):
+    date_from: dt.date
+    date_to: dt.date
+
+    def is_closed(self, today: dt.date) -> bool:
+        return self.date_to <= today - CLOSED_PARTITION_AGE
+
+
+def get_month_partitions(date_from: dt.date, date_to: dt.date) -> list[DatePartition]:
+    """Split a date range into a partition for each (part of a) month, newest first."""
+
+    partitions = []
+    start = date_from
+
+    while start <= date_to:
+        month_end = start.replace(day=calendar.monthrange(start.year, start.month)[1])
+        end = min(month_end, date_to)
+        partitions.append(DatePartition(start, end))
+        start = end + dt.timedelta(days=1)
+
+    return partitions[::-1]
+
+
+def iter_report_rows(report_interface: ReportInterface) -> Iterator[dict[str, Any]]:
+    """Yield each row of a report interface in turn.
+
+    Reports that can be partitioned are run a month at a time. The rows (and errors) of closed
+    months are cached in S3, so re-running a report only runs the query for the recent months.
+    A cached month is rebuilt when its data has changed since it was cached or the cache has
+    expired.
+    """
+
+    if not report_interface.is_partitioned():
+        yield from report_interface.iter_rows()
+        return
+
+    today = timezone.localdate()
+
+    for partition in get_month_partitions(*report_interface.get_date_range()):
+        partition_interface = report_interface.for_date_range(*partition)
+
+        if partition.is_closed(today):
+            yield from _iter_cached_partition_rows(partition_interface, partition)
+        else:
+            yield from partition_interface.iter_rows()
+
+
+def get_partition_cache_path(report_interface: ReportInterface, partition: DatePartition) -> str:
+    """Return the S3 key of the cached rows of a partition of a report interface.
+
+    The key contains a hash of the report's other filters and columns, so a partition is only
+    reused by reports with the same filters and columns.
+    """
+
+    report_type = report_interface.scheduled_report.report.report_type
+    key_data = {
+        "version": PARTITION_CACHE_VERSION,
+        "interface": report_interface.name,
+        "header": report_interface.get_header(),
+        "filters": report_interface.filters.model_dump(exclude={"date_from", "date_to"}),
+    }
+    key_hash = hashlib.sha256(
+        json.dumps(key_data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    ).hexdigest()
+
+    return (
+        f"REPORTS/partitions/{report_type}/{key_hash}/"
+        f"{partition.date_from.isoformat()}_{partition.date_to.isoformat()}.jsonl"
+    )
+
+
+def _iter_cached_partition_rows(
+    partition_interface: ReportInterface, partition: DatePartition
+) -> Iterator[dict[str, Any]]:
+    path = get_partition_cache_path(partition_interface, partition)
+    timer = partition_interface.timer
+
+    try:
+        with timer.time(ReportPhase.CACHE):
+            response = get_file_stream_from_s3(path)
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "NoSuchKey":
+            raise
+
+        yield from _iter_and_cache_partition_rows(partition_interface, path)
+        return
+
+    body = response["Body"]
+
+    with timer.time(ReportPhase.CACHE):
+        is_stale = _is_cache_stale(partition_interface, response["LastModified"])
+
+    if is_stale:
+        body.close()
+        yield from _iter_and_cache_partition_rows(partition_interface, path)
+        return
+
+    try:
+        for line in timer.iter(ReportPhase.CACHE, filter(None, body.iter_lines())):
+            cached = loads_typed_json(line)
+
+            if "error" in cached:
+                partition_interface.errors.append(ErrorSerializer(**cached["error"]))
+            else:
+                yield cached["row"]
+    finally:
+        body.close()
+
+
+def _is_cache_stale(partition_interface: ReportInterface, cached_datetime: dt.datetime) -> bool:
+    if cached_datetime <= timezone.now() - PARTITION_CACHE_TTL:
+        return True
+
+    last_updated = partition_interface.get_last_updated()
+
+    return last_updated is not None and last_updated >= cached_datetime
+
+
+def _iter_and_cache_partition_rows(
+    partition_interface: ReportInterface, path: str
+) -> Iterator[dict[str, Any]]:
+    """Yield the rows of a partition, caching the rows and errors once all rows have been read."""
+
+    errors = partition_interface.errors
+    timer = partition_interface.timer
+    error_count = len(errors)
+
+    with tempfile.TemporaryFile() as cache_file:
+        for row in partition_interface.iter_rows():
+            with timer.time(ReportPhase.CACHE):
+                _write_cached_errors(cache_file, errors[error_count:])
+                _write_cached_line(cache_file, {"row": row})
+
+            yield row
+
+            # The errors may have been written (and cleared) while the row was being written
+            error_count = len(errors)
+
+        with timer.time(ReportPhase.CACHE):
+            _write_cached_errors(cache_file, errors[error_count:])
+            cache_file.seek(0)
+            upload_file_obj_to_s3_in_parts(cache_file, path)
+
+
+def _write_cached_errors(cache_file: IO[bytes], errors: list[ErrorSerializer]) -> None:
+    for error in errors:
+        _write_cached_line(cache_file, {"error": error.model_dump()})
+
+
+def _write_cached_line(cache_file: IO[bytes], data: dict[str, Any]) -> None:
+    cache_file.write(dumps_typed_json(data) + b"\n")
@@ -0,0 +1,159 @@
+import json
+import logging
+import time
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import TypeVar
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from web.models import ScheduleReport, ScheduleReportProgress
+
+from .constants import ReportPhase
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Minimum number of seconds between saving the progress of a report interface.
+PROGRESS_SAVE_INTERVAL = 10
+
+
+class PhaseTimer:
+    """Record the time spent in each phase of generating a report.
+
+    Phases can be nested, time spent in an inner phase isn't counted towards the outer phase.
+    """
+
+    def __init__(self) -> None:
+        self.timings: defaultdict[ReportPhase, float] = defaultdict(float)
+        self._inner_elapsed: list[float] = []
+
+    @contextmanager
+    def time(self, phase: ReportPhase) -> Iterator[None]:
+        start = time.perf_counter()
+        self._inner_elapsed.append(0.0)
+
+        try:
+            yield
+        finally:
+            self._add(phase, time.perf_counter() - start, self._inner_elapsed.pop())
+
+    def iter(self, phase: ReportPhase, iterable: Iterable[T]) -> Iterator[T]:
+        """Yield the items of iterable, timing each item being fetched as phase."""
+
+        iterator = iter(iterable)
+        perf_counter = time.perf_counter
+
+        # Items are timed without self.time as this is called for every row of the report.
+        while True:
+            start = perf_counter()
+
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._add(phase, perf_counter() - start)
+
+            yield item
+
+    def _add(self, phase: ReportPhase, elapsed: float, inner_elapsed: float = 0.0) -> None:
+        self.timings[phase] += elapsed - inner_elapsed
+
+        if self._inner_elapsed:
+            self._inner_elapsed[-1] += elapsed
+
+
+class ReportProgress:
+    """Record the progress of a report interface (a sheet of the report) as it is generated.
+
+    The rows processed and the time spent in each phase are saved at most every
+    PROGRESS_SAVE_INTERVAL seconds and logged when the report interface is finished.
+    """
+
+    def __init__(self, progress: ScheduleReportProgress, timer: PhaseTimer) -> None:
+        self.progress = progress
+        self.timer = timer
+        self._last_saved = time.monotonic()
+
+    @classmethod
+    def start(
+        cls,
+        scheduled_report: ScheduleReport,
+        index: int,
+        name: str,
+        timer: PhaseTimer,
+        queryset: QuerySet | None = None,
+    ) -> "ReportProgress":
+        progress = ScheduleReportProgress.objects.create(
+            schedule=scheduled_report,
+            index=index,
+            name=name,
+            total_rows_estimate=get_row_estimate(queryset) if queryset is not None else None,
+        )
+
+        return cls(progress, timer)
+
+    @classmethod
+    def resume(
+        cls, scheduled_report: ScheduleReport, index: int, timer: PhaseTimer
+    ) -> "ReportProgress":
+        """Continue recording the progress of a report interface started in another process."""
+
+        progress = ScheduleReportProgress.objects.get(schedule=scheduled_report, index=index)
+        timer.timings.update(progress.timings)
+
+        return cls(progress, timer)
+
+    def add_row(self) -> None:
+        self.progress.rows_processed += 1
+
+        if time.monotonic() - self._last_saved >= PROGRESS_SAVE_INTERVAL:
+            self.save()
+
+    def save(self) -> None:
+        self.progress.timings = {phase: round(t, 3) for phase, t in self.timer.timings.items()}
+        self.progress.save(update_fields=["rows_processed", "timings", "updated_at"])
+        self._last_saved = time.monotonic()
+
+    def finish(self) -> None:
+        self.save()
+
+        progress = self.progress
+        timings = " ".join(f"{phase.lower()}={t}s" for phase, t in progress.timings.items())
+        logger.info(
+            "Report progress: schedule_report=%s interface=%r rows=%s total_rows_estimate=%s %s",
+            progress.schedule_id,
+            progress.name,
+            progress.rows_processed,
+            progress.total_rows_estimate,
+            timings,
+            extra={
+                "report_progress": {
+                    "schedule_report_id": progress.schedule_id,
+                    "interface": progress.name,
+                    "rows_processed": progress.rows_processed,
+                    "total_rows_estimate": progress.total_rows_estimate,
+                    "timings": progress.timings,
+                }
+            },
+        )
+
+
+def get_row_estimate(queryset: QuerySet) -> int | None:
+    """Return the planner's estimate of the number of rows the queryset returns.
+
+    Unlike queryset.count() the query isn't run, so the estimate is cheap to get for large reports.
+    """
+
+    try:
+        with transaction.atomic():
+            plan = json.loads(queryset.explain(format="json"))
+    except Exception:
+        logger.warning("Unable to estimate the rows of the report queryset.", exc_info=True)
+        return None
+
+    return plan[0]["Plan"]["Plan Rows"]
@@ -0,0 +1,80 @@
+import datetime as dt
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from web.models import AccessRequest, AccessRequestDailyTotal
+
+# Days refreshed by the hourly refresh, older days are only refreshed by the nightly full refresh.
+# Saving an access request updates its submit_datetime, so a request can move out of an old day.
+RECENT_ROLLUP_DAYS = 7
+
+
+def refresh_access_request_totals(date_from: dt.date | None = None) -> None:
+    """Recalculate the daily access request totals from date_from (or every day) to today."""
+
+    access_requests = AccessRequest.objects.filter(response__isnull=False)
+    daily_totals = AccessRequestDailyTotal.objects.all()
+
+    if date_from:
+        access_requests = access_requests.filter(submit_datetime__gte=_start_of_day(date_from))
+        daily_totals = daily_totals.filter(day__gte=date_from)
+
+    totals = (
+        access_requests.annotate(day=TruncDate("submit_datetime"))
+        .values("day", "process_type", "response")
+        .annotate(total=Count("pk"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        daily_totals.delete()
+        AccessRequestDailyTotal.objects.bulk_create(
+            [AccessRequestDailyTotal(**total) for total in totals]
+        )
+
+
+def refresh_recent_access_request_totals() -> None:
+    refresh_access_request_totals(timezone.localdate() - dt.timedelta(days=RECENT_ROLLUP_DAYS))
+
+
+def get_access_request_totals(date_from: dt.date, date_to: dt.date) -> dict[str, int]:
+    """Return the number of access requests with each response submitted between two dates.
+
+    Days before today are read from the daily totals, today is counted from the access requests as
+    the daily totals are only refreshed periodically.
+    """
+
+    today = timezone.localdate()
+    totals: dict[str, int] = {}
+
+    rolled_up = (
+        AccessRequestDailyTotal.objects.filter(
+            day__range=(date_from, min(date_to, today - dt.timedelta(days=1)))
+        )
+        .values("response")
+        .annotate(response_total=Sum("total"))
+        .order_by()
+    )
+    for r in rolled_up:
+        totals[r["response"]] = r["response_total"]
+
+    if date_from <= today <= date_to:
+        live = (
+            AccessRequest.objects.filter(
+                response__isnull=False, submit_datetime__gte=_start_of_day(today)
+            )
+            .values("response")
+            .annotate(response_total=Count("pk"))
+            .order_by()
+        )
+        for r in live:
+            totals[r["response"]] = totals.get(r["response"], 0) + r["response_total"]
+
+    return totals
+
+
+def _start_of_day(day: dt.date) -> dt.datetime:
+    return timezone.make_aware(dt.datetime.combine(day, dt.time.min))
@@ -2,20 +2,28 @@ import datetime as dt
 from typing import Annotated, Any
 
 import pydantic
+from django.utils import timezone
 
 from web.models.shared import YesNoChoices
 from web.utils import datetime_format
 
+
+def format_report_datetime(value: Any) -> str:
+    if not hasattr(value, "strftime"):
+        return ""
+
+    if isinstance(value, dt.datetime) and timezone.is_aware(value):
+        # Reports are generated in a Celery task where the current timezone is the default timezone.
+        # Using it directly avoids looking up the current timezone for every value in the report.
+        value = value.astimezone(timezone.get_default_timezone())
+        return datetime_format(value, "%d/%m/%Y %H:%M:%S", local=False)
+
+    return datetime_format(value, "%d/%m/%Y %H:%M:%S")
+
+
 datetime_or_empty = Annotated[
     dt.datetime | None,
-    pydantic.PlainSerializer(
-        lambda _datetime: (
-            datetime_format(_datetime, "%d/%m/%Y %H:%M:%S")
-            if hasattr(_datetime, "strftime")
-            else ""
-        ),
-        return_type=str,
-    ),
+    pydantic.PlainSerializer(format_report_datetime, return_type=str),
 ]
 
 date_or_empty = Annotated[
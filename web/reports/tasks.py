@@ -1,15 +1,26 @@
+from celery import chord
+
 from config.celery import app
 from web.models import ScheduleReport
 
-from .constants import CELERY_REPORTS_QUEUE_NAME, GENERATE_REPORT_TASK_NAME, ReportType
+from .constants import (
+    CELERY_REPORTS_QUEUE_NAME,
+    GENERATE_REPORT_SHEET_TASK_NAME,
+    GENERATE_REPORT_TASK_NAME,
+    MERGE_REPORT_SHEETS_TASK_NAME,
+    REFRESH_REPORT_ROLLUPS_TASK_NAME,
+    ReportType,
+)
 from .generate import (
-    generate_access_request_report,
-    generate_active_users_report,
-    generate_firearms_licences_report,
+    ReportSheet,
+    finish_multi_sheet_report,
     generate_import_licence_report,
     generate_issued_certificate_report,
+    generate_report_sheet,
     generate_supplementary_firearms_report,
+    start_multi_sheet_report,
 )
+from .rollups import refresh_access_request_totals, refresh_recent_access_request_totals
 
 
 @app.task(name=GENERATE_REPORT_TASK_NAME, queue=CELERY_REPORTS_QUEUE_NAME)
@@ -18,15 +29,50 @@ def generate_report_task(scheduled_report_pk: int) -> None:
     match scheduled_report.report.report_type:
         case ReportType.ISSUED_CERTIFICATES:
             generate_issued_certificate_report(scheduled_report)
-        case ReportType.ACCESS_REQUESTS:
-            generate_access_request_report(scheduled_report)
         case ReportType.IMPORT_LICENCES:
             generate_import_licence_report(scheduled_report)
         case ReportType.SUPPLEMENTARY_FIREARMS:
             generate_supplementary_firearms_report(scheduled_report)
-        case ReportType.FIREARMS_LICENCES:
-            generate_firearms_licences_report(scheduled_report)
-        case ReportType.ACTIVE_USERS:
-            generate_active_users_report(scheduled_report)
+        case ReportType.ACCESS_REQUESTS | ReportType.FIREARMS_LICENCES | ReportType.ACTIVE_USERS:
+            generate_multi_sheet_report(scheduled_report)
         case _:
             raise ValueError("Unsupported Report Type")
+
+
+def generate_multi_sheet_report(scheduled_report: ScheduleReport) -> None:
+    """Generate each sheet of the report in a separate task and merge them once all have finished.
+
+    The report takes roughly as long as its slowest sheet rather than the sum of every sheet.
+    """
+
+    sheet_count = start_multi_sheet_report(scheduled_report)
+
+    header = [
+        generate_report_sheet_task.si(scheduled_report.pk, index) for index in range(sheet_count)
+    ]
+    callback = merge_report_sheets_task.s(scheduled_report.pk)
+
+    chord(header=header, body=callback).apply_async()
+
+
+@app.task(name=GENERATE_REPORT_SHEET_TASK_NAME, queue=CELERY_REPORTS_QUEUE_NAME)
+def generate_report_sheet_task(scheduled_report_pk: int, index: int) -> ReportSheet:
+    scheduled_report = ScheduleReport.objects.get(pk=scheduled_report_pk)
+
+    return generate_report_sheet(scheduled_report, index)
+
+
+@app.task(name=MERGE_REPORT_SHEETS_TASK_NAME, queue=CELERY_REPORTS_QUEUE_NAME)
+def merge_report_sheets_task(sheets: list[ReportSheet], scheduled_report_pk: int) -> None:
+    scheduled_report = ScheduleReport.objects.get(pk=scheduled_report_pk)
+    finish_multi_sheet_report(scheduled_report, sheets)
+
+
+@app.task(name=REFRESH_REPORT_ROLLUPS_TASK_NAME, queue=CELERY_REPORTS_QUEUE_NAME)
+def refresh_report_rollups_task(full: bool = False) -> None:
+    """Refresh the daily totals read by the totals reports (only recent days unless full)."""
+
+    if full:
+        refresh_access_request_totals()
+    else:
+        refresh_recent_access_request_totals()
@@ -1,6 +1,12 @@
 import datetime as dt
+import decimal
+import functools
+import json
+from typing import Any
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import QuerySet
+from pydantic import BaseModel, TypeAdapter
 
 from web.models import (
     ExportApplicationType,
@@ -151,8 +157,76 @@ def format_importer_address(ia: QuerySet) -> str:
 
 
 def get_error_serializer_header() -> list[str]:
-    schema = ErrorSerializer.model_json_schema(by_alias=True, mode="serialization")
-    return schema["required"]
+    return get_serializer_header(ErrorSerializer)
+
+
+def get_serializer_header(serializer: type[BaseModel]) -> list[str]:
+    """Return the column names of a report serializer, in the order the fields are serialized."""
+
+    return list(_get_serializer_header(serializer))
+
+
+@functools.cache
+def _get_serializer_header(serializer: type[BaseModel]) -> tuple[str, ...]:
+    # Generating the JSON schema is slow so it is only done once for each serializer.
+    schema = serializer.model_json_schema(by_alias=True, mode="serialization")
+    return tuple(schema["required"])
+
+
+# Types stored by TypedJSONEncoder, datetime is a subclass of date so must come first.
+_TYPED_JSON_TYPES: dict[str, type[dt.date | dt.time]] = {
+    "datetime": dt.datetime,
+    "date": dt.date,
+    "time": dt.time,
+}
+
+
+class TypedJSONEncoder(DjangoJSONEncoder):
+    """Encode dates, times and decimals with their type so loads_typed_json returns them unchanged.
+
+    Used for report rows stored as JSON until they are written to a spreadsheet, where a date
+    must still be a date rather than a string.
+    """
+
+    def default(self, o: Any) -> Any:
+        if isinstance(o, decimal.Decimal):
+            return {"__decimal__": str(o)}
+
+        for type_name, value_type in _TYPED_JSON_TYPES.items():
+            if isinstance(o, value_type):
+                return {f"__{type_name}__": o.isoformat()}
+
+        return super().default(o)
+
+
+def dumps_typed_json(value: Any) -> bytes:
+    return json.dumps(value, cls=TypedJSONEncoder).encode()
+
+
+def loads_typed_json(value: str | bytes) -> Any:
+    return json.loads(value, object_hook=_decode_typed_json_value)
+
+
+def _decode_typed_json_value(obj: dict[str, Any]) -> Any:
+    if len(obj) != 1:
+        return obj
+
+    ((key, value),) = obj.items()
+
+    if key == "__decimal__":
+        return decimal.Decimal(value)
+
+    if key.startswith("__") and (value_type := _TYPED_JSON_TYPES.get(key.strip("_"))):
+        return value_type.fromisoformat(value)
+
+    return obj
+
+
+@functools.cache
+def get_rows_adapter(serializer: type[BaseModel]) -> TypeAdapter[list[Any]]:
+    """Return a compiled TypeAdapter that serializes a list of serializer instances in one call."""
+
+    return TypeAdapter(list[serializer])  # type: ignore[valid-type]
 
 
 def get_report_objects_for_user(user: User) -> QuerySet[Report]:
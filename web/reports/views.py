@@ -2,18 +2,19 @@ from typing import Any, Union
 
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.db import transaction
-from django.db.models import QuerySet
+from django.db.models import Prefetch, QuerySet
 from django.http import HttpResponse, HttpResponseRedirect
+from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.generic import CreateView, DetailView, ListView, RedirectView
 
-from web.models import GeneratedReport, Report, ScheduleReport
+from web.domains.file.utils import get_file_download_response
+from web.models import GeneratedReport, Report, ScheduleReport, ScheduleReportProgress
 from web.permissions import Perms, can_user_view_report
 from web.types import AuthenticatedHttpRequest
-from web.utils.s3 import get_file_from_s3
 from web.utils.spreadsheet import MIMETYPE
 
 from .constants import ReportStatus, ReportType
@@ -56,7 +57,9 @@ class RunHistoryListView(BaseReportView, ListView):
     paginate_by = 20
 
     def get_queryset(self) -> QuerySet[ScheduleReport]:
-        queryset = ScheduleReport.objects.filter(report=self.get_report())
+        queryset = ScheduleReport.objects.filter(report=self.get_report()).prefetch_related(
+            Prefetch("progress", queryset=ScheduleReportProgress.objects.order_by("index"))
+        )
         if not self.request.GET.get("deleted"):
             queryset = queryset.exclude(status=ReportStatus.DELETED)
         return queryset.order_by("-finished_at")
@@ -85,6 +88,9 @@ class RunOutputView(BaseReportView, DetailView):
         context["xlsx_files"] = self.object.generated_files.filter(
             document__content_type=MIMETYPE.XLSX
         )
+        context["parquet_files"] = self.object.generated_files.filter(
+            document__content_type=MIMETYPE.PARQUET
+        )
         context["parameters"] = format_parameters_used(self.object)
         return context
 
@@ -138,18 +144,11 @@ class DownloadReportView(BaseReportView, DetailView):
     model = GeneratedReport
     pk_url_kwarg = "pk"
 
-    def get(self, *args: Any, **kwargs: Any) -> HttpResponse:
+    def get(self, *args: Any, **kwargs: Any) -> HttpResponseBase:
         generated_report = GeneratedReport.objects.get(
             schedule__report=self.get_report(), pk=kwargs["pk"]
         )
-        file_content = get_file_from_s3(generated_report.document.path)
-        response = HttpResponse(
-            content=file_content, content_type=generated_report.document.content_type
-        )
-        response["Content-Disposition"] = (
-            f'attachment; filename="{generated_report.document.filename}"'
-        )
-        return response
+        return get_file_download_response(self.request, generated_report.document)
 
 
 @method_decorator(transaction.atomic, name="post")
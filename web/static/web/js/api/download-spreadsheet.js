@@ -21,7 +21,10 @@ function setupDownloadSpreadsheetEventHandler({ downloadId, searchFormId, warnin
 
 
 /**
- * Download an application results spreadsheet.
+ * Request an application results spreadsheet.
+ *
+ * The spreadsheet is generated in the background, the response redirects to a page
+ * showing its progress and a download link when it is ready.
  * @param {string} downloadForm
  * @param {string} searchFormId
  */
@@ -39,40 +42,6 @@ async function handleResultsSpreadsheetDownload(downloadForm, searchFormId) {
     return Promise.reject("Unable to download spreadsheet");
   }
 
-  // Download the spreadsheet
-  const spreadsheetFile = await response.blob();
-  downloadFile(spreadsheetFile)
-}
-
-
-/**
- * Create a link and simulate a click event to download the supplied file object.
- */
-function downloadFile(file) {
-  // Create a link and set the URL using `createObjectURL`
-  const link = document.createElement("a");
-  link.style.display = "none";
-  link.href = URL.createObjectURL(file);
-  const stamp = fileTimestamp();
-  link.download = `search_application_download_${stamp}`;
-
-  // It needs to be added to the DOM so it can be clicked
-  document.body.appendChild(link);
-  link.click();
-
-  // To make this work on Firefox we need to wait
-  // a little while before removing it.
-  setTimeout(() => {
-    URL.revokeObjectURL(link.href);
-    link.parentNode.removeChild(link);
-  }, 0);
-}
-
-
-function fileTimestamp() {
-  let today = new Date();
-  let tDate = today.toLocaleDateString();
-  let tTime = today.toLocaleTimeString();
-
-  return `${tDate}_${tTime}`;
+  // Show the spreadsheet progress page
+  window.location.assign(response.url);
 }
@@ -8,10 +8,16 @@ from web.domains.case.tasks import (  # NOQA
     create_document_pack_on_success,
     create_export_application_document,
     create_import_application_document,
+    create_search_results_spreadsheet,
+    refresh_related_search_rows_task,
+    refresh_search_rows_task,
 )
 from web.mail.tasks import (  # NOQA
+    dispatch_outbox_emails_task,
+    record_mailshot_email_retry_task,
     send_authority_expiring_firearms_email_task,
     send_authority_expiring_section_5_email_task,
+    send_mailshot_email_batch_task,
     send_mailshot_email_task,
     send_retract_mailshot_email_task,
 )
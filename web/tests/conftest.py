@@ -27,6 +27,7 @@ from web.domains.case.shared import ImpExpStatus
 from web.domains.case.utils import end_process_task
 from web.domains.signature import utils as signature_utils
 from web.flow.models import ProcessTypes
+from web.mail.outbox import dispatch_outbox_emails
 from web.models import (
     ActQuantity,
     CertificateApplicationTemplate,
@@ -126,6 +127,18 @@ def django_db_setup(django_db_setup, django_db_blocker):
         call_command("add_test_data")
 
 
+@pytest.fixture
+def replica_db():
+    """Send replica reads (see web.utils.replica) to the test_replica database.
+
+    Tests using the fixture must allow queries to it with
+    @pytest.mark.django_db(databases=["default", "test_replica"])
+    """
+
+    with mock.patch("web.utils.replica.REPLICA_DB_ALIAS", "test_replica"):
+        yield "test_replica"
+
+
 #
 # Site Fixtures
 #
@@ -1514,7 +1527,11 @@ def strict_templates():
 
 @pytest.fixture
 def enable_gov_notify_backend():
-    with override_settings(EMAIL_BACKEND="web.mail.backends.GovNotifyEmailBackend"):
+    # The test transaction is never committed, so outbox emails are queued straight away.
+    with (
+        override_settings(EMAIL_BACKEND="web.mail.backends.GovNotifyEmailBackend"),
+        mock.patch("web.mail.outbox.dispatch_outbox_emails_on_commit", dispatch_outbox_emails),
+    ):
         yield None
 
 
@@ -1,6 +1,7 @@
 import datetime as dt
 import io
 from http import HTTPStatus
+from unittest import mock
 
 import pytest
 from django.core import mail
@@ -21,13 +22,20 @@ from web.models import (
     CertificateOfGoodManufacturingPracticeApplication,
     CertificateOfManufactureApplication,
     ImportApplicationLicence,
+    SearchResultsSpreadsheet,
     SILApplication,
     Task,
     WoodQuotaApplication,
 )
 from web.permissions import Perms
 from web.sites import SiteName, get_exporter_site_domain, get_importer_site_domain
-from web.tests.helpers import CaseURLS, SearchURLS, check_gov_notify_email_was_sent
+from web.tests.helpers import (
+    CaseURLS,
+    SearchURLS,
+    check_gov_notify_email_was_sent,
+    get_s3_file_stream,
+)
+from web.utils.search import api as search_api
 from web.utils.search.types import ExportResultRow, ImportResultRow
 
 
@@ -84,6 +92,62 @@ class TestSearchCasesView:
         result: ExportResultRow = response.context["search_records"][0]
         assert result.case_reference == completed_cfs_app.reference
 
+    def test_search_next_page(self, completed_sil_app, completed_dfl_app, monkeypatch):
+        monkeypatch.setattr(search_api, "SEARCH_PAGE_SIZE", 1)
+        results_url = SearchURLS.search_cases_get_results("import")
+
+        response = self.ilb_admin_user_client.get(results_url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["total_rows"] >= 2
+        assert len(response.context["search_records"]) == 1
+        assert response.context["first_page_url"] is None
+        first_record = response.context["search_records"][0]
+
+        next_page_url = response.context["next_page_url"]
+        assert "cursor=" in next_page_url
+        assert f"total={response.context['total_rows']}" in next_page_url
+
+        with mock.patch.object(
+            search_api, "_get_total_rows", wraps=search_api._get_total_rows
+        ) as get_total_rows:
+            response = self.ilb_admin_user_client.get(next_page_url)
+
+        # The total counted by the first page is reused
+        get_total_rows.assert_not_called()
+
+        assert response.status_code == HTTPStatus.OK
+        assert len(response.context["search_records"]) == 1
+        assert response.context["search_records"][0].app_pk != first_record.app_pk
+        assert response.context["first_page_url"] is not None
+
+    def test_search_total_rows_capped(self, completed_sil_app, completed_dfl_app, monkeypatch):
+        monkeypatch.setattr(search_api, "SEARCH_PAGE_SIZE", 1)
+        monkeypatch.setattr(search_api, "SEARCH_TOTAL_ROWS_CAP", 1)
+        results_url = SearchURLS.search_cases_get_results("import")
+
+        response = self.ilb_admin_user_client.get(results_url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["total_rows"] == 1
+        assert response.context["total_rows_capped"] is True
+        count_all_url = response.context["count_all_url"]
+        assert "exact_total=1" in count_all_url
+        assert "Count all matching applications" in response.content.decode()
+
+        response = self.ilb_admin_user_client.get(count_all_url)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["total_rows"] >= 2
+        assert response.context["total_rows_capped"] is False
+        assert response.context["count_all_url"] is None
+
+        # The exact count is kept when moving between pages
+        assert "exact_total=1" in response.context["next_page_url"]
+        response = self.ilb_admin_user_client.get(response.context["next_page_url"])
+        assert response.context["total_rows_capped"] is False
+        assert "exact_total=1" in response.context["first_page_url"]
+
 
 class TestDownloadSpreadsheetView:
     @pytest.fixture(autouse=True)
@@ -95,29 +159,95 @@ class TestDownloadSpreadsheetView:
         self.exporter_user_client = exporter_client
         self.ilb_admin_user_client = ilb_admin_client
 
+        # Files "uploaded" to s3 by path
+        self.s3_files = {}
+
+        def upload_file_obj_to_s3_in_parts(file_obj, key):
+            file_obj.seek(0)
+            self.s3_files[key] = file_obj.read()
+
+            return len(self.s3_files[key])
+
+        with (
+            mock.patch(
+                "web.domains.case.tasks.upload_file_obj_to_s3_in_parts",
+                side_effect=upload_file_obj_to_s3_in_parts,
+            ),
+            mock.patch(
+                "web.domains.file.utils.get_file_stream_from_s3",
+                side_effect=lambda path, **kwargs: get_s3_file_stream(self.s3_files[path]),
+            ),
+        ):
+            yield
+
+    def _download_spreadsheet(self, client, url, form_data):
+        """Request a spreadsheet, check the progress page and return the downloaded file."""
+
+        response = client.post(url, form_data)
+        assert response.status_code == HTTPStatus.FOUND
+
+        # The spreadsheet is created by a celery task (which runs eagerly in tests)
+        response = client.get(response.url)
+        assert response.status_code == HTTPStatus.OK
+
+        spreadsheet = response.context["spreadsheet"]
+        assert spreadsheet.status == SearchResultsSpreadsheet.Status.COMPLETED
+        assert spreadsheet.processed_rows == spreadsheet.total_rows == 1
+
+        download_url = SearchURLS.search_spreadsheet_download(spreadsheet.case_type, spreadsheet.pk)
+        assert download_url in response.content.decode()
+
+        response = client.get(download_url)
+        assert response.status_code == HTTPStatus.OK
+
+        return response
+
     def test_permission(self):
         response = self.importer_user_client.post(self.import_download_url, data={})
-        assert response.status_code == HTTPStatus.OK
+        assert response.status_code == HTTPStatus.FOUND
 
         response = self.exporter_user_client.post(self.import_download_url, data={})
         assert response.status_code == HTTPStatus.FORBIDDEN
 
         response = self.exporter_user_client.post(self.export_download_url, data={})
-        assert response.status_code == HTTPStatus.OK
+        assert response.status_code == HTTPStatus.FOUND
 
         response = self.importer_user_client.post(self.export_download_url, data={})
         assert response.status_code == HTTPStatus.FORBIDDEN
 
         for search_url in [self.import_download_url, self.export_download_url]:
             response = self.ilb_admin_user_client.post(search_url, data={})
-            assert response.status_code == HTTPStatus.OK
+            assert response.status_code == HTTPStatus.FOUND
+
+    def test_spreadsheet_only_visible_to_requesting_user(self):
+        response = self.importer_user_client.post(self.import_download_url, data={})
+        spreadsheet = SearchResultsSpreadsheet.objects.get()
+
+        response = self.ilb_admin_user_client.get(response.url)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+        download_url = SearchURLS.search_spreadsheet_download("import", spreadsheet.pk)
+        response = self.ilb_admin_user_client.get(download_url)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_spreadsheet_failed(self):
+        with mock.patch(
+            "web.domains.case.tasks.write_search_results_spreadsheet", side_effect=ValueError
+        ):
+            response = self.importer_user_client.post(self.import_download_url, data={})
+
+        response = self.importer_user_client.get(response.url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.context["spreadsheet"].status == SearchResultsSpreadsheet.Status.FAILED
+        assert "Unable to create the search results spreadsheet." in response.content.decode()
 
     def test_can_download_spreadsheet_import(self, completed_sil_app):
         form_data = {"case_ref": completed_sil_app.reference}
-        response = self.importer_user_client.post(self.import_download_url, form_data)
+        response = self._download_spreadsheet(
+            self.importer_user_client, self.import_download_url, form_data
+        )
 
-        assert response.status_code == HTTPStatus.OK
-        workbook = load_workbook(filename=io.BytesIO(response.content), read_only=True)
+        workbook = load_workbook(filename=io.BytesIO(response.getvalue()), read_only=True)
 
         assert workbook.sheetnames == ["Sheet 1"]
 
@@ -161,10 +291,11 @@ class TestDownloadSpreadsheetView:
 
     def test_can_download_spreadsheet_export(self, completed_cfs_app):
         form_data = {"case_ref": completed_cfs_app.reference}
-        response = self.exporter_user_client.post(self.export_download_url, form_data)
+        response = self._download_spreadsheet(
+            self.exporter_user_client, self.export_download_url, form_data
+        )
 
-        assert response.status_code == HTTPStatus.OK
-        workbook = load_workbook(filename=io.BytesIO(response.content), read_only=True)
+        workbook = load_workbook(filename=io.BytesIO(response.getvalue()), read_only=True)
 
         assert workbook.sheetnames == ["Sheet 1"]
 
@@ -260,6 +391,30 @@ class TestReassignCaseOwnerView:
         assert app.case_owner == ilb_admin_two
 
 
+@pytest.mark.django_db(databases=["default", "test_replica"])
+def test_search_after_reassign_case_owner_reads_default_database(
+    replica_db, fa_dfl_app_submitted, ilb_admin_client, ilb_admin_two
+):
+    app = fa_dfl_app_submitted
+    results_url = SearchURLS.search_cases_get_results("import")
+    search_data = {"case_ref": app.reference}
+
+    # The test replica can't see the application as it hasn't been committed
+    response = ilb_admin_client.get(results_url, search_data)
+    assert response.context["total_rows"] == 0
+
+    form_data = {"assign_to": ilb_admin_two.pk, "applications": app.pk}
+    response = ilb_admin_client.post(SearchURLS.reassign_case_owner("import"), form_data)
+    assert response.status_code == HTTPStatus.NO_CONTENT
+
+    # The search reloaded after reassigning the case reads the default database
+    response = ilb_admin_client.get(results_url, search_data)
+    assert response.context["total_rows"] == 1
+
+    result: ImportResultRow = response.context["search_records"][0]
+    assert result.case_status.case_reference == app.reference
+
+
 class TestReopenApplicationViewImportApplication:
     client: Client
     wood_app: WoodQuotaApplication
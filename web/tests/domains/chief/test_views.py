@@ -15,7 +15,7 @@ from web.domains.case.shared import ImpExpStatus
 from web.domains.chief import client, types
 from web.domains.chief import views as chief_views
 from web.domains.chief.client import HTTPMethod, make_hawk_sender
-from web.models import ImportApplicationLicence, Task
+from web.models import CaseDocumentReference, ImportApplicationLicence, Task
 from web.tests.helpers import CaseURLS
 from web.utils.sentry import capture_exception
 
@@ -241,6 +241,72 @@ class TestLicenseDataCallbackView:
 
 
 @pytest.mark.django_db
+class TestUsageDataCallbackView:
+    @pytest.fixture(autouse=True)
+    def _setup(self, completed_sil_app, monkeypatch, cw_client):
+        self.client = cw_client
+        self.app = completed_sil_app
+        self.url = reverse("chief:usage-data-callback")
+
+        # Fake mohawk (see TestLicenseDataCallbackView)
+        mohawk_mock = create_autospec(mohawk)
+        mohawk_mock.Receiver.return_value.parsed_header = parse_authorization_header(
+            'Hawk id="dh37fgj492je", ts="1367076201", nonce="NPHgnG", ext="foo bar"'  # /PS-IGNORE
+            ', mac="CeWHy4d9kbLGhDlkyw2Nh3PJ7SDOdZDa267KH4ZaNMY="'  # /PS-IGNORE
+        )
+        mohawk_mock.Receiver.return_value.respond.return_value = (
+            'Hawk id="ph37fgj492je", ext="foo bar"'  # /PS-IGNORE
+            ', mac="DeWHy4d9kbLGhDlkyw2Nh3PJ7SDOdZDa267KH4ZaNMY="'  # /PS-IGNORE
+        )
+        monkeypatch.setattr(chief_views, "mohawk", mohawk_mock)
+
+        self.mock_capture_message = create_autospec(chief_views.capture_message)
+        monkeypatch.setattr(chief_views, "capture_message", self.mock_capture_message)
+
+        licence = self.app.licences.get(status=ImportApplicationLicence.Status.ACTIVE)
+        self.licence_ref = licence.document_references.get(
+            document_type=CaseDocumentReference.Type.LICENCE
+        ).reference
+
+    def _post(self, records: list[tuple[str, str]]):
+        payload = types.ChiefUsageDataResponseData(
+            usage_data=[
+                types.UsageRecord(licence_ref=ref, licence_status=status) for ref, status in records
+            ]
+        )
+
+        return self.client.post(
+            self.url,
+            data=payload.model_dump(),
+            content_type=JSON_TYPE,
+            HTTP_HAWK_AUTHENTICATION="foo",
+        )
+
+    def test_usage_data_updates_usage_status(self):
+        response = self._post([(self.licence_ref, "O"), (self.licence_ref, "E")])
+        assert response.status_code == HTTPStatus.OK
+
+        # The last record for a licence is used
+        self.app.refresh_from_db()
+        assert self.app.chief_usage_status == "E"
+        assert self.mock_capture_message.called is False
+
+    def test_usage_data_licences_not_found(self):
+        response = self._post(
+            [("GBSIL9999999X", "C"), (self.licence_ref, "O"), ("GBSIL9999998X", "C")]
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        self.app.refresh_from_db()
+        assert self.app.chief_usage_status == "O"
+
+        # Every missing licence is reported at once
+        self.mock_capture_message.assert_called_once_with(
+            "licence not found: Unable to set usage status for licence numbers:"
+            " GBSIL9999998X, GBSIL9999999X."
+        )
+
+
 class TestPendingLicences:
     def test_template_context(self, ilb_admin_client):
         url = reverse("chief:pending-licences")
@@ -1,16 +1,24 @@
+import datetime as dt
+from http import HTTPStatus
 from random import choice
 from unittest import mock
 
 import pytest
+from botocore.exceptions import ClientError
 from django.forms import forms
+from django.http import StreamingHttpResponse
+from django.test import RequestFactory
 from storages.backends.s3boto3 import S3Boto3StorageFile
 
 from web.domains.file.utils import (
     FILE_EXTENSION_ALLOW_LIST,
     IMAGE_EXTENSION_ALLOW_LIST,
     ImageFileFieldValidator,
+    get_file_download_response,
     validate_file_extension,
 )
+from web.models import File
+from web.tests.helpers import get_s3_file_stream
 
 
 @pytest.mark.parametrize(
@@ -137,3 +145,115 @@ def test_validate_image_file_extension_invalid_with_custom_allowed_extensions():
             match="Invalid file extension. Only these extensions are allowed: ",
         ):
             ImageFileFieldValidator(allowed_extensions=["jpg"])(mock_file)
+
+
+class TestGetFileDownloadResponse:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.document = File(
+            filename="test.txt", content_type="text/plain", file_size=12, path="docs/test.txt"
+        )
+
+        with mock.patch("web.domains.file.utils.get_file_stream_from_s3") as mock_get_file:
+            self.mock_get_file = mock_get_file
+            yield
+
+    @staticmethod
+    def _s3_error(status: int, headers: dict[str, str] | None = None) -> ClientError:
+        error_response = {
+            "Error": {"Code": str(status)},
+            "ResponseMetadata": {"HTTPStatusCode": status, "HTTPHeaders": headers or {}},
+        }
+
+        return ClientError(error_response, "GetObject")
+
+    def test_file_streamed(self):
+        self.mock_get_file.return_value = get_s3_file_stream(b"file_content")
+        request = RequestFactory().get("/")
+
+        response = get_file_download_response(request, self.document)
+
+        self.mock_get_file.assert_called_once_with("docs/test.txt")
+        assert isinstance(response, StreamingHttpResponse)
+        assert response.status_code == HTTPStatus.OK
+        assert response.getvalue() == b"file_content"
+        assert response["Content-Type"] == "text/plain"
+        assert response["Content-Length"] == "12"
+        assert response["Content-Disposition"] == 'attachment; filename="test.txt"'
+        assert response["Accept-Ranges"] == "bytes"
+        assert response["ETag"] == '"test-etag"'
+        assert response["Last-Modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+
+    def test_range_request(self):
+        self.mock_get_file.return_value = get_s3_file_stream(b"file") | {
+            "ContentRange": "bytes 0-3/12"
+        }
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=0-3")
+
+        response = get_file_download_response(request, self.document)
+
+        self.mock_get_file.assert_called_once_with("docs/test.txt", Range="bytes=0-3")
+        assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+        assert response["Content-Range"] == "bytes 0-3/12"
+        assert response.getvalue() == b"file"
+
+    def test_multiple_ranges_ignored(self):
+        self.mock_get_file.return_value = get_s3_file_stream(b"file_content")
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=0-3,6-8")
+
+        response = get_file_download_response(request, self.document)
+
+        self.mock_get_file.assert_called_once_with("docs/test.txt")
+        assert response.status_code == HTTPStatus.OK
+
+    def test_range_not_satisfiable(self):
+        self.mock_get_file.side_effect = self._s3_error(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=100-")
+
+        response = get_file_download_response(request, self.document)
+
+        assert response.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+        assert response["Content-Range"] == "bytes */12"
+
+    def test_if_range_changed_returns_whole_file(self):
+        self.mock_get_file.side_effect = [
+            self._s3_error(HTTPStatus.PRECONDITION_FAILED),
+            get_s3_file_stream(b"file_content"),
+        ]
+        request = RequestFactory().get("/", HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"old-etag"')
+
+        response = get_file_download_response(request, self.document)
+
+        assert self.mock_get_file.call_args_list == [
+            mock.call("docs/test.txt", Range="bytes=0-3", IfMatch='"old-etag"'),
+            mock.call("docs/test.txt"),
+        ]
+        assert response.status_code == HTTPStatus.OK
+        assert response.getvalue() == b"file_content"
+
+    def test_not_modified(self):
+        self.mock_get_file.side_effect = self._s3_error(
+            HTTPStatus.NOT_MODIFIED, {"etag": '"test-etag"'}
+        )
+        request = RequestFactory().get(
+            "/",
+            HTTP_IF_NONE_MATCH='"test-etag"',
+            HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2024 00:00:00 GMT",
+        )
+
+        response = get_file_download_response(request, self.document)
+
+        self.mock_get_file.assert_called_once_with(
+            "docs/test.txt",
+            IfNoneMatch='"test-etag"',
+            IfModifiedSince=dt.datetime(2024, 1, 1, tzinfo=dt.UTC),
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response["ETag"] == '"test-etag"'
+
+    def test_s3_error_raised(self):
+        self.mock_get_file.side_effect = self._s3_error(HTTPStatus.NOT_FOUND)
+        request = RequestFactory().get("/")
+
+        with pytest.raises(ClientError):
+            get_file_download_response(request, self.document)
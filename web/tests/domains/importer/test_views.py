@@ -9,7 +9,7 @@ from django.utils import timezone
 from guardian.shortcuts import remove_perm
 from pytest_django.asserts import assertInHTML, assertRedirects
 
-from web.domains.importer import views
+from web.domains.file import utils as file_utils
 from web.mail.constants import EmailTypes
 from web.models import Importer, Section5Authority
 from web.permissions import Perms
@@ -20,8 +20,9 @@ from web.tests.domains.importer.factory import ImporterFactory
 from web.tests.helpers import (
     check_gov_notify_email_was_sent,
     get_messages_from_response,
+    get_s3_file_stream,
 )
-from web.utils.s3 import get_file_from_s3
+from web.utils.s3 import get_file_stream_from_s3
 
 
 @pytest.fixture
@@ -629,9 +630,9 @@ class TestViewDocumentSection5View(AuthTestCase):
             kwargs={"section5_pk": self.section5.id, "document_pk": self.document.pk},
         )
 
-        get_file_from_s3_mock = create_autospec(get_file_from_s3)
-        get_file_from_s3_mock.return_value = b"file_content"
-        monkeypatch.setattr(views, "get_file_from_s3", get_file_from_s3_mock)
+        get_file_stream_from_s3_mock = create_autospec(get_file_stream_from_s3)
+        get_file_stream_from_s3_mock.return_value = get_s3_file_stream(b"file_content")
+        monkeypatch.setattr(file_utils, "get_file_stream_from_s3", get_file_stream_from_s3_mock)
 
     def test_permission(self):
         response = self.ilb_admin_client.get(self.url)
@@ -647,7 +648,7 @@ class TestViewDocumentSection5View(AuthTestCase):
         response = self.ilb_admin_client.get(self.url)
         assert response.status_code == HTTPStatus.OK
 
-        assert response.content == b"file_content"
+        assert response.getvalue() == b"file_content"
         assert response.headers["Content-Type"] == "text/plain"
         assert (
             response.headers["Content-Disposition"]
@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import freezegun
 import pytest
+from django.test import override_settings
 from django.test.client import Client
 from django.urls import reverse
 from django.utils import timezone
@@ -1686,6 +1687,21 @@ class TestMailshotsAppearInWorkbasket(AuthTestCase):
         }
         check_expected_rows(self.exporter_agent_client, expected_rows)
 
+    @override_settings(WORKBASKET_PER_PAGE=1)
+    def test_workbasket_paginated_newest_first(self):
+        url = reverse("workbasket")
+
+        response = self.importer_client.get(url)
+        assert response.context["page_obj"].paginator.count == 2
+        assert [r.reference for r in response.context["rows"]] == [
+            self.importer_mailshot.get_reference()
+        ]
+
+        response = self.importer_client.get(url, {"page": 2})
+        assert [r.reference for r in response.context["rows"]] == [
+            self.all_org_mailshot.get_reference()
+        ]
+
     def _create_mailshot(
         self,
         title,
@@ -1,3 +1,8 @@
+import datetime as dt
+import io
+from typing import Any
+
+from botocore.response import StreamingBody
 from django.conf import settings
 from django.contrib.messages import get_messages
 from django.core import mail
@@ -143,6 +148,17 @@ def add_approval_request(
     )
 
 
+def get_s3_file_stream(content: bytes) -> dict[str, Any]:
+    """Return a fake S3 get_object response for a file containing the supplied content."""
+
+    return {
+        "Body": StreamingBody(io.BytesIO(content), len(content)),
+        "ContentLength": len(content),
+        "ETag": '"test-etag"',
+        "LastModified": dt.datetime(2024, 1, 1, tzinfo=dt.UTC),
+    }
+
+
 def get_messages_from_response(response: HttpResponseRedirect | HttpResponse) -> list[str]:
     return [msg.message for msg in get_messages(response.wsgi_request)]
 
@@ -666,6 +682,18 @@ class SearchURLS:
 
         return reverse("case:search-download-spreadsheet", kwargs=kwargs)
 
+    @staticmethod
+    def search_spreadsheet_detail(case_type: str, spreadsheet_pk: int) -> str:
+        kwargs = {"case_type": case_type, "spreadsheet_pk": spreadsheet_pk}
+
+        return reverse("case:search-spreadsheet-detail", kwargs=kwargs)
+
+    @staticmethod
+    def search_spreadsheet_download(case_type: str, spreadsheet_pk: int) -> str:
+        kwargs = {"case_type": case_type, "spreadsheet_pk": spreadsheet_pk}
+
+        return reverse("case:search-spreadsheet-download", kwargs=kwargs)
+
     @staticmethod
     def reopen_case(application_pk: int, case_type: str = "import") -> str:
         kwargs = {"application_pk": application_pk, "case_type": case_type}
@@ -0,0 +1,141 @@
+import datetime as dt
+import uuid
+from unittest import mock
+
+import pytest
+from django.core.mail import get_connection
+from django.utils import timezone
+from notifications_python_client.errors import HTTPError
+
+from web.mail.api import send_outbox_emails
+from web.mail.messages import MailshotEmail
+from web.mail.outbox import dispatch_outbox_emails, get_outbox_metrics
+from web.mail.tasks import dispatch_outbox_emails_task
+from web.models import OutboxEmail
+from web.sites import get_importer_site_domain
+
+TEMPLATE_ID = uuid.UUID("fb9a1023-3901-44e8-a7d3-a0e309e93951")
+
+
+@pytest.fixture
+def mock_gov_notify_client():
+    # Not the conftest fixture, as that queues outbox emails without waiting for the transaction
+    with mock.patch("web.mail.api.get_gov_notify_client") as client:
+        yield client.return_value
+
+
+def _add_outbox_email(email_address="one@example.com", **personalisation):  # /PS-IGNORE
+    return OutboxEmail.objects.create(
+        template_id=TEMPLATE_ID, personalisation=personalisation, email_address=email_address
+    )
+
+
+def test_send_messages_on_commit(
+    db, draft_mailshot, mock_gov_notify_client, settings, django_capture_on_commit_callbacks
+):
+    settings.EMAIL_BACKEND = "web.mail.backends.GovNotifyEmailBackend"
+    recipients = ["one@example.com", "two@example.com"]  # /PS-IGNORE
+    message = MailshotEmail(
+        mailshot=draft_mailshot, site_domain=get_importer_site_domain(), to=recipients
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        get_connection().send_messages([message])
+
+        # Nothing is queued until the transaction is committed
+        assert OutboxEmail.objects.count() == 2
+        assert mock_gov_notify_client.send_email_notification.called is False
+
+    assert OutboxEmail.objects.count() == 0
+    assert mock_gov_notify_client.send_email_notification.call_count == 2
+    mock_gov_notify_client.send_email_notification.assert_any_call(
+        "two@example.com",  # /PS-IGNORE
+        str(message.template_id),
+        personalisation=message.get_personalisation(),
+    )
+
+
+def test_send_messages_rolled_back(db, draft_mailshot, mock_gov_notify_client, settings):
+    settings.EMAIL_BACKEND = "web.mail.backends.GovNotifyEmailBackend"
+    message = MailshotEmail(
+        mailshot=draft_mailshot,
+        site_domain=get_importer_site_domain(),
+        to=["one@example.com"],  # /PS-IGNORE
+    )
+
+    # The on commit callbacks of the test transaction are never run
+    get_connection().send_messages([message])
+
+    assert OutboxEmail.objects.count() == 1
+    assert mock_gov_notify_client.send_email_notification.called is False
+
+
+def test_dispatch_outbox_emails_deduplicates(db, mock_gov_notify_client):
+    _add_outbox_email(name="one")
+    _add_outbox_email(name="one")
+    _add_outbox_email(name="two")
+    _add_outbox_email("two@example.com", name="one")  # /PS-IGNORE
+
+    dispatch_outbox_emails()
+
+    assert OutboxEmail.objects.count() == 0
+    assert mock_gov_notify_client.send_email_notification.call_count == 3
+
+
+@mock.patch("web.mail.outbox.OUTBOX_BATCH_SIZE", 2)
+@mock.patch("web.mail.outbox.send_outbox_emails")
+def test_dispatch_outbox_emails_batches(mock_send_outbox_emails, db):
+    for i in range(5):
+        _add_outbox_email(f"{i}@example.com")  # /PS-IGNORE
+
+    dispatch_outbox_emails()
+
+    assert [len(c.args[0]) for c in mock_send_outbox_emails.delay.call_args_list] == [2, 2, 1]
+    assert mock_send_outbox_emails.delay.call_args_list[0].args[0][0] == (
+        str(TEMPLATE_ID),
+        {},
+        "0@example.com",  # /PS-IGNORE
+    )
+
+
+@mock.patch("web.mail.api.send_email")
+def test_send_outbox_emails_failure_retried(mock_send_email, mock_gov_notify_client):
+    fake_response = mock.Mock(status_code=500, json=lambda: {"errors": []})
+    mock_gov_notify_client.send_email_notification.side_effect = [
+        HTTPError.create(mock.Mock(response=fake_response)),
+        {},
+    ]
+    emails = [
+        (str(TEMPLATE_ID), {}, "one@example.com"),  # /PS-IGNORE
+        (str(TEMPLATE_ID), {}, "two@example.com"),  # /PS-IGNORE
+    ]
+
+    send_outbox_emails(emails)
+
+    assert mock_gov_notify_client.send_email_notification.call_count == 2
+    mock_send_email.apply_async.assert_called_once_with(
+        args=[str(TEMPLATE_ID), {}, "one@example.com"]  # /PS-IGNORE
+    )
+
+
+def test_get_outbox_metrics(db):
+    assert get_outbox_metrics() == {"depth": 0, "oldest_age": 0}
+
+    email = _add_outbox_email()
+    OutboxEmail.objects.filter(pk=email.pk).update(
+        created_datetime=timezone.now() - dt.timedelta(minutes=10)
+    )
+    _add_outbox_email()
+
+    metrics = get_outbox_metrics()
+    assert metrics["depth"] == 2
+    assert 600 <= metrics["oldest_age"] < 610
+
+
+def test_dispatch_outbox_emails_task(db, mock_gov_notify_client):
+    _add_outbox_email()
+
+    dispatch_outbox_emails_task.delay()
+
+    assert OutboxEmail.objects.count() == 0
+    assert mock_gov_notify_client.send_email_notification.call_count == 1
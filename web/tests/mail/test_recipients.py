@@ -1,10 +1,15 @@
+from unittest import mock
+
 import pytest
 from django.test import override_settings
 
 from web.mail.recipients import (
+    get_application_contact_email_addresses,
+    get_email_addresses_for_mailshot,
     get_ilb_case_officers_email_addresses,
     get_organisation_contact_email_addresses,
 )
+from web.models import Exporter, Importer
 
 
 @pytest.mark.django_db
@@ -28,3 +33,45 @@ def test_get_ilb_case_officers_email_addresses_override_recipients():
 @pytest.mark.django_db
 def test_get_importer_organisation_contact_email_addresses(importer, importer_one_contact):
     assert get_organisation_contact_email_addresses(importer) == [importer_one_contact.email]
+
+
+@pytest.mark.django_db
+def test_get_exporter_organisation_contact_email_addresses(
+    exporter, exporter_one_contact, exporter_secondary_contact, django_assert_num_queries
+):
+    with django_assert_num_queries(1):
+        emails = get_organisation_contact_email_addresses(exporter)
+
+    # The inactive contact isn't included
+    assert emails == sorted([exporter_one_contact.email, exporter_secondary_contact.email])
+
+
+@pytest.mark.django_db
+def test_get_application_contact_email_addresses_exclusive_correspondence(
+    exporter, exporter_one_contact, exporter_secondary_contact, importer_one_contact
+):
+    exporter.exclusive_correspondence = True
+    application = mock.Mock(agent=None, exporter=exporter, contact_id=exporter_one_contact.pk)
+    application.is_import_application.return_value = False
+
+    assert get_application_contact_email_addresses(application) == [exporter_one_contact.email]
+
+    # Every contact is emailed when the application contact is no longer a contact
+    application.contact_id = importer_one_contact.pk
+    assert get_application_contact_email_addresses(application) == sorted(
+        [exporter_one_contact.email, exporter_secondary_contact.email]
+    )
+
+
+@pytest.mark.parametrize("organisation_class", [Importer, Exporter])
+@pytest.mark.django_db
+def test_get_email_addresses_for_mailshot(organisation_class, django_assert_num_queries):
+    expected = set()
+    for org in organisation_class.objects.filter(is_active=True):
+        expected.update(get_organisation_contact_email_addresses(org))
+
+    with django_assert_num_queries(1):
+        emails = get_email_addresses_for_mailshot(organisation_class)
+
+    assert expected
+    assert emails == sorted(expected)
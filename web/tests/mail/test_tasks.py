@@ -3,18 +3,23 @@ from unittest import mock
 
 import freezegun
 import pytest
+from celery.exceptions import Retry
 from celery.result import EagerResult
 from django.utils import timezone
+from notifications_python_client.errors import HTTPError
 
+from web.mail.constants import EmailTypes
 from web.mail.tasks import (
     get_expiring_importers_details,
     send_authority_expiring_firearms_email_task,
     send_authority_expiring_section_5_email_task,
+    send_mailshot_email_batch_task,
     send_mailshot_email_task,
     send_retract_mailshot_email_task,
 )
 from web.mail.types import ImporterDetails
-from web.models import Constabulary, FirearmsAuthority, Section5Authority
+from web.models import Constabulary, FirearmsAuthority, Mailshot, Section5Authority
+from web.sites import get_importer_site_domain
 from web.tests.auth import AuthTestCase
 
 
@@ -135,6 +140,92 @@ class TestMailTasks(AuthTestCase):
         assert celery_result.successful() is True
         assert mock_send_email.called is True
 
+    def test_send_mailshot_email_batch_task(self, draft_mailshot, mock_gov_notify_client):
+        fake_response = mock.Mock(status_code=400, json=lambda: {"errors": []})
+        mock_gov_notify_client.send_email_notification.side_effect = [
+            {},
+            HTTPError.create(mock.Mock(response=fake_response)),
+            {},
+            # The failed email is retried on its own
+            {},
+        ]
+        recipients = [
+            "one@example.com",  # /PS-IGNORE
+            "two@example.com",  # /PS-IGNORE
+            "three@example.com",  # /PS-IGNORE
+        ]
+
+        celery_result: EagerResult = send_mailshot_email_batch_task.delay(
+            draft_mailshot.pk, EmailTypes.MAILSHOT, get_importer_site_domain(), recipients
+        )
+        assert celery_result.successful() is True
+
+        sent_to = [c.args[0] for c in mock_gov_notify_client.send_email_notification.call_args_list]
+        assert sent_to == [
+            "one@example.com",  # /PS-IGNORE
+            "two@example.com",  # /PS-IGNORE
+            "two@example.com",  # /PS-IGNORE
+            "three@example.com",  # /PS-IGNORE
+        ]
+        draft_mailshot.refresh_from_db()
+        assert draft_mailshot.email_sent_count == 3
+        assert draft_mailshot.email_failed_count == 0
+
+    def test_send_mailshot_email_batch_task_retries_exhausted(
+        self, draft_mailshot, mock_gov_notify_client, settings
+    ):
+        fake_response = mock.Mock(status_code=400, json=lambda: {"errors": []})
+
+        def send_email_notification(email_address, *args, **kwargs):
+            if email_address == "two@example.com":  # /PS-IGNORE
+                raise HTTPError.create(mock.Mock(response=fake_response))
+
+            return {}
+
+        mock_gov_notify_client.send_email_notification.side_effect = send_email_notification
+        recipients = ["one@example.com", "two@example.com"]  # /PS-IGNORE
+
+        send_mailshot_email_batch_task.delay(
+            draft_mailshot.pk, EmailTypes.MAILSHOT, get_importer_site_domain(), recipients
+        )
+
+        # Sent in the batch then retried until out of retries
+        assert mock_gov_notify_client.send_email_notification.call_count == (
+            2 + 1 + settings.MAIL_TASK_MAX_RETRIES
+        )
+        draft_mailshot.refresh_from_db()
+        assert draft_mailshot.email_sent_count == 1
+        assert draft_mailshot.email_failed_count == 1
+
+    @mock.patch("web.mail.tasks.reserve_gov_notify_sends")
+    @mock.patch("web.mail.tasks.send_mailshot_email_batch")
+    def test_send_mailshot_email_batch_task_throttled(
+        self, mock_send_batch, mock_reserve, draft_mailshot
+    ):
+        mock_reserve.return_value = 30
+
+        with mock.patch.object(send_mailshot_email_batch_task, "retry", side_effect=Retry) as retry:
+            with pytest.raises(Retry):
+                send_mailshot_email_batch_task(
+                    draft_mailshot.pk, EmailTypes.MAILSHOT, get_importer_site_domain(), ["a@b.com"]
+                )
+
+        retry.assert_called_once_with(countdown=30)
+        assert mock_send_batch.called is False
+
+    def test_send_mailshot_email_progress(self, draft_mailshot):
+        draft_mailshot.is_to_importers = True
+        draft_mailshot.status = Mailshot.Statuses.PUBLISHED
+        draft_mailshot.save()
+
+        with mock.patch("web.mail.emails.MAILSHOT_BATCH_SIZE", 2):
+            send_mailshot_email_task.delay(draft_mailshot.pk)
+
+        draft_mailshot.refresh_from_db()
+        assert draft_mailshot.email_recipient_count == 3
+        assert draft_mailshot.email_sent_count == 3
+        assert draft_mailshot.email_failed_count == 0
+
     def test_get_expiring_importers_details_for_section_5_authority(self, section_5_authorities):
         assert get_expiring_importers_details(Section5Authority, self.end_date, None) == [
             {
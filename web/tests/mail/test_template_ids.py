@@ -0,0 +1,68 @@
+import pytest
+from django.core.cache import cache
+
+from web.mail.constants import EmailTypes
+from web.mail.template_ids import (
+    TEMPLATE_IDS_VERSION_KEY,
+    clear_template_ids,
+    get_template_id,
+    invalidate_template_ids,
+)
+from web.models import EmailTemplate
+
+
+@pytest.fixture(autouse=True)
+def _clear_template_ids():
+    clear_template_ids()
+    yield
+    clear_template_ids()
+
+
+def test_get_template_id(db, django_assert_num_queries):
+    template = EmailTemplate.objects.get(name=EmailTypes.APPLICATION_COMPLETE)
+
+    # The template ids are loaded once
+    with django_assert_num_queries(1):
+        assert get_template_id(EmailTypes.APPLICATION_COMPLETE) == template.gov_notify_template_id
+        get_template_id(EmailTypes.APPLICATION_REFUSED)
+        get_template_id(EmailTypes.APPLICATION_COMPLETE)
+
+
+def test_get_template_id_reloaded_when_version_changes(db, django_assert_num_queries):
+    get_template_id(EmailTypes.APPLICATION_COMPLETE)
+
+    # Another process has saved a template
+    cache.set(TEMPLATE_IDS_VERSION_KEY, "new-version", timeout=None)
+
+    with django_assert_num_queries(1):
+        get_template_id(EmailTypes.APPLICATION_COMPLETE)
+        get_template_id(EmailTypes.APPLICATION_COMPLETE)
+
+
+def test_get_template_id_does_not_exist(db):
+    EmailTemplate.objects.filter(name=EmailTypes.APPLICATION_COMPLETE).delete()
+
+    with pytest.raises(EmailTemplate.DoesNotExist):
+        get_template_id(EmailTypes.APPLICATION_COMPLETE)
+
+
+def test_save_email_template(db, django_capture_on_commit_callbacks):
+    template = EmailTemplate.objects.get(name=EmailTypes.APPLICATION_COMPLETE)
+    get_template_id(EmailTypes.APPLICATION_COMPLETE)
+    version = cache.get(TEMPLATE_IDS_VERSION_KEY)
+
+    template.gov_notify_template_id = "a7c5aa9e-5de5-4d23-a1b6-5e5e54b3e1a4"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        template.save()
+
+    assert cache.get(TEMPLATE_IDS_VERSION_KEY) != version
+    assert str(get_template_id(EmailTypes.APPLICATION_COMPLETE)) == template.gov_notify_template_id
+
+
+def test_invalidate_template_ids(db):
+    invalidate_template_ids()
+    version = cache.get(TEMPLATE_IDS_VERSION_KEY)
+
+    invalidate_template_ids()
+    assert cache.get(TEMPLATE_IDS_VERSION_KEY) != version
@@ -0,0 +1,58 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from freezegun import freeze_time
+
+from web.mail.throttle import (
+    DAY_SENDS_KEY,
+    MINUTE_SENDS_KEY,
+    record_gov_notify_sends,
+    reserve_gov_notify_sends,
+)
+
+# 2024-01-01 12:00:15 UTC
+MINUTE_KEY = MINUTE_SENDS_KEY.format(1704110415 // 60)
+DAY_KEY = DAY_SENDS_KEY.format("2024-01-01")
+
+
+@pytest.fixture(autouse=True)
+def clear_sends():
+    cache.delete_many([MINUTE_KEY, DAY_KEY])
+
+    with freeze_time("2024-01-01 12:00:15"):
+        yield
+
+    cache.delete_many([MINUTE_KEY, DAY_KEY])
+
+
+@mock.patch("web.mail.throttle.GOV_NOTIFY_EMAILS_PER_MINUTE", 10)
+def test_reserve_gov_notify_sends_minute_limit():
+    assert reserve_gov_notify_sends(6) == 0
+    assert reserve_gov_notify_sends(4) == 0
+
+    # Wait until the start of the next minute
+    assert reserve_gov_notify_sends(1) == 45
+
+    # Nothing is reserved when the limit would be exceeded
+    assert cache.get(MINUTE_KEY) == 10
+    assert cache.get(DAY_KEY) == 10
+
+
+@mock.patch("web.mail.throttle.GOV_NOTIFY_EMAILS_PER_DAY", 10)
+def test_reserve_gov_notify_sends_day_limit():
+    assert reserve_gov_notify_sends(10) == 0
+
+    # Wait until midnight
+    assert reserve_gov_notify_sends(1) == 12 * 60 * 60 - 15
+
+    assert cache.get(MINUTE_KEY) == 10
+    assert cache.get(DAY_KEY) == 10
+
+
+@mock.patch("web.mail.throttle.GOV_NOTIFY_EMAILS_PER_MINUTE", 10)
+def test_record_gov_notify_sends():
+    record_gov_notify_sends(8)
+
+    assert reserve_gov_notify_sends(3) == 45
+    assert reserve_gov_notify_sends(2) == 0
@@ -0,0 +1,45 @@
+import io
+import json
+
+from django.core.management import call_command
+
+from web.management.commands.benchmark_reports import get_report_interfaces
+from web.models import SILApplication
+
+
+def test_benchmark_reports(ilb_admin_user, importer, tmp_path):
+    output = tmp_path / "reports.json"
+    call_command(
+        "benchmark_reports",
+        "--seed",
+        "6",
+        "--seed-user",
+        ilb_admin_user.username,
+        "--output",
+        str(output),
+        stderr=io.StringIO(),
+    )
+    assert SILApplication.objects.filter(reference__contains="/B").count() == 6
+
+    results = {result["interface"]: result for result in json.loads(output.read_text())}
+    assert list(results) == [interface.name for interface in get_report_interfaces()]
+
+    for name in [
+        "Specific Firearms Licences",
+        "Importer Access Requests",
+        "Exporter Access Requests",
+    ]:
+        result = results[name]
+        assert result["rows"] == 6
+        assert result["errors"] == 0
+        assert result["peak_memory_bytes"] > 0
+        assert result["execution_time_ms"] > 0
+        # The plan includes the buffers used by the query
+        assert "Shared Hit Blocks" in result["plan"]
+
+
+def test_get_report_interfaces():
+    names = [interface.name for interface in get_report_interfaces()]
+    assert len(names) == 12
+    assert "Specific Firearms Licences" in names
+    assert "Active Users" in names
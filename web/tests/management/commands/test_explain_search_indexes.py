@@ -0,0 +1,14 @@
+import io
+
+from django.core.management import call_command
+
+
+def test_explain_search_indexes(db):
+    out = io.StringIO()
+    call_command("explain_search_indexes", "--analyze", stdout=out)
+
+    output = out.getvalue()
+
+    assert "Import case reference (inner wildcard): 'IMA/%3/%3'" in output
+    assert "With search indexes:" in output
+    assert "Without search indexes:" in output
@@ -0,0 +1,21 @@
+import io
+
+from django.core.management import call_command
+
+from web.models import ApplicationSearchRow
+
+
+def test_rebuild_search_rows(completed_dfl_app, wood_app_submitted, completed_com_app):
+    out = io.StringIO()
+    call_command("rebuild_search_rows", "--batch-size", "1", stdout=out)
+
+    assert ApplicationSearchRow.objects.filter(case_type="import").count() == 2
+    assert ApplicationSearchRow.objects.filter(case_type="export").count() == 1
+
+    search_row = ApplicationSearchRow.objects.get(pk=completed_dfl_app.pk)
+    assert search_row.reference == completed_dfl_app.reference
+    assert search_row.status == completed_dfl_app.status
+
+    output = out.getvalue()
+    assert "Rebuilt 2 import application search rows." in output
+    assert "Rebuilt 1 export application search rows." in output
@@ -0,0 +1,55 @@
+from unittest import mock
+
+import pytest
+from botocore.exceptions import ClientError
+from django.utils import timezone
+from freezegun import freeze_time
+
+from web.models import ExporterAccessRequest, ImporterAccessRequest
+from web.tests.helpers import get_s3_file_stream
+
+
+@pytest.fixture
+def report_s3_files():
+    """Patch the S3 functions used to generate reports, returning the stored files keyed by path."""
+
+    files = {}
+    last_modified = {}
+
+    def upload(file_obj, path):
+        files[path] = file_obj.read()
+        last_modified[path] = timezone.now()
+        return len(files[path])
+
+    def get_file_stream(path):
+        if path not in files:
+            raise ClientError({"Error": {"Code": "NoSuchKey"}}, "GetObject")
+
+        return get_s3_file_stream(files[path]) | {"LastModified": last_modified[path]}
+
+    with (
+        mock.patch("web.reports.generate.upload_file_obj_to_s3_in_parts", side_effect=upload),
+        mock.patch("web.reports.generate.get_file_stream_from_s3", side_effect=get_file_stream),
+        mock.patch("web.reports.partitions.upload_file_obj_to_s3_in_parts", side_effect=upload),
+        mock.patch("web.reports.partitions.get_file_stream_from_s3", side_effect=get_file_stream),
+        mock.patch(
+            "web.reports.generate.delete_file_from_s3",
+            side_effect=lambda path, client: files.pop(path),
+        ),
+        mock.patch("web.reports.generate.get_s3_client"),
+    ):
+        yield files
+
+
+@pytest.fixture
+@freeze_time("2021-02-01 12:00:00")
+def approved_importer_access_request(importer_access_request):
+    importer_access_request.response = ImporterAccessRequest.APPROVED
+    importer_access_request.save()
+
+
+@pytest.fixture
+@freeze_time("2021-02-01 12:00:00")
+def approved_exporter_access_request(exporter_access_request):
+    exporter_access_request.response = ExporterAccessRequest.APPROVED
+    exporter_access_request.save()
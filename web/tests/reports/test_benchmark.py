@@ -0,0 +1,78 @@
+import copy
+import time
+from unittest import mock
+
+import pytest
+
+from web.reports.constants import UserDateFilterType
+from web.reports.interfaces import (
+    ActiveStaffUserInterface,
+    ActiveUserInterface,
+    DFLFirearmsLicenceInterface,
+    ExporterAccessRequestInterface,
+    ImporterAccessRequestInterface,
+    ImportLicenceInterface,
+    IssuedCertificateReportInterface,
+    OILFirearmsLicenceInterface,
+    RegisteredUserInterface,
+    SILFirearmsLicenceInterface,
+    SupplementaryFirearmsInterface,
+)
+
+# Number of rows serialized by each benchmark.
+ROW_COUNT = 5000
+
+USER_PARAMETERS = {"date_filter_type": UserDateFilterType.DATE_JOINED}
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    ("interface_class", "fixture_names", "parameters"),
+    [
+        (IssuedCertificateReportInterface, ["completed_gmp_app"], {}),
+        (ImporterAccessRequestInterface, ["approved_importer_access_request"], {}),
+        (ExporterAccessRequestInterface, ["approved_exporter_access_request"], {}),
+        (ImportLicenceInterface, ["completed_dfl_app"], {}),
+        (SupplementaryFirearmsInterface, ["completed_dfl_app_with_supplementary_report"], {}),
+        (DFLFirearmsLicenceInterface, ["completed_dfl_app"], {}),
+        (SILFirearmsLicenceInterface, ["completed_sil_app"], {}),
+        (OILFirearmsLicenceInterface, ["completed_oil_app"], {}),
+        (ActiveUserInterface, ["importer_one_contact"], USER_PARAMETERS),
+        (ActiveStaffUserInterface, ["ilb_admin_two"], USER_PARAMETERS),
+        (RegisteredUserInterface, ["access_request_user"], USER_PARAMETERS),
+    ],
+)
+def test_report_serialization_rows_per_second(
+    interface_class, fixture_names, parameters, request, report_schedule, record_property
+):
+    """Benchmark serializing the rows of a report interface.
+
+    The rows of the interface's queryset are repeated to make up ROW_COUNT rows, so only the time
+    spent serializing the rows is measured. The rows per second are recorded in the test report
+    (e.g. pytest --junitxml) to track the throughput of each interface.
+    """
+
+    for fixture_name in fixture_names:
+        request.getfixturevalue(fixture_name)
+
+    report_schedule.parameters.update(parameters)
+    interface = interface_class(report_schedule)
+    rows = list(interface.get_queryset().iterator())
+    assert rows, "The benchmark needs at least one row to serialize"
+
+    # Rows are copied as some interfaces update the row while serializing it.
+    rows = [copy.deepcopy(row) for _ in range(ROW_COUNT // len(rows)) for row in rows]
+
+    with mock.patch.object(interface, "get_queryset") as mock_get_queryset:
+        mock_get_queryset.return_value.using.return_value.iterator.return_value = rows
+
+        start = time.perf_counter()
+        row_count = sum(1 for _ in interface.iter_rows())
+        elapsed = time.perf_counter() - start
+
+    assert interface.errors == []
+    assert row_count >= len(rows)
+
+    rows_per_second = round(row_count / elapsed)
+    record_property("rows_per_second", rows_per_second)
+    print(f"{interface.name}: {rows_per_second} rows/second")
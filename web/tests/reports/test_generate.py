@@ -1,12 +1,17 @@
 import datetime as dt
+import io
 from unittest import mock
 
+import pyarrow.parquet as pq
 from django.utils import timezone
 from freezegun import freeze_time
+from openpyxl import load_workbook
 
-from web.models import GeneratedReport
+from web.models import GeneratedReport, Report, User
 from web.reports import generate, interfaces
-from web.reports.constants import ReportStatus, UserDateFilterType
+from web.reports.constants import ReportPhase, ReportStatus, ReportType
+from web.reports.serializers import BaseSerializer, ErrorSerializer, datetime_or_empty
+from web.utils.spreadsheet import MIMETYPE
 
 
 @freeze_time("2024-01-01 12:00:00")
@@ -25,16 +30,11 @@ def test_generate_issued_certificate_report(mock_write_files, report_schedule):
 
 @freeze_time("2024-01-01 12:00:00")
 @mock.patch("web.reports.generate.write_files")
-def test_access_request_report(mock_write_files, report_schedule):
+def test_import_licence_report(mock_write_files, report_schedule):
     mock_write_files.return_value = None
-    generate.generate_access_request_report(report_schedule)
+    generate.generate_import_licence_report(report_schedule)
     mock_write_files.called_once_with(
-        [report_schedule],
-        [
-            interfaces.ImporterAccessRequestInterface(report_schedule),
-            interfaces.ExporterAccessRequestInterface(report_schedule),
-            interfaces.AccessRequestTotalsInterface(report_schedule),
-        ],
+        [report_schedule], [interfaces.ImportLicenceInterface(report_schedule)]
     )
     report_schedule.refresh_from_db()
     assert report_schedule.status == ReportStatus.COMPLETED
@@ -42,101 +42,138 @@ def test_access_request_report(mock_write_files, report_schedule):
     assert report_schedule.finished_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
 
 
-@freeze_time("2024-01-01 12:00:00")
-@mock.patch("web.reports.generate.write_files")
-def test_generate_firearms_licences_report(mock_write_files, report_schedule):
-    mock_write_files.return_value = None
-    generate.generate_firearms_licences_report(report_schedule)
-    mock_write_files.called_once_with(
-        [report_schedule],
-        [
-            interfaces.DFLFirearmsLicenceInterface(report_schedule),
-            interfaces.SILFirearmsLicenceInterface(report_schedule),
-            interfaces.OILFirearmsLicenceInterface(report_schedule),
-        ],
-    )
-    report_schedule.refresh_from_db()
-    assert report_schedule.status == ReportStatus.COMPLETED
-    assert report_schedule.started_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
-    assert report_schedule.finished_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
+class FakeReportInterface(interfaces.ReportInterface):
+    name = "Fake Report"
+    ReportFilter = interfaces.BasicReportFilter
 
+    def get_header(self):
+        return ["int", "str", "date"]
 
-@freeze_time("2024-01-01 12:00:00")
-@mock.patch("web.reports.generate.write_files")
-def test_generate_active_users_report(mock_write_files, report_schedule):
-    mock_write_files.return_value = None
-    report_schedule.parameters["date_filter_type"] = UserDateFilterType.DATE_JOINED
-    generate.generate_active_users_report(report_schedule)
-    mock_write_files.called_once_with(
-        [report_schedule],
-        [
-            interfaces.ActiveUserInterface(report_schedule),
-            interfaces.ActiveStaffUserInterface(report_schedule),
-            interfaces.RegisteredUserInterface(report_schedule),
-        ],
-    )
-    report_schedule.refresh_from_db()
-    assert report_schedule.status == ReportStatus.COMPLETED
-    assert report_schedule.started_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
-    assert report_schedule.finished_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
+    def get_queryset(self):
+        return User.objects.all()
 
+    def iter_rows(self):
+        yield {"int": 1, "str": "test", "date": timezone.now()}
+        self.errors.append(
+            ErrorSerializer(
+                report_name=self.name,
+                identifier="ABC/123",
+                error_type="Validation Error",
+                error_message="Field required",
+                column="str",
+                value="",
+            )
+        )
+        yield {"int": 2, "str": "test, two", "date": timezone.now()}
 
-@freeze_time("2024-01-01 12:00:00")
-@mock.patch("web.reports.generate.write_files")
-def test_import_licence_report(mock_write_files, report_schedule):
-    mock_write_files.return_value = None
-    generate.generate_import_licence_report(report_schedule)
-    mock_write_files.called_once_with(
-        [report_schedule], [interfaces.ImportLicenceInterface(report_schedule)]
-    )
-    report_schedule.refresh_from_db()
-    assert report_schedule.status == ReportStatus.COMPLETED
-    assert report_schedule.started_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
-    assert report_schedule.finished_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
 
-
-@mock.patch("web.reports.generate._write_xlsx_file")
-@mock.patch("web.reports.generate._write_csv_file")
-def test_write_files(mock_write_csv, mock_write_xlsx, report_schedule):
-    mock_write_csv.return_value = None
-    mock_write_xlsx.return_value = None
+def test_write_files(report_s3_files, report_schedule):
     importer_report_interface = interfaces.ImporterAccessRequestInterface(report_schedule)
     exporter_report_interface = interfaces.ExporterAccessRequestInterface(report_schedule)
-    generate.write_files(report_schedule, [importer_report_interface, exporter_report_interface])
-    assert mock_write_csv.call_count == 2
-    assert mock_write_xlsx.call_count == 1
+    has_errors = generate.write_files(
+        report_schedule, [importer_report_interface, exporter_report_interface]
+    )
+    assert has_errors is False
+
+    # The closed months of the access requests are cached
+    report_files = [path for path in report_s3_files if "/partitions/" not in path]
+    assert len(report_files) == 3
+
+    generated_reports = GeneratedReport.objects.filter(schedule=report_schedule)
+    assert sorted(generated_reports.values_list("document__filename", flat=True)) == [
+        f"{report_schedule.pk}_Exporter Access Requests--test report.csv",
+        f"{report_schedule.pk}_Importer Access Requests--test report.csv",
+        f"{report_schedule.pk}_Issued_Certificates--test report.xlsx",
+    ]
 
 
 @freeze_time("2024-01-01 12:00:00")
-@mock.patch("web.reports.generate.write_file_data")
-def test_write_csv_file(mock_write_file_data, report_schedule):
-    mock_write_file_data.return_value = None
-    file_data = [{"int": 1, "str": "test", "date": timezone.now()}]
-    generate._write_csv_file(report_schedule, "test-file", file_data, ["int", "str", "date"])
-    assert mock_write_file_data.called is True
-    assert mock_write_file_data.call_args == mock.call(
-        report_schedule,
-        "int,str,date\r\n1,test,2024-01-01 12:00:00+00:00\r\n",
-        "test-file.csv",
-        "application/csv",
+def test_write_files_streams_rows_and_errors(report_s3_files, report_schedule):
+    report_interface = FakeReportInterface(report_schedule)
+    has_errors = generate.write_files(report_schedule, [report_interface])
+    assert has_errors is True
+
+    path = f"REPORTS/{report_schedule.report.pk}/{report_schedule.pk}"
+    assert report_s3_files[f"{path}_Fake Report--test report.csv"] == (
+        b"int,str,date\r\n"
+        b"1,test,2024-01-01 12:00:00+00:00\r\n"
+        b'2,"test, two",2024-01-01 12:00:00+00:00\r\n'
+    )
+    assert report_s3_files[f"{path}_Issued_Certificates_Errors--test report.csv"] == (
+        b"Report Name,Identifier,Error Type,Error Message,Column,Value\r\n"
+        b"Fake Report,ABC/123,Validation Error,Field required,str,\r\n"
     )
 
+    workbook = load_workbook(
+        filename=io.BytesIO(report_s3_files[f"{path}_Issued_Certificates--test report.xlsx"])
+    )
+    assert workbook.sheetnames == ["Fake Report", "Errors"]
+    assert list(workbook["Fake Report"].values) == [
+        ("int", "str", "date"),
+        # Datetimes are written as Excel serial dates
+        (1, "test", 45292.5),
+        (2, "test, two", 45292.5),
+    ]
+    assert list(workbook["Errors"].values) == [
+        ("Report Name", "Identifier", "Error Type", "Error Message", "Column", "Value"),
+        ("Fake Report", "ABC/123", "Validation Error", "Field required", "str", None),
+    ]
 
-@freeze_time("2024-01-01 12:00:00")
-@mock.patch("web.reports.generate.write_file_data")
-def test_write_xlsx_file(mock_write_file_data, report_schedule):
-    mock_write_file_data.return_value = None
-    file_data = [{"int": 1, "str": "test", "date": timezone.now()}]
-    sheet = generate._prepare_workbook_sheet("Sheet 1", file_data, ["int", "str", "date"])
-    sheet_2 = generate._prepare_workbook_sheet("Sheet 2", file_data, ["int", "str", "date"])
-    generate._write_xlsx_file(report_schedule, "test-file", [sheet, sheet_2])
-    assert mock_write_file_data.called is True
-    assert mock_write_file_data.call_args == mock.call(
-        report_schedule,
-        mock.ANY,
-        "test-file.xlsx",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    # Errors are written out as they occur rather than held by the interface
+    assert report_interface.errors == []
+
+    # The progress of the interface and the workbook (errors and xlsx file) is recorded
+    progress = report_schedule.progress.order_by("index")
+    assert list(progress.values_list("index", "name", "rows_processed")) == [
+        (0, "Fake Report", 2),
+        (1, "Workbook", 1),
+    ]
+    assert set(progress[0].timings) == {ReportPhase.CSV, ReportPhase.XLSX, ReportPhase.UPLOAD}
+    assert progress[0].total_rows_estimate is not None
+    assert set(progress[1].timings) == {ReportPhase.CSV, ReportPhase.XLSX, ReportPhase.UPLOAD}
+
+
+class FakeParquetReportSerializer(BaseSerializer):
+    reference: str
+    count: int
+    submitted_datetime: datetime_or_empty
+
+
+class FakeParquetReportInterface(interfaces.ReportInterface):
+    name = "Fake Parquet Report"
+    ReportFilter = interfaces.BasicReportFilter
+    ReportSerializer = FakeParquetReportSerializer
+    PARQUET_OUTPUT = True
+
+    def get_queryset(self):
+        return User.objects.all()
+
+    def iter_rows(self):
+        for i in range(2):
+            row = FakeParquetReportSerializer(
+                reference=f"REF/{i}", count=i, submitted_datetime=dt.datetime(2024, 1, 1, 12)
+            )
+            yield row.model_dump(by_alias=True)
+
+
+def test_write_files_parquet(report_s3_files, report_schedule):
+    report_interface = FakeParquetReportInterface(report_schedule)
+    generate.write_files(report_schedule, [report_interface])
+
+    parquet_file_name = f"{report_schedule.pk}_Fake Parquet Report--test report.parquet"
+    generated_report = GeneratedReport.objects.get(
+        schedule=report_schedule, document__filename=parquet_file_name
     )
+    assert generated_report.document.content_type == MIMETYPE.PARQUET
+
+    parquet_data = report_s3_files[generated_report.document.path]
+    assert pq.read_table(io.BytesIO(parquet_data)).to_pylist() == [
+        {"Reference": "REF/0", "Count": 0, "Submitted Datetime": dt.datetime(2024, 1, 1, 12)},
+        {"Reference": "REF/1", "Count": 1, "Submitted Datetime": dt.datetime(2024, 1, 1, 12)},
+    ]
+
+    progress = report_schedule.progress.get(index=0)
+    assert ReportPhase.PARQUET in progress.timings
 
 
 @mock.patch("web.reports.generate.put_object_in_s3")
@@ -150,3 +187,85 @@ def test_write_file_data(mock_put_object, report_schedule):
     assert report_schedule.status == ReportStatus.SUBMITTED
     assert generated_report.document.file_size == 1234
     assert generated_report.document.filename == "test-file.txt"
+
+
+@freeze_time("2024-01-01 12:00:00")
+def test_start_multi_sheet_report(report_schedule):
+    report_schedule.report = Report.objects.get(report_type=ReportType.FIREARMS_LICENCES)
+    assert generate.start_multi_sheet_report(report_schedule) == 3
+
+    report_schedule.refresh_from_db()
+    assert report_schedule.status == ReportStatus.IN_PROGRESS
+    assert report_schedule.started_at == dt.datetime(2024, 1, 1, 12, 0, 0, tzinfo=dt.UTC)
+
+
+@freeze_time("2024-01-01 12:00:00")
+def test_write_and_merge_report_sheets(report_s3_files, report_schedule):
+    sheets = [
+        generate.write_report_sheet(report_schedule, FakeReportInterface(report_schedule), 0),
+        generate.write_report_sheet(
+            report_schedule, interfaces.ImporterAccessRequestInterface(report_schedule), 1
+        ),
+    ]
+
+    path = f"REPORTS/{report_schedule.report.pk}/{report_schedule.pk}"
+    assert sheets == [
+        {
+            "name": "Fake Report",
+            "header": ["int", "str", "date"],
+            "rows_path": f"REPORTS/{report_schedule.report.pk}/sheets/{report_schedule.pk}_0_rows.jsonl",
+            "errors_path": f"REPORTS/{report_schedule.report.pk}/sheets/{report_schedule.pk}_0_errors.jsonl",
+        },
+        {
+            "name": "Importer Access Requests",
+            "header": mock.ANY,
+            "rows_path": f"REPORTS/{report_schedule.report.pk}/sheets/{report_schedule.pk}_1_rows.jsonl",
+            "errors_path": None,
+        },
+    ]
+    # The CSV file of each sheet is written by the sheet
+    assert report_s3_files[f"{path}_Fake Report--test report.csv"] == (
+        b"int,str,date\r\n"
+        b"1,test,2024-01-01 12:00:00+00:00\r\n"
+        b'2,"test, two",2024-01-01 12:00:00+00:00\r\n'
+    )
+    assert f"{path}_Importer Access Requests--test report.csv" in report_s3_files
+
+    has_errors = generate.merge_report_sheets(report_schedule, sheets)
+    assert has_errors is True
+
+    workbook = load_workbook(
+        filename=io.BytesIO(report_s3_files[f"{path}_Issued_Certificates--test report.xlsx"])
+    )
+    assert workbook.sheetnames == ["Fake Report", "Importer Access Requests", "Errors"]
+    assert list(workbook["Fake Report"].values) == [
+        ("int", "str", "date"),
+        # Datetimes are still written as Excel serial dates after the sheet has been stored
+        (1, "test", 45292.5),
+        (2, "test, two", 45292.5),
+    ]
+    assert list(workbook["Errors"].values) == [
+        ("Report Name", "Identifier", "Error Type", "Error Message", "Column", "Value"),
+        ("Fake Report", "ABC/123", "Validation Error", "Field required", "str", None),
+    ]
+    assert report_s3_files[f"{path}_Issued_Certificates_Errors--test report.csv"] == (
+        b"Report Name,Identifier,Error Type,Error Message,Column,Value\r\n"
+        b"Fake Report,ABC/123,Validation Error,Field required,str,\r\n"
+    )
+
+    # The stored sheet rows are deleted once merged
+    assert not any("/sheets/" in path for path in report_s3_files)
+
+    # The time spent merging each sheet is added to the progress of the sheet
+    progress = report_schedule.progress.order_by("index")
+    assert list(progress.values_list("index", "name", "rows_processed")) == [
+        (0, "Fake Report", 2),
+        (1, "Importer Access Requests", 0),
+        (2, "Workbook", 1),
+    ]
+    assert set(progress[1].timings) == {
+        ReportPhase.QUERY,
+        ReportPhase.SERIALISE,
+        ReportPhase.UPLOAD,
+        ReportPhase.XLSX,
+    }
@@ -0,0 +1,109 @@
+import datetime as dt
+import io
+from unittest import mock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from web.reports.parquet import ReportParquetWriter, get_parquet_schema
+from web.reports.serializers import (
+    BaseSerializer,
+    ImportLicenceSerializer,
+    date_or_empty,
+    datetime_or_empty,
+)
+from web.reports.utils import get_serializer_header
+
+
+class FakeSerializer(BaseSerializer):
+    reference: str
+    count: int
+    year: str | int
+    printable: bool
+    submitted_datetime: datetime_or_empty
+    start_date: date_or_empty
+
+
+HEADER = get_serializer_header(FakeSerializer)
+
+
+def _get_row(reference, submitted_datetime, start_date):
+    row = FakeSerializer(
+        reference=reference,
+        count=1,
+        year=2024,
+        printable=True,
+        submitted_datetime=submitted_datetime,
+        start_date=start_date,
+    )
+    return list(row.model_dump(by_alias=True).values())
+
+
+def test_get_parquet_schema():
+    assert get_parquet_schema(FakeSerializer, HEADER) == pa.schema(
+        [
+            ("Reference", pa.string()),
+            ("Count", pa.int64()),
+            ("Year", pa.string()),
+            ("Printable", pa.bool_()),
+            ("Submitted Datetime", pa.timestamp("s")),
+            ("Start Date", pa.date32()),
+        ]
+    )
+
+
+def test_get_parquet_schema_field_aliases():
+    schema = get_parquet_schema(
+        ImportLicenceSerializer, get_serializer_header(ImportLicenceSerializer)
+    )
+
+    assert schema.field("Case Ref").type == pa.string()
+    assert schema.field("Variation No").type == pa.int64()
+    assert schema.field("Initial Submitted Datetime").type == pa.timestamp("s")
+    assert schema.field("Licence End Date").type == pa.date32()
+
+
+@mock.patch("web.reports.parquet.ROW_GROUP_SIZE", 2)
+def test_report_parquet_writer():
+    output = io.BytesIO()
+    writer = ReportParquetWriter(output, FakeSerializer, HEADER)
+
+    for i in range(3):
+        writer.write_row(
+            _get_row(f"REF/{i}", dt.datetime(2024, 1, 2, 13, 30, i), dt.date(2024, 1, i + 1))
+        )
+
+    writer.write_row(_get_row("REF/3", None, None))
+    writer.close()
+
+    parquet_file = pq.ParquetFile(io.BytesIO(output.getvalue()))
+    assert parquet_file.metadata.num_row_groups == 2
+    assert parquet_file.read().to_pylist() == [
+        {
+            "Reference": f"REF/{i}",
+            "Count": 1,
+            "Year": "2024",
+            "Printable": True,
+            "Submitted Datetime": dt.datetime(2024, 1, 2, 13, 30, i),
+            "Start Date": dt.date(2024, 1, i + 1),
+        }
+        for i in range(3)
+    ] + [
+        {
+            "Reference": "REF/3",
+            "Count": 1,
+            "Year": "2024",
+            "Printable": True,
+            "Submitted Datetime": None,
+            "Start Date": None,
+        }
+    ]
+
+
+def test_report_parquet_writer_no_rows():
+    output = io.BytesIO()
+    ReportParquetWriter(output, FakeSerializer, HEADER).close()
+
+    table = pq.read_table(io.BytesIO(output.getvalue()))
+    assert table.num_rows == 0
+    assert table.column_names == HEADER
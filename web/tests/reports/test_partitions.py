@@ -0,0 +1,184 @@
+import datetime as dt
+
+import pytest
+from django.db.models import Max
+from freezegun import freeze_time
+
+from web.models import ImporterAccessRequest
+from web.reports.constants import DateFilterType, ReportPhase, UserDateFilterType
+from web.reports.interfaces import (
+    ActiveUserInterface,
+    ImporterAccessRequestInterface,
+    ImportLicenceInterface,
+)
+from web.reports.partitions import (
+    PARTITION_CACHE_TTL,
+    DatePartition,
+    get_month_partitions,
+    get_partition_cache_path,
+    iter_report_rows,
+)
+
+
+class PartitionedImporterAccessRequestInterface(ImporterAccessRequestInterface):
+    def is_partitioned(self):
+        return True
+
+    def get_last_updated(self):
+        return ImporterAccessRequest.objects.filter(
+            submit_datetime__date__range=(self.filters.date_from, self.filters.date_to)
+        ).aggregate(last_updated=Max("last_update_datetime"))["last_updated"]
+
+
+class ErrorImporterAccessRequestInterface(PartitionedImporterAccessRequestInterface):
+    def serialize_row(self, ar):
+        raise ValueError("Test error")
+
+
+@pytest.fixture
+def partitioned_report_schedule(report_schedule):
+    report_schedule.parameters["date_from"] = "2021-01-01"
+    report_schedule.parameters["date_to"] = "2021-03-31"
+    return report_schedule
+
+
+def test_get_month_partitions():
+    assert get_month_partitions(dt.date(2024, 1, 15), dt.date(2024, 3, 10)) == [
+        DatePartition(dt.date(2024, 3, 1), dt.date(2024, 3, 10)),
+        DatePartition(dt.date(2024, 2, 1), dt.date(2024, 2, 29)),
+        DatePartition(dt.date(2024, 1, 15), dt.date(2024, 1, 31)),
+    ]
+    assert get_month_partitions(dt.date(2024, 1, 15), dt.date(2024, 1, 15)) == [
+        DatePartition(dt.date(2024, 1, 15), dt.date(2024, 1, 15)),
+    ]
+
+
+def test_date_partition_is_closed():
+    partition = DatePartition(dt.date(2024, 1, 1), dt.date(2024, 1, 31))
+    assert partition.is_closed(dt.date(2024, 3, 31)) is True
+    assert partition.is_closed(dt.date(2024, 3, 30)) is False
+
+
+def test_is_partitioned(report_schedule):
+    # An access request's submit_datetime changes whenever it is saved
+    assert ImporterAccessRequestInterface(report_schedule).is_partitioned() is False
+
+    report_schedule.parameters["date_filter_type"] = UserDateFilterType.LAST_LOGIN
+    assert ActiveUserInterface(report_schedule).is_partitioned() is False
+
+    report_schedule.parameters["date_filter_type"] = DateFilterType.SUBMITTED
+    assert ImportLicenceInterface(report_schedule).is_partitioned() is True
+
+    # Applications can have licences completed in different months
+    report_schedule.parameters["date_filter_type"] = DateFilterType.CLOSED
+    assert ImportLicenceInterface(report_schedule).is_partitioned() is False
+
+
+@freeze_time("2021-05-15 12:00:00")
+def test_iter_report_rows_caches_closed_partitions(
+    report_s3_files, partitioned_report_schedule, approved_importer_access_request
+):
+    interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+    rows = list(iter_report_rows(interface))
+    assert [row["Importer Name"] for row in rows] == ["Import Ltd"]
+
+    # Only the closed months (January and February) are cached
+    january, february, march = (
+        get_partition_cache_path(interface, DatePartition(*partition))
+        for partition in [
+            (dt.date(2021, 1, 1), dt.date(2021, 1, 31)),
+            (dt.date(2021, 2, 1), dt.date(2021, 2, 28)),
+            (dt.date(2021, 3, 1), dt.date(2021, 3, 31)),
+        ]
+    )
+    assert report_s3_files[january] == b""
+    assert february in report_s3_files
+    assert march not in report_s3_files
+
+    # Re-running the report reads the closed months from the cache
+    ImporterAccessRequest.objects.update(organisation_name="Updated Ltd")
+    interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+    assert list(iter_report_rows(interface)) == rows
+    assert ReportPhase.CACHE in interface.timer.timings
+
+
+def test_iter_report_rows_rebuilds_updated_partitions(
+    report_s3_files, partitioned_report_schedule, approved_importer_access_request
+):
+    with freeze_time("2021-05-15 12:00:00") as frozen_time:
+        interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+        list(iter_report_rows(interface))
+
+        # Saving the access request marks the cached month as out of date
+        access_request = ImporterAccessRequest.objects.get()
+        access_request.organisation_name = "Updated Ltd"
+        access_request.save(update_fields=["organisation_name", "last_update_datetime"])
+
+        frozen_time.tick()
+        interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+        rows = list(iter_report_rows(interface))
+        assert [row["Importer Name"] for row in rows] == ["Updated Ltd"]
+
+        # The rebuilt month is cached again
+        ImporterAccessRequest.objects.update(organisation_name="Import Ltd")
+        interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+        assert list(iter_report_rows(interface)) == rows
+
+
+def test_iter_report_rows_rebuilds_expired_partitions(
+    report_s3_files, partitioned_report_schedule, approved_importer_access_request
+):
+    with freeze_time("2021-05-15 12:00:00") as frozen_time:
+        interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+        list(iter_report_rows(interface))
+
+        # Changes to data outside the access requests are found once the cache has expired
+        ImporterAccessRequest.objects.update(organisation_name="Updated Ltd")
+        interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+        assert [row["Importer Name"] for row in iter_report_rows(interface)] == ["Import Ltd"]
+
+        frozen_time.tick(PARTITION_CACHE_TTL)
+        interface = PartitionedImporterAccessRequestInterface(partitioned_report_schedule)
+        assert [row["Importer Name"] for row in iter_report_rows(interface)] == ["Updated Ltd"]
+
+
+@freeze_time("2021-05-15 12:00:00")
+def test_iter_report_rows_caches_errors(
+    report_s3_files, partitioned_report_schedule, approved_importer_access_request
+):
+    interface = ErrorImporterAccessRequestInterface(partitioned_report_schedule)
+    assert list(iter_report_rows(interface)) == []
+    assert len(interface.errors) == 1
+
+    cached_interface = ErrorImporterAccessRequestInterface(partitioned_report_schedule)
+    assert list(iter_report_rows(cached_interface)) == []
+    assert cached_interface.errors == interface.errors
+
+
+def test_partition_cache_path_uses_filters(report_schedule):
+    partition = DatePartition(dt.date(2021, 1, 1), dt.date(2021, 1, 31))
+    report_schedule.parameters["date_filter_type"] = DateFilterType.SUBMITTED
+    report_schedule.parameters["application_type"] = "FA"
+    path = get_partition_cache_path(ImportLicenceInterface(report_schedule), partition)
+    assert path.endswith("/2021-01-01_2021-01-31.jsonl")
+
+    # The date range of the report isn't part of the key
+    report_schedule.parameters["date_to"] = "2030-01-01"
+    assert get_partition_cache_path(ImportLicenceInterface(report_schedule), partition) == path
+
+    report_schedule.parameters["application_type"] = "SPS"
+    assert get_partition_cache_path(ImportLicenceInterface(report_schedule), partition) != path
+
+
+def test_import_licence_last_updated(report_schedule, completed_dfl_app):
+    submit_date = completed_dfl_app.submit_datetime.date()
+    report_schedule.parameters |= {
+        "date_filter_type": DateFilterType.SUBMITTED,
+        "date_from": submit_date.isoformat(),
+        "date_to": submit_date.isoformat(),
+    }
+    interface = ImportLicenceInterface(report_schedule)
+    assert interface.get_last_updated() == completed_dfl_app.last_update_datetime
+
+    next_day = submit_date + dt.timedelta(days=1)
+    assert interface.for_date_range(next_day, next_day).get_last_updated() is None
@@ -0,0 +1,69 @@
+import logging
+from unittest import mock
+
+from web.models import ScheduleReportProgress, User
+from web.reports.constants import ReportPhase
+from web.reports.progress import PhaseTimer, ReportProgress, get_row_estimate
+
+
+@mock.patch("web.reports.progress.time.perf_counter")
+def test_phase_timer_excludes_inner_phases(mock_perf_counter):
+    mock_perf_counter.side_effect = [0, 1, 4, 10]
+    timer = PhaseTimer()
+
+    with timer.time(ReportPhase.SERIALISE):
+        with timer.time(ReportPhase.QUERY):
+            pass
+
+    assert timer.timings == {ReportPhase.QUERY: 3, ReportPhase.SERIALISE: 7}
+
+
+@mock.patch("web.reports.progress.time.perf_counter")
+def test_phase_timer_iter(mock_perf_counter):
+    mock_perf_counter.side_effect = [0, 1, 1, 3, 3, 6]
+    timer = PhaseTimer()
+
+    assert list(timer.iter(ReportPhase.QUERY, ["a", "b"])) == ["a", "b"]
+    assert timer.timings == {ReportPhase.QUERY: 6}
+
+
+def test_report_progress(report_schedule, caplog):
+    timer = PhaseTimer()
+    progress = ReportProgress.start(report_schedule, 0, "Test", timer, User.objects.all())
+    timer.timings[ReportPhase.QUERY] = 1.23456
+
+    progress.add_row()
+    progress.add_row()
+
+    # Progress is only saved every PROGRESS_SAVE_INTERVAL seconds
+    assert ScheduleReportProgress.objects.get(pk=progress.progress.pk).rows_processed == 0
+
+    with caplog.at_level(logging.INFO, logger="web.reports.progress"):
+        progress.finish()
+
+    progress.progress.refresh_from_db()
+    assert progress.progress.rows_processed == 2
+    assert progress.progress.timings == {"QUERY": 1.235}
+    assert progress.progress.get_timings_display() == [("Query", 1.235)]
+
+    assert caplog.records[0].report_progress == {
+        "schedule_report_id": report_schedule.pk,
+        "interface": "Test",
+        "rows_processed": 2,
+        "total_rows_estimate": progress.progress.total_rows_estimate,
+        "timings": {"QUERY": 1.235},
+    }
+
+    # The progress can be resumed by another process
+    resumed = ReportProgress.resume(report_schedule, 0, PhaseTimer())
+    with resumed.timer.time(ReportPhase.XLSX):
+        pass
+
+    resumed.finish()
+    resumed.progress.refresh_from_db()
+    assert set(resumed.progress.timings) == {"QUERY", "XLSX"}
+
+
+def test_get_row_estimate(ilb_admin_user):
+    assert isinstance(get_row_estimate(User.objects.all()), int)
+    assert get_row_estimate(User.objects.none()) is None
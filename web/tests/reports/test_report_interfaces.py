@@ -1,4 +1,5 @@
 import datetime as dt
+from typing import Literal
 
 import pydantic
 import pytest
@@ -35,6 +36,7 @@ from web.reports.interfaces import (
     SILFirearmsLicenceInterface,
     SupplementaryFirearmsInterface,
 )
+from web.reports.rollups import refresh_access_request_totals
 from web.reports.serializers import (
     AccessRequestTotalsReportSerializer,
     DFLFirearmsLicenceSerializer,
@@ -197,13 +199,6 @@ EXPECTED_ACTIVE_STAFF_USER_HEADER = [
 ]
 
 
-@pytest.fixture
-@freeze_time("2021-02-01 12:00:00")
-def approved_importer_access_request(importer_access_request):
-    importer_access_request.response = ImporterAccessRequest.APPROVED
-    importer_access_request.save()
-
-
 @pytest.fixture
 @freeze_time("2021-02-11 12:00:00")
 def refused_importer_access_request(ilb_admin_user):
@@ -224,13 +219,6 @@ def refused_importer_access_request(ilb_admin_user):
     iar.tasks.create(is_active=True, task_type=Task.TaskType.PROCESS)
 
 
-@pytest.fixture
-@freeze_time("2021-02-01 12:00:00")
-def approved_exporter_access_request(exporter_access_request):
-    exporter_access_request.response = ExporterAccessRequest.APPROVED
-    exporter_access_request.save()
-
-
 @pytest.fixture
 @freeze_time("2021-02-11 12:00:00")
 def refused_exporter_access_request(ilb_admin_user):
@@ -268,6 +256,10 @@ class IncorrectTypeImporterAccessRequestReportSerializer(ImporterAccessRequestRe
     request_type: int
 
 
+class ApprovedImporterAccessRequestReportSerializer(ImporterAccessRequestReportSerializer):
+    response: Literal["Approved"]
+
+
 class IncorrectTypeAccessRequestTotalsReportSerializer(AccessRequestTotalsReportSerializer):
     approved_requests: str
 
@@ -504,6 +496,25 @@ class TestImporterAccessRequestInterface:
             ],
         }
 
+    def test_get_errors_only_excludes_invalid_rows(
+        self, approved_importer_access_request, refused_importer_access_request
+    ):
+        # Both rows are validated in one batch, only the invalid row is left out of the results
+        interface = ImporterAccessRequestInterface(self.report_schedule)
+        interface.ReportSerializer = ApprovedImporterAccessRequestReportSerializer
+        data = interface.get_data()
+        assert [row["Response"] for row in data["results"]] == ["Approved"]
+        assert data["errors"] == [
+            {
+                "Error Message": "Input should be 'Approved'",
+                "Error Type": "Validation Error",
+                "Identifier": "iar/2",
+                "Column": "response",
+                "Value": "Refused",
+                "Report Name": "Importer Access Requests",
+            }
+        ]
+
     def test_get_data_results(
         self, approved_importer_access_request, refused_importer_access_request
     ):
@@ -532,6 +543,13 @@ class TestImporterAccessRequestInterface:
             },
         ]
 
+    def test_iter_rows(self, approved_importer_access_request, refused_importer_access_request):
+        interface = ImporterAccessRequestInterface(self.report_schedule)
+        data = interface.get_data()
+        assert list(ImporterAccessRequestInterface(self.report_schedule).iter_rows()) == (
+            data["results"]
+        )
+
 
 class TestExporterAccessRequestInterface:
     @pytest.fixture(autouse=True)
@@ -590,6 +608,7 @@ class TestAccessRequestTotalsInterface:
         refused_importer_access_request,
         refused_exporter_access_request,
     ):
+        refresh_access_request_totals()
         interface = AccessRequestTotalsInterface(self.report_schedule)
         data = interface.get_data()
         assert data == {
@@ -599,6 +618,7 @@ class TestAccessRequestTotalsInterface:
         }
 
     def test_get_errors(self, approved_importer_access_request):
+        refresh_access_request_totals()
         interface = AccessRequestTotalsInterface(self.report_schedule)
         interface.ReportSerializer = IncorrectTypeAccessRequestTotalsReportSerializer
         data = interface.get_data()
@@ -0,0 +1,91 @@
+import datetime as dt
+
+from django.utils import timezone
+from freezegun import freeze_time
+
+from web.models import (
+    AccessRequestDailyTotal,
+    ExporterAccessRequest,
+    ImporterAccessRequest,
+)
+from web.reports.rollups import (
+    get_access_request_totals,
+    refresh_access_request_totals,
+    refresh_recent_access_request_totals,
+)
+
+
+def _get_daily_totals():
+    return list(
+        AccessRequestDailyTotal.objects.order_by("day", "process_type").values_list(
+            "day", "process_type", "response", "total"
+        )
+    )
+
+
+def test_refresh_access_request_totals(
+    approved_importer_access_request, approved_exporter_access_request, importer_access_request
+):
+    # Access requests without a response aren't counted
+    ImporterAccessRequest.objects.create(
+        process_type=ImporterAccessRequest.PROCESS_TYPE,
+        reference="iar/rollup",
+        request_type=ImporterAccessRequest.REQUEST_TYPES[0][0],
+        organisation_name="Test",
+        organisation_address="Test",
+        submitted_by=importer_access_request.submitted_by,
+        last_updated_by=importer_access_request.submitted_by,
+    )
+
+    refresh_access_request_totals()
+
+    assert _get_daily_totals() == [
+        (dt.date(2021, 2, 1), ExporterAccessRequest.PROCESS_TYPE, "APPROVED", 1),
+        (dt.date(2021, 2, 1), ImporterAccessRequest.PROCESS_TYPE, "APPROVED", 1),
+    ]
+
+    # A refresh recalculates the totals rather than adding to them
+    refresh_access_request_totals()
+    assert len(_get_daily_totals()) == 2
+
+
+def test_refresh_recent_access_request_totals(
+    approved_importer_access_request, exporter_access_request
+):
+    refresh_access_request_totals()
+
+    exporter_access_request.response = ExporterAccessRequest.REFUSED
+    exporter_access_request.save()
+    AccessRequestDailyTotal.objects.filter(day__lt="2022-01-01").update(total=10)
+
+    refresh_recent_access_request_totals()
+
+    # Only the recent days are recalculated
+    assert _get_daily_totals() == [
+        (dt.date(2021, 2, 1), ImporterAccessRequest.PROCESS_TYPE, "APPROVED", 10),
+        (timezone.localdate(), ExporterAccessRequest.PROCESS_TYPE, "REFUSED", 1),
+    ]
+
+
+def test_get_access_request_totals(approved_importer_access_request, exporter_access_request):
+    today = timezone.localdate()
+
+    exporter_access_request.response = ExporterAccessRequest.APPROVED
+    exporter_access_request.save()
+    refresh_access_request_totals()
+
+    # Today's totals are counted from the access requests, not the (out of date) daily totals
+    AccessRequestDailyTotal.objects.filter(day=today).delete()
+
+    assert get_access_request_totals(dt.date(2021, 1, 1), today) == {"APPROVED": 2}
+    assert get_access_request_totals(dt.date(2021, 1, 1), dt.date(2021, 12, 31)) == {"APPROVED": 1}
+    assert get_access_request_totals(today, today) == {"APPROVED": 1}
+
+
+@freeze_time("2021-02-02 00:30:00")
+def test_get_access_request_totals_start_of_day(approved_importer_access_request):
+    # The access request was submitted yesterday so isn't counted until the totals are refreshed
+    assert get_access_request_totals(dt.date(2021, 2, 1), dt.date(2021, 2, 2)) == {}
+
+    refresh_access_request_totals()
+    assert get_access_request_totals(dt.date(2021, 2, 1), dt.date(2021, 2, 2)) == {"APPROVED": 1}
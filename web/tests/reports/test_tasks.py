@@ -2,16 +2,18 @@ from unittest import mock
 
 import pytest
 
-from web.models import Report
-from web.reports.constants import ReportType, UserDateFilterType
-from web.reports.tasks import generate_report_task
+from web.models import GeneratedReport, Report
+from web.reports.constants import ReportStatus, ReportType, UserDateFilterType
+from web.reports.generate import MULTI_SHEET_REPORT_INTERFACES
+from web.reports.tasks import generate_report_task, refresh_report_rollups_task
 
 
 def test_report_task(report_schedule):
     for report_type in ReportType:
+        if report_type in MULTI_SHEET_REPORT_INTERFACES:
+            continue
+
         report_schedule.report = Report.objects.get(report_type=report_type)
-        if report_type == ReportType.ACTIVE_USERS:
-            report_schedule.parameters["date_filter_type"] = UserDateFilterType.DATE_JOINED
         report_schedule.save()
         with mock.patch("web.reports.generate.write_files") as mock_write_files:
             mock_write_files.return_value = None
@@ -19,8 +21,48 @@ def test_report_task(report_schedule):
             mock_write_files.assert_called_once()
 
 
+@pytest.mark.parametrize("report_type", list(MULTI_SHEET_REPORT_INTERFACES))
+def test_multi_sheet_report_task(report_type, report_s3_files, report_schedule):
+    report_schedule.report = Report.objects.get(report_type=report_type)
+    if report_type == ReportType.ACTIVE_USERS:
+        report_schedule.parameters["date_filter_type"] = UserDateFilterType.DATE_JOINED
+    report_schedule.save()
+
+    # Each sheet is generated by a task in a chord, then merged by the chord callback
+    generate_report_task(report_schedule.pk)
+
+    report_schedule.refresh_from_db()
+    assert report_schedule.status == ReportStatus.COMPLETED
+    assert report_schedule.errors is False
+
+    file_names = GeneratedReport.objects.filter(schedule=report_schedule).values_list(
+        "document__filename", flat=True
+    )
+    interfaces = MULTI_SHEET_REPORT_INTERFACES[report_type]
+    assert sorted(file_names) == sorted(
+        [f"{report_schedule.pk}_{i.name}--test report.csv" for i in interfaces]
+        + [
+            f"{report_schedule.pk}_{i.name}--test report.parquet"
+            for i in interfaces
+            if i.PARQUET_OUTPUT
+        ]
+        + [f"{report_schedule.pk}_{report_type.title()}--test report.xlsx"]
+    )
+    assert not any("/sheets/" in path for path in report_s3_files)
+
+
 def test_report_task_unsupported(report_schedule):
     report_schedule.report.report_type = "REPORT1"
     report_schedule.report.save()
     with pytest.raises(ValueError, match="Unsupported Report Type"):
         generate_report_task(report_schedule.pk)
+
+
+def test_refresh_report_rollups_task():
+    with mock.patch("web.reports.tasks.refresh_recent_access_request_totals") as mock_recent:
+        refresh_report_rollups_task()
+        mock_recent.assert_called_once_with()
+
+    with mock.patch("web.reports.tasks.refresh_access_request_totals") as mock_all:
+        refresh_report_rollups_task(full=True)
+        mock_all.assert_called_once_with()
@@ -1,11 +1,16 @@
+import datetime as dt
+import decimal
+
 import pytest
 
 from web.reports.constants import ReportType
 from web.reports.utils import (
+    dumps_typed_json,
     format_parameters_used,
     get_error_serializer_header,
     get_report_objects_for_user,
     get_variation_number,
+    loads_typed_json,
 )
 
 
@@ -136,3 +141,18 @@ def test_get_report_objects_for_nca_admin_user(nca_admin_user):
 def test_get_report_objects_for_ho_admin_user(ho_admin_user):
     queryset = get_report_objects_for_user(ho_admin_user)
     assert set(queryset.values_list("report_type", flat=True)) == set()
+
+
+def test_typed_json_round_trip():
+    values = [
+        1,
+        "test",
+        None,
+        dt.datetime(2024, 1, 1, 12, 0, tzinfo=dt.UTC),
+        dt.date(2024, 1, 2),
+        dt.time(13, 30),
+        decimal.Decimal("1.50"),
+        {"name": "test"},
+    ]
+
+    assert loads_typed_json(dumps_typed_json(values)) == values
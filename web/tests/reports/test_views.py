@@ -6,12 +6,13 @@ from pytest_django.asserts import assertContains, assertNotContains, assertTempl
 from web.models import File, GeneratedReport
 from web.reports.constants import (
     DateFilterType,
+    ReportPhase,
     ReportStatus,
     ReportType,
     UserDateFilterType,
 )
 from web.reports.models import Report, ScheduleReport
-from web.tests.helpers import CaseURLS
+from web.tests.helpers import CaseURLS, get_s3_file_stream
 
 
 @pytest.fixture
@@ -84,6 +85,22 @@ def test_run_history_view(ilb_admin_client, report_schedule, deleted_report_sche
     assertTemplateUsed(response, "web/domains/reports/run-history-view.html")
 
 
+def test_run_history_view_progress(ilb_admin_client, report_schedule):
+    report_schedule.progress.create(
+        index=0,
+        name="Issued Certificates",
+        rows_processed=1500,
+        total_rows_estimate=2000,
+        timings={ReportPhase.QUERY: 1.5, ReportPhase.SERIALISE: 2.25},
+    )
+    report = get_report_model(ReportType.ISSUED_CERTIFICATES)
+    response = ilb_admin_client.get(CaseURLS.run_history_view(report.pk))
+    assert response.status_code == 200
+    assertContains(response, "<strong>Issued Certificates:</strong> 1500")
+    assertContains(response, "of ~2000 rows")
+    assertContains(response, "Query 1.5s, Serialise 2.25s")
+
+
 @pytest.mark.parametrize(
     "report_type,post_data",
     (
@@ -297,12 +314,12 @@ def test_report_delete_view(ilb_admin_client, report_schedule):
     assert report_schedule.status == ReportStatus.DELETED
 
 
-@mock.patch("web.reports.views.get_file_from_s3")
+@mock.patch("web.domains.file.utils.get_file_stream_from_s3")
 def test_download_report_view(
     mock_get_file_from_s3, ilb_admin_client, report_schedule, ilb_admin_user
 ):
     file_data = b"testdata"
-    mock_get_file_from_s3.return_value = file_data
+    mock_get_file_from_s3.return_value = get_s3_file_stream(file_data)
     document = File.objects.create(
         is_active=True,
         filename="test.csv",
@@ -320,5 +337,5 @@ def test_download_report_view(
     )
     assert response.status_code == 200
     assert mock_get_file_from_s3.called is True
-    assert response.content == file_data
+    assert response.getvalue() == file_data
     assert response.headers["Content-Disposition"] == 'attachment; filename="test.csv"'
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+
+from web.utils.pdf import browser
+from web.utils.pdf.browser import BrowserPool
+
+
+@pytest.fixture
+def mock_playwright():
+    with mock.patch("web.utils.pdf.browser.sync_playwright") as sync_playwright:
+        playwright = sync_playwright.return_value.start.return_value
+        playwright.chromium.launch.side_effect = lambda **kwargs: mock.Mock(
+            **{"is_connected.return_value": True}
+        )
+
+        yield playwright
+
+
+@pytest.fixture
+def pool():
+    pool = BrowserPool(max_renders=10)
+
+    yield pool
+
+    pool.close()
+
+
+def test_browser_reused_between_renders(mock_playwright, pool):
+    for _ in range(3):
+        pool.html_to_pdf("<html>test</html>")
+
+    assert mock_playwright.chromium.launch.call_count == 1
+
+    # Each document is rendered in a new context
+    browser = pool._browser
+    assert browser.new_context.call_count == 3
+    assert browser.new_context.return_value.close.call_count == 3
+
+
+def test_browser_runs_on_dedicated_thread(mock_playwright, pool):
+    start_threads = []
+    mock_playwright.chromium.launch.side_effect = lambda **kwargs: start_threads.append(
+        threading.current_thread()
+    ) or mock.Mock(**{"is_connected.return_value": True})
+
+    pool.html_to_pdf("<html>test</html>")
+
+    assert start_threads[0] is not threading.current_thread()
+
+    # Playwright never runs an event loop on the calling thread (Django would refuse ORM calls)
+    with pytest.raises(RuntimeError):
+        asyncio.get_running_loop()
+
+
+def test_browser_recycled_after_max_renders(mock_playwright):
+    pool = BrowserPool(max_renders=2)
+
+    for _ in range(5):
+        pool.html_to_pdf("<html>test</html>")
+
+    assert mock_playwright.chromium.launch.call_count == 3
+    assert pool.render_count == 1
+
+    pool.close()
+
+
+def test_browser_relaunched_after_crash(mock_playwright, pool):
+    pool.html_to_pdf("<html>test</html>")
+    crashed_browser = pool._browser
+    crashed_browser.is_connected.return_value = False
+
+    pool.html_to_pdf("<html>test</html>")
+    assert pool._browser is not crashed_browser
+
+    assert mock_playwright.chromium.launch.call_count == 2
+
+
+def test_browser_closed_when_render_crashes_browser(mock_playwright, pool):
+    def set_content(html):
+        pool._browser.is_connected.return_value = False
+        raise RuntimeError("Target closed")
+
+    mock_playwright.chromium.launch.side_effect = lambda **kwargs: mock.Mock(
+        **{
+            "is_connected.return_value": True,
+            "new_context.return_value.new_page.return_value.set_content.side_effect": set_content,
+        }
+    )
+
+    with pytest.raises(RuntimeError):
+        pool.html_to_pdf("<html>test</html>")
+
+    assert pool._browser is None
+    mock_playwright.stop.assert_called_once()
+
+
+def test_playwright_stopped_when_launch_fails(mock_playwright, pool):
+    mock_playwright.chromium.launch.side_effect = RuntimeError("Executable doesn't exist")
+
+    with pytest.raises(RuntimeError):
+        pool.html_to_pdf("<html>test</html>")
+
+    mock_playwright.stop.assert_called_once()
+    assert pool._playwright is None
+
+
+def test_close_stops_browser_thread(mock_playwright, pool):
+    pool.html_to_pdf("<html>test</html>")
+    closed_browser = pool._browser
+
+    pool.close()
+
+    closed_browser.close.assert_called_once()
+    mock_playwright.stop.assert_called_once()
+    assert pool._executor is None
+
+
+def test_browser_not_shared_with_forked_process(mock_playwright, pool):
+    pool.html_to_pdf("<html>test</html>")
+    parent_browser = pool._browser
+
+    with mock.patch("web.utils.pdf.browser.os.getpid", return_value=-1):
+        pool.html_to_pdf("<html>test</html>")
+        assert pool._browser is not parent_browser
+
+    # The parent's browser is left alone
+    parent_browser.close.assert_not_called()
+
+
+def test_one_browser_pool_per_process(settings):
+    settings.PDF_BROWSER_MAX_RENDERS = 10
+    pools = []
+
+    with (
+        mock.patch.object(browser, "_pool", None),
+        mock.patch.object(browser.atexit, "register") as register,
+    ):
+        threads = [
+            threading.Thread(target=lambda: pools.append(browser.get_browser_pool()))
+            for _ in range(3)
+        ]
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+    assert len(pools) == 3
+    assert pools[0] is pools[1] is pools[2]
+    register.assert_called_once_with(pools[0].close)
@@ -4,6 +4,7 @@ import io
 import logging
 from unittest.mock import patch
 
+import fitz
 import pytest
 from cryptography import x509
 from cryptography.hazmat import backends
@@ -11,11 +12,18 @@ from cryptography.hazmat.primitives.serialization import pkcs12
 from django.conf import settings
 from django.test import override_settings
 from endesive.pdf import verify
+from PIL import Image
 
+from web.models import Signature
 from web.types import DocumentTypes
+from web.utils.pdf import signer
 from web.utils.pdf.exceptions import SignatureTextNotFound
 from web.utils.pdf.generator import PdfGenBase
-from web.utils.pdf.signer import sign_pdf
+from web.utils.pdf.signer import (
+    get_active_signature_image,
+    load_p12_certificate,
+    sign_pdf,
+)
 
 
 def test_dummy_certificate_details():
@@ -97,6 +105,29 @@ def test_sign_pdf(
     assert verification == [(True, True, False)]
 
 
+@pytest.mark.django_db
+@patch("web.utils.pdf.signer.get_signature_file_bytes")
+def test_sign_pdf_with_active_signature_image(mock_get_signature_file_bytes, active_signature):
+    image_file = io.BytesIO()
+    Image.new("RGBA", size=(50, 50), color=(255, 0, 0)).save(image_file, "PNG")
+    mock_get_signature_file_bytes.return_value = image_file.getvalue()
+    signer._signature_image_bytes.clear()
+
+    pdf_file = fitz.open()
+    page = pdf_file.new_page()
+    page.insert_text((72, 72), "Signed by Test Signatory")
+    page.insert_text((72, 144), "On behalf of the Secretary of State")
+    pdf_bytes = pdf_file.tobytes()
+
+    # Sign twice so the second document uses the cached signature image
+    for _ in range(2):
+        signed_pdf = sign_pdf(io.BytesIO(pdf_bytes))
+
+        assert verify(signed_pdf.getvalue()) == [(True, True, False)]
+
+    mock_get_signature_file_bytes.assert_called_once_with(active_signature)
+
+
 @patch("web.utils.pdf.generator.PdfGenBase.get_document_html")
 def test_no_signature_placeholder(mock_get_document_html):
     mock_get_document_html.return_value = "<html><p>Some text</p></html>"
@@ -104,3 +135,51 @@ def test_no_signature_placeholder(mock_get_document_html):
     PdfGenBase(doc_type=DocumentTypes.LICENCE_PREVIEW).get_pdf(target=target)
     with pytest.raises(SignatureTextNotFound):
         sign_pdf(target)
+
+
+def test_load_p12_certificate_cached():
+    key_and_certificate = load_p12_certificate(
+        settings.P12_SIGNATURE_BASE_64, settings.P12_SIGNATURE_PASSWORD
+    )
+
+    assert key_and_certificate[1] is not None
+    assert key_and_certificate is load_p12_certificate(
+        settings.P12_SIGNATURE_BASE_64, settings.P12_SIGNATURE_PASSWORD
+    )
+
+
+@pytest.mark.django_db
+@patch("web.utils.pdf.signer.get_signature_file_bytes")
+def test_get_active_signature_image_cached(mock_get_signature_file_bytes, active_signature):
+    image_file = io.BytesIO()
+    Image.new("RGB", size=(50, 50), color=(255, 0, 0)).save(image_file, "JPEG")
+    mock_get_signature_file_bytes.return_value = image_file.getvalue()
+    signer._signature_image_bytes.clear()
+
+    image = get_active_signature_image()
+    assert image.size == (50, 50)
+    assert image.format == "JPEG"
+
+    # The image is only fetched from s3 once
+    assert get_active_signature_image() is not image
+    mock_get_signature_file_bytes.assert_called_once_with(active_signature)
+
+    # Activating a different signature fetches the new image
+    active_signature.is_active = False
+    active_signature.save()
+
+    new_signature = Signature.objects.create(
+        is_active=True,
+        filename="new_signature.jpg",
+        content_type="image/jpeg",
+        file_size=image_file.tell(),
+        path="signatures/new_signature.jpg",
+        created_by=active_signature.created_by,
+        name="New Signature",
+        signatory="New Signatory",
+        history="",
+    )
+    get_active_signature_image()
+
+    assert mock_get_signature_file_bytes.call_count == 2
+    mock_get_signature_file_bytes.assert_called_with(new_signature)
@@ -1,7 +1,10 @@
 import datetime as dt
 import io
+from unittest import mock
 
 import pytest
+from django.db import connection, transaction
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.timezone import make_aware
 from openpyxl import load_workbook
@@ -11,11 +14,14 @@ from web.domains.case.models import ApplicationBase, DocumentPackBase
 from web.domains.case.services import document_pack
 from web.domains.case.shared import ImpExpStatus
 from web.models import (
+    ApplicationSearchRow,
+    CaseDocumentReference,
     CaseEmail,
     CertificateOfFreeSaleApplication,
     CommodityGroup,
     Country,
     DFLChecklist,
+    ExportApplication,
     ExportApplicationType,
     FurtherInformationRequest,
     ImportApplication,
@@ -28,6 +34,7 @@ from web.models.shared import FirearmCommodity, YesNoChoices
 from web.tests.helpers import CaseURLS
 from web.utils.search import (
     SearchTerms,
+    api,
     get_search_results_spreadsheet,
     search_applications,
     types,
@@ -128,6 +135,128 @@ def test_order_and_limit_works(importer_one_fixture_data):
     )
 
 
+def test_keyset_pagination_works(importer_one_fixture_data):
+    for i in range(1, 6):
+        Build.wood_application(f"wood app {i}", importer_one_fixture_data)
+
+    terms = SearchTerms(case_type="import")
+    user = importer_one_fixture_data.ilb_admin_user
+
+    page_one = search_applications(terms, user, limit=2)
+    assert page_one.total_rows == 5
+    check_application_references(page_one.records, "wood app 5", "wood app 4")
+
+    page_two = search_applications(terms, user, limit=2, cursor=page_one.next_cursor)
+    assert page_two.total_rows == 5
+    check_application_references(page_two.records, "wood app 3", "wood app 2")
+
+    # The cursor survives being passed in a url
+    cursor = types.SearchCursor.decode(page_two.next_cursor.encode())
+    page_three = search_applications(terms, user, limit=2, cursor=cursor)
+    check_application_references(page_three.records, "wood app 1")
+    assert page_three.next_cursor is None
+
+
+def test_total_rows_counted_once_per_search(importer_one_fixture_data, monkeypatch):
+    for i in range(1, 4):
+        Build.wood_application(f"wood app {i}", importer_one_fixture_data)
+
+    terms = SearchTerms(case_type="import")
+    user = importer_one_fixture_data.ilb_admin_user
+    get_total_rows = mock.Mock(wraps=api._get_total_rows)
+    monkeypatch.setattr(api, "_get_total_rows", get_total_rows)
+
+    pages = list(api.iter_search_results(terms, user, page_size=1))
+
+    assert len(pages) == 3
+    assert [page.total_rows for page in pages] == [3, 3, 3]
+    get_total_rows.assert_called_once()
+
+    # A later page uses the total passed in rather than counting again
+    page_two = search_applications(
+        terms, user, limit=1, cursor=pages[0].next_cursor, total=types.SearchTotal(10, True)
+    )
+    assert page_two.total_rows == 10
+    assert page_two.total_rows_capped is True
+    get_total_rows.assert_called_once()
+
+
+def test_search_total_encode_decode():
+    assert types.SearchTotal.decode(types.SearchTotal(5).encode()) == (5, False)
+    assert types.SearchTotal.decode(types.SearchTotal(1000, True).encode()) == (1000, True)
+    assert types.SearchTotal.decode("") is None
+    assert types.SearchTotal.decode("abc") is None
+    assert types.SearchTotal.decode("-1") is None
+
+
+def test_search_cursor_decode_invalid_value():
+    assert types.SearchCursor.decode("") is None
+    assert types.SearchCursor.decode("not-a-date_1") is None
+    assert types.SearchCursor.decode("2024-01-01T00:00:00+00:00_abc") is None
+    # Naive datetimes are rejected
+    assert types.SearchCursor.decode("2024-01-01T00:00:00_5") is None
+
+
+def test_total_rows_capped(importer_one_fixture_data, monkeypatch):
+    monkeypatch.setattr(api, "SEARCH_TOTAL_ROWS_CAP", 2)
+
+    for i in range(1, 4):
+        Build.wood_application(f"wood app {i}", importer_one_fixture_data)
+
+    terms = SearchTerms(case_type="import")
+    user = importer_one_fixture_data.ilb_admin_user
+
+    results = search_applications(terms, user)
+    assert results.total_rows == 2
+    assert results.total_rows_capped is True
+    assert len(results.records) == 3
+
+    results = search_applications(terms, user, exact_total=True)
+    assert results.total_rows == 3
+    assert results.total_rows_capped is False
+
+
+@pytest.mark.parametrize(
+    "field,pattern,expected",
+    [
+        ("reference", "%", Q()),
+        ("reference", "IMA/2024/", Q(reference__istartswith="IMA/2024/")),
+        ("reference", "IMA/2024/%%", Q(reference__istartswith="IMA/2024/")),
+        ("reference", "IMA/%3/%3", Q(reference__ilike="IMA/%3/%3%")),
+        ("reference", "%/0001", Q(reference__ilike="%/0001%")),
+        ("reference", "IMA_2024", Q(reference__ilike="IMA_2024%")),
+        ("contact__first_name", "john", Q(contact__first_name__ilike="john%")),
+    ],
+)
+def test_get_wildcard_filter(field, pattern, expected):
+    assert api.get_wildcard_filter(field, pattern) == expected
+
+
+@pytest.mark.parametrize(
+    "model,field,pattern,index_name",
+    [
+        (ImportApplication, "reference", "IMA/%3/%3", "IA_search_ref_trgm_idx"),
+        (ImportApplication, "reference", "IMA/2024/", "IA_search_ref_upper_idx"),
+        (ExportApplication, "reference", "%/0001", "EA_search_ref_trgm_idx"),
+        (CaseDocumentReference, "reference", "GBSIL%123", "CDR_search_ref_trgm_idx"),
+        (CaseDocumentReference, "reference", "GBSIL", "CDR_search_ref_upper_idx"),
+        (User, "first_name", "%ohn", "USER_first_name_trgm_idx"),
+        (User, "last_name", "%mit%", "USER_last_name_trgm_idx"),
+    ],
+)
+def test_wildcard_filter_uses_search_index(db, model, field, pattern, index_name):
+    qs = model.objects.filter(api.get_wildcard_filter(field, pattern)).values("pk")
+
+    # The test tables are tiny so stop Postgres preferring a sequential scan.
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = qs.explain()
+
+    assert index_name in plan
+
+
 def test_derogation_commodity_details_correct(importer_one_fixture_data):
     app = Build.derogation_application("derogation app 1", importer_one_fixture_data)
 
@@ -1588,6 +1717,128 @@ def test_can_search_by_issued_date(ilb_admin_user, completed_dfl_app, completed_
     check_application_references(results.records, completed_sil_app.applicant_reference)
 
 
+@pytest.mark.parametrize("user_fixture", ["ilb_admin_user", "importer_one_contact"])
+def test_search_rows_match_application_data(
+    request, user_fixture, completed_dfl_app, wood_app_submitted
+):
+    user = request.getfixturevalue(user_fixture)
+    terms = SearchTerms(case_type="import")
+
+    # No search rows so the results are loaded from the application tables
+    expected = search_applications(terms, user)
+    assert len(expected.records) == 2
+    assert ApplicationSearchRow.objects.count() == 0
+
+    api.refresh_search_rows([completed_dfl_app.pk, wood_app_submitted.pk])
+    assert ApplicationSearchRow.objects.count() == 2
+
+    assert search_applications(terms, user) == expected
+
+
+@pytest.mark.parametrize("user_fixture", ["ilb_admin_user", "exporter_one_contact"])
+def test_export_search_rows_match_application_data(
+    request, user_fixture, completed_com_app, completed_gmp_app
+):
+    user = request.getfixturevalue(user_fixture)
+    terms = SearchTerms(case_type="export")
+
+    expected = search_applications(terms, user)
+    assert len(expected.records) == 2
+
+    api.refresh_search_rows([completed_com_app.pk, completed_gmp_app.pk])
+    assert ApplicationSearchRow.objects.count() == 2
+
+    assert search_applications(terms, user) == expected
+
+
+def test_search_uses_search_rows(ilb_admin_user, completed_dfl_app):
+    api.refresh_search_rows([completed_dfl_app.pk])
+
+    search_row = ApplicationSearchRow.objects.get(pk=completed_dfl_app.pk)
+    search_row.result_data["applicant_details"]["organisation_name"] = "Projected Importer"
+    search_row.save()
+
+    results = search_applications(SearchTerms(case_type="import"), ilb_admin_user)
+    assert results.records[0].applicant_details.organisation_name == "Projected Importer"
+
+
+def test_search_row_refreshed_on_save(wood_app_submitted, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        wood_app_submitted.status = ImpExpStatus.PROCESSING
+        wood_app_submitted.save()
+
+    search_row = ApplicationSearchRow.objects.get(pk=wood_app_submitted.pk)
+    assert search_row.status == ImpExpStatus.PROCESSING
+    assert search_row.result_data["case_status"]["status"] == "Processing"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        document_pack.pack_draft_archive(wood_app_submitted)
+
+    assert (
+        ApplicationSearchRow.objects.get(pk=wood_app_submitted.pk).updated_at
+        > search_row.updated_at
+    )
+
+
+def test_search_row_not_refreshed_when_search_fields_unchanged(
+    wood_app_submitted, django_capture_on_commit_callbacks
+):
+    app = ImportApplication.objects.get(pk=wood_app_submitted.pk)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        app.refuse_reason = "Not shown in the search results"
+        app.save()
+
+    assert callbacks == []
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        app.status = ImpExpStatus.PROCESSING
+        app.save()
+
+    assert len(callbacks) == 1
+
+
+def test_search_rows_refreshed_when_linked_records_change(
+    completed_dfl_app, django_capture_on_commit_callbacks
+):
+    api.refresh_search_rows([completed_dfl_app.pk])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        importer = completed_dfl_app.importer
+        importer.name = "Renamed Importer"
+        importer.save()
+
+        contact = User.objects.get(pk=completed_dfl_app.contact_id)
+        contact.last_name = "Renamed"
+        contact.save()
+
+    result_data = ApplicationSearchRow.objects.get(pk=completed_dfl_app.pk).result_data
+    assert result_data["applicant_details"]["organisation_name"] == "Renamed Importer"
+    assert result_data["applicant_details"]["application_contact"] == contact.full_name
+
+    cdr = CaseDocumentReference.objects.get(
+        import_application_licences__import_application=completed_dfl_app,
+        document_type=CaseDocumentReference.Type.LICENCE,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        cdr.reference = "GBSIL9999997X"
+        cdr.save()
+
+    result_data = ApplicationSearchRow.objects.get(pk=completed_dfl_app.pk).result_data
+    assert result_data["case_status"]["licence_reference"] == "GBSIL9999997X (Electronic)"
+
+
+def test_search_rows_not_refreshed_on_login(ilb_admin_user, django_capture_on_commit_callbacks):
+    user = User.objects.get(pk=ilb_admin_user.pk)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        user.last_login = dt.datetime.now(tz=dt.UTC)
+        user.save(update_fields=["last_login"])
+
+    assert callbacks == []
+
+
 class TestImporterSearchPermissions:
     @pytest.fixture(autouse=True)
     def setup(
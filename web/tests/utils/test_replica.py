@@ -0,0 +1,94 @@
+import time
+from unittest import mock
+
+import pytest
+
+from web.models import User
+from web.utils.replica import (
+    ReplicaRouter,
+    get_replica_db_alias,
+    read_your_writes,
+    request_read_your_writes,
+    set_read_your_writes,
+    use_replica,
+)
+
+
+def test_get_replica_db_alias(replica_db):
+    assert get_replica_db_alias() == "test_replica"
+
+    with read_your_writes():
+        assert get_replica_db_alias() == "default"
+
+
+def test_get_replica_db_alias_no_replica():
+    assert get_replica_db_alias() == "default"
+
+
+def test_router_reads(replica_db):
+    router = ReplicaRouter()
+    assert router.db_for_read(User) == "default"
+
+    with use_replica():
+        assert router.db_for_read(User) == "test_replica"
+
+        # Reads that need to see recent writes go to the default database
+        with read_your_writes():
+            assert router.db_for_read(User) == "default"
+
+        assert router.db_for_read(User) == "test_replica"
+
+    assert router.db_for_read(User) == "default"
+
+
+def test_router_reads_no_replica():
+    with use_replica():
+        assert ReplicaRouter().db_for_read(User) == "default"
+
+
+def test_router_writes_and_migrations(replica_db):
+    router = ReplicaRouter()
+
+    with use_replica():
+        assert router.db_for_write(User) == "default"
+
+    assert router.allow_migrate("default", "web") is True
+    assert router.allow_migrate("test_replica", "web") is False
+
+
+def test_read_your_writes_decorator(replica_db):
+    @read_your_writes()
+    def task():
+        with use_replica():
+            return User.objects.all().db
+
+    assert task() == "default"
+
+
+@pytest.mark.django_db(databases=["default", "test_replica"])
+def test_read_your_writes_reads_recent_writes(replica_db):
+    # The test replica can't see the user as it hasn't been committed
+    user = User.objects.create(username="replica-test")
+
+    with use_replica():
+        assert not User.objects.filter(pk=user.pk).exists()
+
+        with read_your_writes():
+            assert User.objects.filter(pk=user.pk).exists()
+
+
+def test_request_read_your_writes(rf, replica_db):
+    request = rf.get("/")
+    request.session = {}
+
+    with request_read_your_writes(request):
+        assert get_replica_db_alias() == "test_replica"
+
+    set_read_your_writes(request)
+
+    with request_read_your_writes(request):
+        assert get_replica_db_alias() == "default"
+
+    with mock.patch("web.utils.replica.time.time", return_value=time.time() + 60):
+        with request_read_your_writes(request):
+            assert get_replica_db_alias() == "test_replica"
@@ -1,27 +1,34 @@
+import io
+from unittest import mock
 from unittest.mock import MagicMock
 
+import pytest
+from botocore.exceptions import ClientError, EndpointConnectionError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import override_settings
+from oracledb import lob
 
 from web.utils import s3 as s3_web
 
 
+def _fake_upload_part(**kwargs):
+    # Parts are uploaded concurrently so the ETag is derived from the part rather than call order.
+    return {"ETag": f"MyETag{kwargs['PartNumber']}"}
+
+
 @override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
 def test_upload_file_obj_to_s3_in_parts():
     fake_file = SimpleUploadedFile("test_file.txt", b"file_content")
     fake_client = MagicMock(
         create_multipart_upload=MagicMock(return_value={"UploadId": "x12345"}),
-        upload_part=MagicMock(
-            side_effect=[{"ETag": "MyETag1"}, {"ETag": "MyETag2"}, {"ETag": "MyETag3"}]
-        ),
-        head_object=MagicMock(return_value={"ContentLength": 44444}),
+        upload_part=MagicMock(side_effect=_fake_upload_part),
     )
 
     s3_web.FILE_CHUNK_SIZE = 5
     actual_content_length = s3_web.upload_file_obj_to_s3_in_parts(
         fake_file, "test_file.txt", fake_client
     )
-    assert actual_content_length == 44444
+    assert actual_content_length == 12
     fake_client.create_multipart_upload.assert_called_with(
         Bucket="Fake-Bucket", Key="test_file.txt"
     )
@@ -47,18 +54,125 @@ def test_upload_file_obj_to_s3_in_parts():
             ]
         },
     )
-    fake_client.head_object.assert_called_with(Bucket="Fake-Bucket", Key="test_file.txt")
+    fake_client.head_object.assert_not_called()
+    fake_client.abort_multipart_upload.assert_not_called()
 
 
 @override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
-def test_upload_file_obj():
+def test_upload_file_obj_to_s3_in_parts_from_lob():
+    file_content = b"file_content"
+    fake_lob = MagicMock(spec=lob.LOB)
+    # LOB offsets start at 1
+    fake_lob.read.side_effect = lambda offset, size: file_content[offset - 1 : offset - 1 + size]
+    fake_client = MagicMock(
+        create_multipart_upload=MagicMock(return_value={"UploadId": "x12345"}),
+        upload_part=MagicMock(side_effect=_fake_upload_part),
+    )
+
+    actual_content_length = s3_web.upload_file_obj_to_s3_in_parts(
+        fake_lob, "test_file.txt", fake_client, part_size=5, max_concurrency=2
+    )
+
+    assert actual_content_length == 12
+    assert fake_lob.read.call_args_list == [mock.call(1, 5), mock.call(6, 5), mock.call(11, 5)]
+    parts = fake_client.complete_multipart_upload.call_args.kwargs["MultipartUpload"]["Parts"]
+    assert [part["PartNumber"] for part in parts] == [1, 2, 3]
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
+def test_upload_file_obj_to_s3_in_parts_retries_part():
     fake_file = SimpleUploadedFile("test_file.txt", b"file_content")
     fake_client = MagicMock(
-        head_object=MagicMock(return_value={"ContentLength": 44444}),
+        create_multipart_upload=MagicMock(return_value={"UploadId": "x12345"}),
+        upload_part=MagicMock(
+            side_effect=[EndpointConnectionError(endpoint_url="https://s3"), {"ETag": "MyETag1"}]
+        ),
+    )
+
+    actual_content_length = s3_web.upload_file_obj_to_s3_in_parts(
+        fake_file, "test_file.txt", fake_client, part_size=20
+    )
+
+    assert actual_content_length == 12
+    assert fake_client.upload_part.call_count == 2
+    fake_client.complete_multipart_upload.assert_called_once()
+    fake_client.abort_multipart_upload.assert_not_called()
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
+def test_upload_file_obj_to_s3_in_parts_aborted_on_failure():
+    fake_file = SimpleUploadedFile("test_file.txt", b"file_content")
+    error = ClientError({"Error": {"Code": "InternalError"}}, "UploadPart")
+    fake_client = MagicMock(
+        create_multipart_upload=MagicMock(return_value={"UploadId": "x12345"}),
+        upload_part=MagicMock(side_effect=error),
+    )
+
+    with pytest.raises(ClientError):
+        s3_web.upload_file_obj_to_s3_in_parts(fake_file, "test_file.txt", fake_client, part_size=20)
+
+    assert fake_client.upload_part.call_count == s3_web.S3_UPLOAD_PART_ATTEMPTS
+    fake_client.complete_multipart_upload.assert_not_called()
+    fake_client.abort_multipart_upload.assert_called_once_with(
+        Bucket="Fake-Bucket", Key="test_file.txt", UploadId="x12345"
     )
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
+def test_upload_file_obj():
+    fake_file = SimpleUploadedFile("test_file.txt", b"file_content")
+    fake_client = MagicMock()
     actual_content_length = s3_web.upload_file_obj_to_s3(fake_file, "test_file.txt", fake_client)
-    assert actual_content_length == 44444
+    assert actual_content_length == 12
     fake_client.upload_fileobj.assert_called_with(
         fake_file, Bucket="Fake-Bucket", Key="test_file.txt"
     )
+    fake_client.head_object.assert_not_called()
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
+def test_upload_file_obj_not_seekable():
+    fake_file = MagicMock(**{"seekable.return_value": False})
+    fake_client = MagicMock(
+        head_object=MagicMock(return_value={"ContentLength": 44444}),
+    )
+    actual_content_length = s3_web.upload_file_obj_to_s3(fake_file, "test_file.txt", fake_client)
+    assert actual_content_length == 44444
     fake_client.head_object.assert_called_with(Bucket="Fake-Bucket", Key="test_file.txt")
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
+def test_upload_file_obj_partially_read():
+    fake_file = io.BytesIO(b"file_content")
+    fake_file.read(5)
+    fake_client = MagicMock()
+
+    actual_content_length = s3_web.upload_file_obj_to_s3(fake_file, "test_file.txt", fake_client)
+    assert actual_content_length == 7
+    assert fake_file.tell() == 5
+
+
+@override_settings(AWS_STORAGE_BUCKET_NAME="Fake-Bucket")
+def test_put_object_in_s3():
+    fake_client = MagicMock()
+
+    assert s3_web.put_object_in_s3(b"file_content", "test_file.txt", fake_client) == 12
+    assert s3_web.put_object_in_s3("caf\u00e9", "test_file.txt", fake_client) == 5
+    fake_client.head_object.assert_not_called()
+
+
+@override_settings(
+    AWS_REGION="eu-west-2", AWS_ACCESS_KEY_ID="test-key", AWS_SECRET_ACCESS_KEY="test-secret"
+)
+def test_get_s3_client_is_shared():
+    with mock.patch.object(s3_web, "_s3_clients", {}):
+        client = s3_web.get_s3_client()
+
+        assert s3_web.get_s3_client() is client
+        assert client.meta.config.max_pool_connections == s3_web.S3_MAX_POOL_CONNECTIONS
+
+        with override_settings(AWS_REGION="eu-west-1"):
+            assert s3_web.get_s3_client() is not client
+
+        with mock.patch("web.utils.s3.os.getpid", return_value=-1):
+            assert s3_web.get_s3_client() is not client
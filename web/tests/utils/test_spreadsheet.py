@@ -2,7 +2,12 @@ import io
 
 from openpyxl import load_workbook
 
-from web.utils.spreadsheet import XlsxSheetConfig, generate_xlsx_file
+from web.utils.spreadsheet import (
+    XlsxSheetConfig,
+    generate_xlsx_file,
+    write_csv_file,
+    write_xlsx_file,
+)
 
 
 def test_generate_xlsx_spreadsheet():
@@ -43,3 +48,30 @@ def test_generate_xlsx_template():
     assert cols == 3
     assert rows == 1
     assert list(header) == header_data
+
+
+def test_write_xlsx_file_from_generator():
+    config = XlsxSheetConfig()
+    config.header.data = ["Text", "Number", "Empty", "Formula"]
+    config.rows = (["R%s" % i, i, None, "=1+1"] for i in range(3))
+    output = io.BytesIO()
+
+    write_xlsx_file(output, [config])
+
+    sheet = load_workbook(filename=io.BytesIO(output.getvalue()))["Sheet1"]
+    assert list(sheet.values) == [
+        ("Text", "Number", "Empty", "Formula"),
+        ("R0", 0, None, "=1+1"),
+        ("R1", 1, None, "=1+1"),
+        ("R2", 2, None, "=1+1"),
+    ]
+    # Strings are written as text, not converted to formulas
+    assert sheet["D2"].data_type == "s"
+
+
+def test_write_csv_file():
+    output = io.BytesIO()
+
+    write_csv_file(output, ["H1", "H2"], (["R%sC1" % i, i] for i in range(2)))
+
+    assert output.getvalue().decode() == "H1,H2\r\nR0C1,0\r\nR1C1,1\r\n"
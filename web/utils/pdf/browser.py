@@ -0,0 +1,203 @@
+import atexit
+import contextlib
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from typing import Any, Protocol
+
+from django.conf import settings
+from playwright.sync_api import Browser, Page, Playwright, sync_playwright
+
+
+class _Executor(Protocol):
+    def submit(self, fn: Callable[..., Any], /, *args: Any) -> Future[Any]: ...
+
+    def shutdown(self, wait: bool = True) -> None: ...
+
+
+class _BrowserThread:
+    """Run jobs one at a time on a dedicated daemon thread."""
+
+    def __init__(self) -> None:
+        self._jobs: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="pdf-browser", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any) -> Future[Any]:
+        future: Future[Any] = Future()
+        self._jobs.put((future, fn, args))
+
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._jobs.put(None)
+
+        if wait:
+            self._thread.join()
+
+    def _run(self) -> None:
+        while (job := self._jobs.get()) is not None:
+            future, fn, args = job
+
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+
+class BrowserPool:
+    """A headless Chromium browser kept running between PDF renders.
+
+    Launching Chromium takes several hundred milliseconds, so the browser is reused for every
+    document and each document is rendered in a fresh browser context. The browser is relaunched
+    after `max_renders` documents (to limit memory growth) or when it has crashed.
+
+    The Playwright sync API runs an event loop on the thread that started it (and Django refuses
+    ORM calls from a thread running an event loop), so the browser is owned by a dedicated thread
+    and documents are rendered by handing jobs to that thread. Use `get_browser_pool` to get the
+    pool of the current process.
+    """
+
+    def __init__(self, max_renders: int) -> None:
+        self.max_renders = max_renders
+        self.render_count = 0
+
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._executor: _Executor | None = None
+
+        # Only used by the browser thread
+        self._playwright: Playwright | None = None
+        self._browser: Browser | None = None
+
+    def html_to_pdf(self, document_html: str) -> bytes:
+        """Render the supplied HTML as an A4 PDF on the browser thread."""
+
+        return self._submit(self._render, document_html).result()
+
+    def close(self) -> None:
+        """Close the browser and stop the browser thread, both are started again when next used."""
+
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+            # A forked process (e.g. a Celery worker) doesn't have the parent's browser thread.
+            if executor and self._pid == os.getpid():
+                with contextlib.suppress(Exception):
+                    executor.submit(self._close_browser).result()
+
+                executor.shutdown(wait=False)
+
+            self._reset()
+
+    def _submit(self, fn: Callable[..., Any], *args: Any) -> Future[Any]:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+
+            if self._executor is None:
+                self._executor = _start_browser_thread()
+
+            return self._executor.submit(fn, *args)
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        self._executor = None
+        self._playwright = None
+        self._browser = None
+        self.render_count = 0
+
+    def _render(self, document_html: str) -> bytes:
+        with self._new_page() as page:
+            page.set_content(document_html)
+
+            return page.pdf(format="A4")
+
+    @contextlib.contextmanager
+    def _new_page(self) -> Iterator[Page]:
+        """Yield a page in a new browser context, closed once the document is rendered."""
+
+        browser = self._get_browser()
+        context = browser.new_context()
+
+        try:
+            yield context.new_page()
+        finally:
+            if browser.is_connected():
+                context.close()
+
+            self.render_count += 1
+
+            if self.render_count >= self.max_renders or not browser.is_connected():
+                self._close_browser()
+
+    def _get_browser(self) -> Browser:
+        if self._browser and not self._browser.is_connected():
+            self._close_browser()
+
+        if not self._browser:
+            self._playwright = sync_playwright().start()
+
+            try:
+                self._browser = self._playwright.chromium.launch(headless=True)
+            except Exception:
+                self._close_browser()
+                raise
+
+        return self._browser
+
+    def _close_browser(self) -> None:
+        with contextlib.suppress(Exception):
+            if self._browser:
+                self._browser.close()
+
+        with contextlib.suppress(Exception):
+            if self._playwright:
+                self._playwright.stop()
+
+        self._playwright = None
+        self._browser = None
+        self.render_count = 0
+
+
+def _start_browser_thread() -> _Executor:
+    # gevent workers patch threading to run "threads" as greenlets on the calling thread, so use
+    # the gevent thread pool to get a native thread (waiting for it still yields to other greenlets).
+    with contextlib.suppress(ImportError):
+        from gevent import monkey
+
+        if monkey.is_module_patched("threading"):
+            from gevent.threadpool import ThreadPoolExecutor
+
+            return ThreadPoolExecutor(max_workers=1)
+
+    return _BrowserThread()
+
+
+_pool: BrowserPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the browser pool of the current process."""
+
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(max_renders=settings.PDF_BROWSER_MAX_RENDERS)
+            atexit.register(_pool.close)
+
+    return _pool
+
+
+def html_to_pdf(document_html: str) -> bytes:
+    """Render the supplied HTML as an A4 PDF using the browser pool."""
+
+    return get_browser_pool().html_to_pdf(document_html)
@@ -4,14 +4,13 @@ from typing import Any
 
 from django.conf import settings
 from django.template.loader import render_to_string
-from playwright.sync_api import sync_playwright
 
 from web.domains.case.types import DocumentPack, ImpOrExp
 from web.flow.models import ProcessTypes
 from web.models import Country
 from web.types import DocumentTypes
 
-from . import pages, utils
+from . import browser, pages, utils
 
 
 @dataclass
@@ -25,14 +24,7 @@ class PdfGenBase:
         :return: None if target is supplied else bytes
         """
         document_html = self.get_document_html()
-        with sync_playwright() as playwright:
-            browser = playwright.chromium.launch(headless=True)
-            context = browser.new_context()
-            page = context.new_page()
-            page.set_content(document_html)
-
-            pdf_data = page.pdf(format="A4")
-
+        pdf_data = browser.html_to_pdf(document_html)
         pdf_data = self.format_pages(pdf_data)
 
         if target:
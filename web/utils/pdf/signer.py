@@ -1,10 +1,13 @@
 import base64
 import datetime as dt
+import functools
 import io
 import logging
 
 import fitz
+from cryptography import x509
 from cryptography.hazmat import backends
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
 from cryptography.hazmat.primitives.serialization import pkcs12
 from django.conf import settings
 from endesive.pdf import cms
@@ -15,15 +18,43 @@ from web.utils.pdf.exceptions import SignatureTextNotFound
 
 logger = logging.getLogger(__name__)
 
+# The image file of the active signature keyed by the signature pk and s3 path.
+_signature_image_bytes: dict[tuple[int, str], bytes] = {}
+
 
 def get_active_signature_image() -> Image.Image:
-    """Fetch the active signature image from s3 and return as a PIL Image object
+    """Return the active signature image as a PIL Image object
+
+    The image is only fetched from s3 when a different signature becomes active.
 
     :return: PIL Image object
     """
     active_signature = get_active_signature()
-    active_signature_bytes = get_signature_file_bytes(active_signature)
-    return Image.open(io.BytesIO(active_signature_bytes))
+    key = (active_signature.pk, active_signature.path)
+
+    if key not in _signature_image_bytes:
+        # Only the active signature is kept.
+        _signature_image_bytes.clear()
+        _signature_image_bytes[key] = get_signature_file_bytes(active_signature)
+
+    # Each signed document opens its own image from the cached file (endesive needs the image
+    # format, which a copy of an opened image doesn't have).
+    return Image.open(io.BytesIO(_signature_image_bytes[key]))
+
+
+@functools.cache
+def load_p12_certificate(
+    p12_signature_base_64: str, password: str
+) -> tuple[PrivateKeyTypes | None, x509.Certificate | None, list[x509.Certificate]]:
+    """Load the private key and certificate chain from a base64 encoded p12 bundle.
+
+    Cached as the bundle only changes when the settings change.
+    """
+    return pkcs12.load_key_and_certificates(
+        base64.b64decode(p12_signature_base_64),  # /PS-IGNORE
+        password=password.encode(),
+        backend=backends.default_backend(),
+    )
 
 
 def get_signature_coordinates(
@@ -84,10 +115,8 @@ def sign_pdf(target: io.BytesIO) -> io.BytesIO:
         return target
 
     # load the base64 encoded p12 certificate into memory
-    loaded_p12_certificate = pkcs12.load_key_and_certificates(
-        base64.b64decode(settings.P12_SIGNATURE_BASE_64),  # /PS-IGNORE
-        password=settings.P12_SIGNATURE_PASSWORD.encode(),
-        backend=backends.default_backend(),
+    loaded_p12_certificate = load_p12_certificate(
+        settings.P12_SIGNATURE_BASE_64, settings.P12_SIGNATURE_PASSWORD
     )
 
     pdf_file = fitz.open("pdf", pdf_bytes)
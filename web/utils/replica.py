@@ -0,0 +1,113 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.http import HttpRequest
+
+# Database alias of the (optional) read replica of the default database.
+REPLICA_DB_ALIAS = "replica"
+
+# Seconds a user's reads are sent to the default database after they have written data,
+# comfortably longer than the replica lags behind the default database.
+READ_YOUR_WRITES_SECONDS = 10
+READ_YOUR_WRITES_SESSION_KEY = "read_your_writes_until"
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+_read_your_writes: ContextVar[bool] = ContextVar("read_your_writes", default=False)
+
+
+@contextmanager
+def use_replica() -> Iterator[None]:
+    """Send reads inside the with statement block to the read replica (if there is one).
+
+    Usage:
+        with use_replica():
+            records = list(ApplicationSearchRow.objects.filter(...))
+    """
+
+    token = _use_replica.set(True)
+
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+@contextmanager
+def read_your_writes() -> Iterator[None]:
+    """Send every read inside the with statement block to the default database.
+
+    The replica lags behind the default database, use this when a view or task needs to read
+    data it has just written (e.g. to search for a case it has just updated).
+    """
+
+    token = _read_your_writes.set(True)
+
+    try:
+        yield
+    finally:
+        _read_your_writes.reset(token)
+
+
+def set_read_your_writes(request: HttpRequest) -> None:
+    """Send the reads of the user's next requests to the default database.
+
+    Call after a write the user is about to search for (e.g. before redirecting to the search
+    results), the request that searches must read inside request_read_your_writes().
+    """
+
+    request.session[READ_YOUR_WRITES_SESSION_KEY] = time.time() + READ_YOUR_WRITES_SECONDS
+
+
+@contextmanager
+def request_read_your_writes(request: HttpRequest) -> Iterator[None]:
+    """Apply read_your_writes() to the block if the user has just written data.
+
+    Usage:
+        with request_read_your_writes(request):
+            results = search_applications(terms, request.user)
+    """
+
+    if request.session.get(READ_YOUR_WRITES_SESSION_KEY, 0) > time.time():
+        with read_your_writes():
+            yield
+    else:
+        yield
+
+
+def get_replica_db_alias() -> str:
+    """Return the database alias read-heavy queries should use.
+
+    Querysets that are read lazily (e.g. in a generator) should be pinned to this alias with
+    queryset.using() rather than relying on use_replica() still being active when they are read.
+    """
+
+    if REPLICA_DB_ALIAS in settings.DATABASES and not _read_your_writes.get():
+        return REPLICA_DB_ALIAS
+
+    return DEFAULT_DB_ALIAS
+
+
+class ReplicaRouter:
+    """Routes reads inside a use_replica() block to the read replica, everything else to default."""
+
+    def db_for_read(self, model: type[Model], **hints: Any) -> str:
+        if _use_replica.get():
+            return get_replica_db_alias()
+
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model: type[Model], **hints: Any) -> str:
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        # The replica is a copy of the default database
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        return db == DEFAULT_DB_ALIAS
@@ -1,15 +1,21 @@
+import io
 import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from operator import itemgetter
 from typing import IO, TYPE_CHECKING, Any, Optional
 
 import boto3
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from django.conf import settings
 from oracledb import lob
 
 if TYPE_CHECKING:
     from mypy_boto3_s3 import Client as S3Client
     from mypy_boto3_s3 import ServiceResource as S3Resource
-    from mypy_boto3_s3.type_defs import CompletedPartTypeDef
+    from mypy_boto3_s3.type_defs import CompletedPartTypeDef, GetObjectOutputTypeDef
 
 from web.utils.sentry import capture_exception
 
@@ -18,6 +24,21 @@ logger = logging.getLogger(__name__)
 
 FILE_CHUNK_SIZE = 5 * 1024**2
 
+# Size of the chunks read from s3 when streaming a file download.
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Size of the connection pool of the shared S3 client (the botocore default is 10).
+S3_MAX_POOL_CONNECTIONS = 50
+
+# Number of parts uploaded at the same time by upload_file_obj_to_s3_in_parts.
+S3_UPLOAD_MAX_CONCURRENCY = 8
+
+# Number of attempts made to upload each part of a multipart upload.
+S3_UPLOAD_PART_ATTEMPTS = 3
+
+_s3_clients: dict[tuple[Any, ...], "S3Client"] = {}
+_s3_clients_lock = threading.Lock()
+
 
 def _get_s3_extra_kwargs() -> dict[str, Any]:
     extra_kwargs = {}
@@ -32,11 +53,43 @@ def _get_s3_extra_kwargs() -> dict[str, Any]:
 
 
 def get_s3_client() -> "S3Client":
-    """Get an S3 client."""
-    return boto3.client(
+    """Get the S3 client shared by the current process.
+
+    boto3 clients are thread-safe, so the client is created once per process and reused. This
+    avoids resolving credentials and opening a new TLS connection each time S3 is called.
+    """
+
+    extra_kwargs = _get_s3_extra_kwargs()
+    # Key on the settings as well as the pid so overridden settings (e.g. in tests) are respected
+    # and a forked process never uses the connections of its parent.
+    key = (os.getpid(), settings.AWS_REGION, *sorted(extra_kwargs.items()))
+
+    client = _s3_clients.get(key)
+
+    if client is None:
+        with _s3_clients_lock:
+            client = _s3_clients.get(key)
+
+            if client is None:
+                client = _create_s3_client(extra_kwargs)
+                _s3_clients.clear()
+                _s3_clients[key] = client
+
+    return client
+
+
+def _create_s3_client(extra_kwargs: dict[str, Any]) -> "S3Client":
+    # The default boto3 session is not thread-safe, so create the client from a new session.
+    session = boto3.session.Session()
+
+    return session.client(
         "s3",
         region_name=settings.AWS_REGION,
-        **_get_s3_extra_kwargs(),
+        config=Config(
+            max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+            retries={"max_attempts": 3, "mode": "standard"},
+        ),
+        **extra_kwargs,
     )
 
 
@@ -67,6 +120,21 @@ def get_file_from_s3(path: str, client: Optional["S3Client"] = None) -> bytes:
     return contents
 
 
+def get_file_stream_from_s3(
+    path: str, client: Optional["S3Client"] = None, **get_object_kwargs: Any
+) -> "GetObjectOutputTypeDef":
+    """Get an object in S3 without reading the contents.
+
+    The contents can be streamed from the returned "Body" and get_object_kwargs can be used to
+    request a byte range (Range) or to make the request conditional (IfNoneMatch etc).
+    """
+
+    if not client:
+        client = get_s3_client()
+
+    return client.get_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=path, **get_object_kwargs)
+
+
 def delete_file_from_s3(path: str, client: Optional["S3Client"] = None) -> None:
     """Delete object in S3."""
 
@@ -83,46 +151,102 @@ def upload_file_obj_to_s3(file_obj: IO[Any], key: str, client: Optional["S3Clien
     if not client:
         client = get_s3_client()
 
+    file_size = _get_file_obj_size(file_obj)
+
     client.upload_fileobj(file_obj, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
 
-    object_meta = client.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    if file_size is None:
+        object_meta = client.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+        file_size = object_meta["ContentLength"]
+
+    return file_size
 
-    return object_meta["ContentLength"]
+
+def _get_file_obj_size(file_obj: IO[Any] | lob.LOB) -> int | None:
+    """Return the number of bytes left to read from a file object, if it can be determined."""
+
+    if isinstance(file_obj, lob.LOB):
+        return file_obj.size()
+
+    if not file_obj.seekable():
+        return None
+
+    position = file_obj.tell()
+    end = file_obj.seek(0, io.SEEK_END)
+    file_obj.seek(position)
+
+    return end - position
 
 
 def upload_file_obj_to_s3_in_parts(
-    file_obj: IO[Any] | lob.LOB, key: str, client: Optional["S3Client"] = None
+    file_obj: IO[Any] | lob.LOB,
+    key: str,
+    client: Optional["S3Client"] = None,
+    part_size: int | None = None,
+    max_concurrency: int = S3_UPLOAD_MAX_CONCURRENCY,
 ) -> int:
-    """Upload file obj to s3 in chunks and return the size of the file (bytes)."""
+    """Upload file obj to s3 in chunks and return the size of the file (bytes).
+
+    Parts of `part_size` bytes (FILE_CHUNK_SIZE by default) are read from the file in order and
+    uploaded by up to `max_concurrency` threads. The multipart upload is aborted if a part can't
+    be uploaded, so incomplete parts aren't left in the bucket.
+    """
 
     if not client:
         client = get_s3_client()
 
+    if part_size is None:
+        part_size = FILE_CHUNK_SIZE
+
     response = client.create_multipart_upload(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
     upload_id = response["UploadId"]
 
-    parts_info: list["CompletedPartTypeDef"] = _upload_file_parts_to_s3(
-        file_obj, key, upload_id, client
-    )
+    try:
+        parts_info, file_size = _upload_file_parts_to_s3(
+            file_obj, key, upload_id, client, part_size, max_concurrency
+        )
 
-    client.complete_multipart_upload(
-        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-        Key=key,
-        UploadId=upload_id,
-        MultipartUpload={"Parts": parts_info},
-    )
+        client.complete_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts_info},
+        )
+    except Exception:
+        logger.warning("Aborting multipart upload of %s to S3.", key)
+        _abort_multipart_upload(key, upload_id, client)
+        raise
 
-    object_meta = client.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    return file_size
 
-    return object_meta["ContentLength"]
 
+def _abort_multipart_upload(key: str, upload_id: str, client: "S3Client") -> None:
+    try:
+        client.abort_multipart_upload(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key, UploadId=upload_id
+        )
+    except (BotoCoreError, ClientError):
+        # The upload failure is re-raised by the caller, record this one as well.
+        capture_exception()
 
-def _upload_file_parts_to_s3(
-    file_obj: IO[Any] | lob.LOB, key: str, upload_id: str, client: "S3Client"
-) -> list["CompletedPartTypeDef"]:
-    """Uploads file data to s3 in chunks and returns the parts information returned by S3 after each request.
 
-    Chunks are set to 5MiB which is the minimum file size supported by multipart upload.
+def _upload_file_parts_to_s3(
+    file_obj: IO[Any] | lob.LOB,
+    key: str,
+    upload_id: str,
+    client: "S3Client",
+    part_size: int,
+    max_concurrency: int,
+) -> tuple[list["CompletedPartTypeDef"], int]:
+    """Uploads file data to s3 in chunks.
+
+    Returns the parts information returned by S3 after each request and the size of the file (bytes).
+
+    Chunks are read sequentially (a LOB can only be read by one thread) and uploaded concurrently.
+    No more than `max_concurrency` chunks are held in memory at once.
+
+    Chunks must be at least 5MiB (except the last) which is the minimum part size supported by
+    multipart upload.
     https://docs.aws.amazon.com/AmazonS3/latest/userguide/qfacts.html
     """
     offset = 0
@@ -131,10 +255,48 @@ def _upload_file_parts_to_s3(
         offset = 1
 
     parts_info: list["CompletedPartTypeDef"] = []
+    pending: set[Future["CompletedPartTypeDef"]] = set()
     part_number = 1
+    file_size = 0
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        try:
+            while True:
+                data = _get_file_chunk(file_obj, offset, part_size)
+                if data:
+                    if len(pending) >= max_concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        parts_info.extend(future.result() for future in done)
+
+                    pending.add(
+                        executor.submit(
+                            _upload_file_part_to_s3, data, key, upload_id, part_number, client
+                        )
+                    )
+                    file_size += _get_data_size(data)
+                if len(data) < part_size:
+                    break
+                offset += len(data)
+                part_number += 1
+
+            parts_info.extend(future.result() for future in pending)
+        except Exception:
+            # Don't upload parts that haven't been started, the upload is going to be aborted.
+            executor.shutdown(cancel_futures=True)
+            raise
+
+    return sorted(parts_info, key=itemgetter("PartNumber")), file_size
+
+
+def _upload_file_part_to_s3(
+    data: str | bytes, key: str, upload_id: str, part_number: int, client: "S3Client"
+) -> "CompletedPartTypeDef":
+    """Uploads a part of a multipart upload, retrying the part if the request fails."""
+
+    attempt = 1
+
     while True:
-        data = _get_file_chunk(file_obj, offset)
-        if data:
+        try:
             part = client.upload_part(
                 Bucket=settings.AWS_STORAGE_BUCKET_NAME,
                 Key=key,
@@ -142,20 +304,25 @@ def _upload_file_parts_to_s3(
                 UploadId=upload_id,
                 PartNumber=part_number,
             )
-            parts_info.append({"PartNumber": part_number, "ETag": part["ETag"]})
-        if len(data) < FILE_CHUNK_SIZE:
-            break
-        offset += len(data)
-        part_number += 1
-    return parts_info
 
+            return {"PartNumber": part_number, "ETag": part["ETag"]}
 
-def _get_file_chunk(file_obj: IO[Any] | lob.LOB, offset: int) -> str | bytes:
+        except (BotoCoreError, ClientError):
+            if attempt >= S3_UPLOAD_PART_ATTEMPTS:
+                raise
+
+            logger.warning(
+                "Retrying upload of part %s of %s to S3 (attempt %s).", part_number, key, attempt
+            )
+            attempt += 1
+
+
+def _get_file_chunk(file_obj: IO[Any] | lob.LOB, offset: int, size: int) -> str | bytes:
     """Reads a chunk from a file object."""
     if isinstance(file_obj, lob.LOB):
-        return file_obj.read(offset, FILE_CHUNK_SIZE)
+        return file_obj.read(offset, size)
     file_obj.seek(offset)
-    return file_obj.read(FILE_CHUNK_SIZE)
+    return file_obj.read(size)
 
 
 def put_object_in_s3(file_data: str | bytes, key: str, client: Optional["S3Client"] = None) -> int:
@@ -166,9 +333,13 @@ def put_object_in_s3(file_data: str | bytes, key: str, client: Optional["S3Clien
 
     client.put_object(Body=file_data, Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
 
-    object_meta = client.head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    return _get_data_size(file_data)
+
+
+def _get_data_size(data: str | bytes) -> int:
+    """Return the size (bytes) of data uploaded to s3, str data is encoded as utf-8 by botocore."""
 
-    return object_meta["ContentLength"]
+    return len(data.encode()) if isinstance(data, str) else len(data)
 
 
 def create_presigned_url(key: str, expiration: int = 60 * 60) -> str | None:
@@ -3,15 +3,23 @@ from .api import (
     get_import_status_choices,
     get_search_results_spreadsheet,
     get_wildcard_filter,
+    iter_search_results,
+    refresh_search_rows,
     search_applications,
+    write_search_results_spreadsheet,
 )
-from .types import SearchTerms
+from .types import SearchCursor, SearchTerms, SearchTotal
 
 __all__ = [
+    "SearchCursor",
     "SearchTerms",
+    "SearchTotal",
     "get_export_status_choices",
     "get_import_status_choices",
     "get_search_results_spreadsheet",
     "get_wildcard_filter",
+    "iter_search_results",
+    "refresh_search_rows",
     "search_applications",
+    "write_search_results_spreadsheet",
 ]
@@ -1,8 +1,8 @@
 import datetime as dt
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Collection, Iterable, Iterator
 from operator import attrgetter
-from typing import Any
+from typing import IO, Any
 
 from django.db import models
 from django.db.models import Model, QuerySet
@@ -13,6 +13,7 @@ from web.domains.case.models import DocumentPackBase
 from web.domains.case.shared import ImpExpStatus
 from web.flow.models import ProcessTypes
 from web.models import (
+    ApplicationSearchRow,
     CaseDocumentReference,
     CaseEmail,
     Commodity,
@@ -27,40 +28,152 @@ from web.models import (
 )
 from web.models.shared import FirearmCommodity, YesNoChoices
 from web.utils import datetime_format
-from web.utils.spreadsheet import XlsxSheetConfig, generate_xlsx_file
+from web.utils.replica import use_replica
+from web.utils.spreadsheet import XlsxSheetConfig, generate_xlsx_file, write_xlsx_file
 
-from . import app_data, types, utils
+from . import app_data, projection, types, utils
 from .actions import get_export_record_actions, get_import_record_actions
 
+# Number of records shown on a page of search results.
+SEARCH_PAGE_SIZE = 200
+
+# Stop counting matching records after this many have been found.
+SEARCH_TOTAL_ROWS_CAP = 1000
+
 
 def search_applications(
-    terms: types.SearchTerms, user: User, limit: int = 200
+    terms: types.SearchTerms,
+    user: User,
+    limit: int | None = None,
+    *,
+    cursor: types.SearchCursor | None = None,
+    exact_total: bool = False,
+    total: types.SearchTotal | None = None,
 ) -> types.SearchResults:
     """Main search function used to find applications.
 
-    Return records matching the supplied search terms.
+    Return a page of records matching the supplied search terms.
+
+    :param terms: Search terms
+    :param user: User performing the search
+    :param limit: Maximum number of records to return (defaults to SEARCH_PAGE_SIZE)
+    :param cursor: Position of the last record on the previous page (None for the first page)
+    :param exact_total: Count every matching record rather than stopping at SEARCH_TOTAL_ROWS_CAP
+    :param total: Total counted by the first page of the search (counted again when None)
     """
-    app_pks_and_types = _get_search_ids_and_types(terms, user)
+    if limit is None:
+        limit = SEARCH_PAGE_SIZE
 
-    get_result_row = _get_result_row if terms.case_type == "import" else _get_export_result_row
+    # Search is read-heavy so is read from the replica (if there is one), see read_your_writes
+    with use_replica():
+        applications = _get_search_queryset(terms, user)
+        if total is None:
+            total = _get_total_rows(applications, exact_total)
 
-    records: list[types.ResultRow] = []
+        app_pks_and_types, next_cursor = _get_search_ids_and_types(applications, limit, cursor)
 
-    user_org_perms = utils.UserOrganisationPermissions(user, terms.case_type)
-    for queryset in _get_search_records(app_pks_and_types[:limit]):
-        for rec in queryset:
-            row = get_result_row(rec, user_org_perms)
-            records.append(row)  # type:ignore[arg-type]
+        user_org_perms = utils.UserOrganisationPermissions(user, terms.case_type)
+        records = _get_result_rows(terms.case_type, app_pks_and_types, user_org_perms)
 
     # Sort the records by order_by_datetime DESC (submitted date or created date)
-    records.sort(key=attrgetter("order_by_datetime"), reverse=True)
+    records.sort(key=attrgetter("order_by_datetime", "app_pk"), reverse=True)
 
-    return types.SearchResults(total_rows=len(app_pks_and_types), records=records)
+    return types.SearchResults(
+        total_rows=total.total_rows,
+        records=records,
+        total_rows_capped=total.capped,
+        next_cursor=next_cursor,
+    )
+
+
+def refresh_search_rows(app_pks: Collection[int]) -> None:
+    """Create or update the ApplicationSearchRow records of the supplied applications."""
+
+    app_pks_and_types = [
+        types.ProcessTypeAndPK(process_type, pk)
+        for model in [ImportApplication, ExportApplication]
+        for process_type, pk in model.objects.filter(pk__in=app_pks).values_list(
+            "process_type", "pk"
+        )
+    ]
+
+    search_rows = []
+    for queryset in _get_search_records(app_pks_and_types):
+        for rec in queryset:
+            if rec.is_import_application():
+                row: types.ResultRow = _get_result_row(rec)
+            else:
+                row = _get_export_result_row(rec)
+
+            search_rows.append(projection.build_search_row(rec, row))
+
+    ApplicationSearchRow.objects.bulk_create(
+        search_rows,
+        update_conflicts=True,
+        unique_fields=["application"],
+        update_fields=[
+            "case_type",
+            "process_type",
+            "reference",
+            "status",
+            "order_by_datetime",
+            "result_data",
+            "action_data",
+            "updated_at",
+        ],
+    )
+
+
+def iter_search_results(
+    terms: types.SearchTerms, user: User, page_size: int = SEARCH_PAGE_SIZE
+) -> Iterator[types.SearchResults]:
+    """Yield every page of records matching the supplied search terms.
+
+    Every page has the exact total_rows value counted by the first page.
+    """
+
+    cursor = None
+    total = None
+
+    while True:
+        results = search_applications(
+            terms, user, page_size, cursor=cursor, exact_total=True, total=total
+        )
+        total = types.SearchTotal(results.total_rows, results.total_rows_capped)
+
+        yield results
+
+        if not results.next_cursor:
+            return
+
+        cursor = results.next_cursor
 
 
 def get_search_results_spreadsheet(case_type: str, results: types.SearchResults) -> bytes:
     """Return a spreadsheet of the supplied search results"""
 
+    config = _get_search_results_sheet_config(case_type, results.records)
+
+    return generate_xlsx_file([config])
+
+
+def write_search_results_spreadsheet(
+    case_type: str, records: Iterable[types.ResultRow], file_obj: IO[bytes]
+) -> None:
+    """Write a spreadsheet of the supplied search records to file_obj.
+
+    The workbook is written in constant memory mode so records can be a generator
+    yielding any number of search records.
+    """
+
+    config = _get_search_results_sheet_config(case_type, records)
+
+    write_xlsx_file(file_obj, [config])
+
+
+def _get_search_results_sheet_config(
+    case_type: str, records: Iterable[types.ResultRow]
+) -> XlsxSheetConfig:
     rows: Iterable[types.SpreadsheetRow | types.ExportSpreadsheetRow]
 
     if case_type == "import":
@@ -85,7 +198,7 @@ def get_search_results_spreadsheet(case_type: str, results: types.SearchResults)
             "Goods Category",
             "Commodity Code(s)",
         ]
-        rows = _get_import_spreadsheet_rows(results.records)  # type:ignore[arg-type]
+        rows = _get_import_spreadsheet_rows(records)  # type:ignore[arg-type]
 
     else:
         header_data = [
@@ -101,16 +214,16 @@ def get_search_results_spreadsheet(case_type: str, results: types.SearchResults)
             "Application Contact",
         ]
 
-        rows = _get_export_spreadsheet_rows(results.records)  # type:ignore[arg-type]
+        rows = _get_export_spreadsheet_rows(records)  # type:ignore[arg-type]
 
     config = XlsxSheetConfig()
     config.header.data = header_data
     config.header.styles = {"bold": True}
-    config.rows = rows  # type: ignore[assignment]
+    config.rows = rows
     config.column_width = 25
     config.sheet_name = "Sheet 1"
 
-    return generate_xlsx_file([config])
+    return config
 
 
 def get_import_status_choices() -> list[tuple[Any, str]]:
@@ -148,11 +261,27 @@ def get_export_status_choices() -> list[tuple[Any, str]]:
     ]
 
 
+# Fields with an UPPER(field) text_pattern_ops index that can serve prefix searches.
+# All other wildcard searches use ILIKE, which can use the pg_trgm GIN indexes on these
+# fields (and on the application contact names) wherever the wildcards are in the pattern.
+PREFIX_INDEXED_FIELDS = frozenset(
+    {
+        "reference",
+        "licences__document_references__reference",
+        "certificates__document_references__reference",
+    }
+)
+
+
 def get_wildcard_filter(field: str, search_pattern: str) -> models.Q:
     """Return the filter expression for the supplied field and search_pattern.
 
     Uses the ilike lookup and adds a % to the end of the string if not in the search_pattern.
 
+    Plain prefix patterns (e.g. "IMA/2024/") on fields in PREFIX_INDEXED_FIELDS use the
+    istartswith lookup instead, as that can be served by a btree index. Patterns with a leading
+    or inner wildcard (e.g. "IMA/%3/%3") are left to the trigram indexes.
+
     :param field: The name of the field to search on
     :param search_pattern: the user supplied search pattern
     """
@@ -163,30 +292,132 @@ def get_wildcard_filter(field: str, search_pattern: str) -> models.Q:
     if not search_pattern.endswith("%"):
         search_pattern += "%"
 
+    prefix = search_pattern.rstrip("%")
+
+    if field in PREFIX_INDEXED_FIELDS and _is_literal(prefix):
+        return models.Q(**{f"{field}__istartswith": prefix})
+
     search = {f"{field}__ilike": search_pattern}
 
     return models.Q(**search)
 
 
-def _get_search_ids_and_types(terms: types.SearchTerms, user: User) -> list[types.ProcessTypeAndPK]:
-    """Search ImportApplication records to find records matching the supplied terms.
+def _is_literal(search_pattern: str) -> bool:
+    """Return True if the search pattern has no ILIKE wildcard or escape characters."""
+
+    return not any(char in search_pattern for char in "%_\\")
+
+
+def _get_search_queryset(terms: types.SearchTerms, user: User) -> QuerySet[Model]:
+    """Return the applications matching the supplied terms that the user has access to.
 
-    Returns a list of pk and process_type pairs for all matching records.
+    The search filters can join to many related records (licences, FIRs, countries etc.),
+    so they are applied in a pk__in subquery rather than with DISTINCT. That leaves the
+    outer query free of joins so the keyset ordering can be served by an index.
     """
 
     if terms.case_type == "import":
         applications = utils.get_user_import_applications(user)
+        model = ImportApplication
     else:
         applications = utils.get_user_export_applications(user)
+        model = ExportApplication
+
+    matching = _apply_search(applications, terms).order_by().values("pk")
+
+    return model.objects.filter(pk__in=matching).annotate(
+        order_by_datetime=utils.get_order_by_datetime(terms.case_type)
+    )
+
+
+def _get_total_rows(applications: QuerySet[Model], exact_total: bool) -> types.SearchTotal:
+    """Return the number of matching applications and if that number has been capped.
+
+    Unless an exact total is requested counting stops after SEARCH_TOTAL_ROWS_CAP + 1 records.
+    """
+
+    app_pks = applications.order_by().values("pk")
+
+    if exact_total:
+        return types.SearchTotal(app_pks.count())
+
+    total_rows = app_pks[: SEARCH_TOTAL_ROWS_CAP + 1].count()
+
+    if total_rows > SEARCH_TOTAL_ROWS_CAP:
+        return types.SearchTotal(SEARCH_TOTAL_ROWS_CAP, capped=True)
+
+    return types.SearchTotal(total_rows)
+
+
+def _get_search_ids_and_types(
+    applications: QuerySet[Model], limit: int, cursor: types.SearchCursor | None
+) -> tuple[list[types.ProcessTypeAndPK], types.SearchCursor | None]:
+    """Return a page of pk and process_type pairs for the supplied applications.
+
+    Pages are fetched using keyset pagination on (order_by_datetime, pk). Import applications
+    are read in order from IA_search_order_idx so a page only reads the records on that page.
+    Export applications order by COALESCE(submit_datetime, created), which spans the process and
+    export application tables, so Postgres still sorts the matching records (a top-N sort).
 
-    applications = _apply_search(applications, terms)
-    applications = applications.order_by("-order_by_datetime")
-    applications = applications.distinct()
+    Returns the page and the cursor needed to fetch the next page (None if this is the last page).
+    """
+
+    if cursor:
+        applications = applications.filter(
+            models.Q(order_by_datetime__lt=cursor.order_by_datetime)
+            | models.Q(order_by_datetime=cursor.order_by_datetime, pk__lt=cursor.pk)
+        )
+
+    applications = applications.order_by("-order_by_datetime", "-pk")
+
+    # Fetch an extra record to check if there is a next page.
+    page = list(applications.values_list("process_type", "pk", "order_by_datetime")[: limit + 1])
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        _, last_pk, last_order_by_datetime = page[-1]
+        next_cursor = types.SearchCursor(last_order_by_datetime, last_pk)
+
+    app_pks_and_types = [types.ProcessTypeAndPK(pt, pk) for pt, pk, _ in page]
+
+    return app_pks_and_types, next_cursor
+
+
+def _get_result_rows(
+    case_type: str,
+    app_pks_and_types: list[types.ProcessTypeAndPK],
+    user_org_perms: utils.UserOrganisationPermissions,
+) -> list[types.ResultRow]:
+    """Return the result rows for the supplied applications.
 
-    app_pks_and_types = applications.values_list("pk", "process_type", named=True)
+    Rows are loaded from the ApplicationSearchRow projection with a single query. Any
+    application without a search row (e.g. one waiting for its row to be refreshed) is loaded
+    from the application tables instead.
+    """
+
+    records = [
+        projection.get_result_row(search_row, user_org_perms)
+        for search_row in projection.get_search_rows([app.pk for app in app_pks_and_types])
+    ]
+
+    loaded = {row.app_pk for row in records}
+    missing = [app for app in app_pks_and_types if app.pk not in loaded]
+
+    for queryset in _get_search_records(missing):
+        for rec in queryset:
+            row: types.ResultRow
+
+            if case_type == "import":
+                row = _get_result_row(rec)
+                row.actions = get_import_record_actions(rec, user_org_perms)
+            else:
+                row = _get_export_result_row(rec)
+                row.actions = get_export_record_actions(rec, user_org_perms)
+
+            records.append(row)
 
-    # evaluate the queryset once
-    return list(app_pks_and_types)
+    return records
 
 
 def _get_search_records(
@@ -223,10 +454,8 @@ def _get_search_records(
         yield search_func(search_ids)
 
 
-def _get_result_row(
-    rec: ImportApplication, user_org_perms: utils.UserOrganisationPermissions
-) -> types.ImportResultRow:
-    """Process the incoming application and return a result row."""
+def _get_result_row(rec: ImportApplication) -> types.ImportResultRow:
+    """Process the incoming application and return a result row (without actions)."""
 
     start_date = (
         rec.latest_licence_start_date.strftime("%d %b %Y")
@@ -272,16 +501,16 @@ def _get_result_row(
         ),
         commodity_details=commodity_details,
         assignee_details=_get_assignee_details(rec),
-        actions=get_import_record_actions(rec, user_org_perms),
+        actions=[],
         order_by_datetime=rec.order_by_datetime,  # This is an annotation
     )
 
     return row
 
 
-def _get_export_result_row(
-    rec: ExportApplication, user_org_permissions: utils.UserOrganisationPermissions
-) -> types.ExportResultRow:
+def _get_export_result_row(rec: ExportApplication) -> types.ExportResultRow:
+    """Process the incoming application and return a result row (without actions)."""
+
     app_type_label = ProcessTypes(rec.process_type).label
     application_contact = rec.contact.full_name if rec.contact else ""
     submitted_at = (
@@ -310,7 +539,7 @@ def _get_export_result_row(
         manufacturer_countries=manufacturer_countries,
         assignee_details=_get_assignee_details(rec),
         agent_name=rec.agent.name if rec.agent else None,
-        actions=get_export_record_actions(rec, user_org_permissions),
+        actions=[],
         order_by_datetime=rec.order_by_datetime,  # This is an annotation
     )
 
@@ -492,8 +721,6 @@ def _apply_search(model: QuerySet[Model], terms: types.SearchTerms) -> QuerySet[
     if terms.case_type == "export":
         model = _apply_export_application_filter(model, terms)
 
-    model = model.annotate(order_by_datetime=utils.get_order_by_datetime(terms.case_type))
-
     return model
 
 
@@ -726,7 +953,7 @@ def _get_country_filter(country_qs: QuerySet[Country], field: str) -> dict[str,
 
 
 def _get_import_spreadsheet_rows(
-    records: list[types.ImportResultRow],
+    records: Iterable[types.ImportResultRow],
 ) -> Iterable[types.SpreadsheetRow]:
     """Converts the incoming records in to a spreadsheet row."""
 
@@ -761,7 +988,7 @@ def _get_import_spreadsheet_rows(
 
 
 def _get_export_spreadsheet_rows(
-    records: list[types.ExportResultRow],
+    records: Iterable[types.ExportResultRow],
 ) -> Iterable[types.ExportSpreadsheetRow]:
     for row in records:
         # c is a two element tuple (certificate reference, certificate link)
@@ -0,0 +1,169 @@
+import dataclasses
+import datetime as dt
+from typing import Any, NamedTuple
+
+from web.models import ApplicationSearchRow, ExportApplication, ImportApplication
+
+from . import types
+from .actions import get_export_record_actions, get_import_record_actions
+from .utils import UserOrganisationPermissions
+
+
+class SearchRowApplicationType(NamedTuple):
+    type: str | None
+
+
+class SearchRowSupplementaryInfo(NamedTuple):
+    is_complete: bool | None
+
+
+@dataclasses.dataclass
+class SearchRowApplication:
+    """The application fields used by the search actions, loaded from an ApplicationSearchRow.
+
+    Allows the actions in web.utils.search.actions to be checked without loading the application.
+    """
+
+    APPROVE = ImportApplication.APPROVE
+
+    pk: int
+    case_type: str
+    process_type: str
+    status: str
+    decision: str | None
+    importer_id: int | None
+    exporter_id: int | None
+    agent_id: int | None
+    application_type: SearchRowApplicationType
+    supplementary_info: SearchRowSupplementaryInfo
+    latest_licence_end_date: dt.date | None
+    latest_certificate_issue_datetime: dt.datetime | None
+
+    def is_import_application(self) -> bool:
+        return self.case_type == "import"
+
+
+def get_search_rows(app_pks: list[int]) -> list[ApplicationSearchRow]:
+    """Return the search rows of the supplied applications."""
+
+    return list(ApplicationSearchRow.objects.filter(pk__in=app_pks))
+
+
+def get_result_row(
+    search_row: ApplicationSearchRow, user_org_perms: UserOrganisationPermissions
+) -> types.ResultRow:
+    """Return the result row stored in the supplied search row."""
+
+    app = _load_search_row_application(search_row)
+    data = search_row.result_data
+
+    if search_row.case_type == "import":
+        return types.ImportResultRow(
+            app_pk=data["app_pk"],
+            actions=get_import_record_actions(app, user_org_perms),  # type:ignore[arg-type]
+            submitted_at=data["submitted_at"],
+            case_status=types.CaseStatus(**data["case_status"]),
+            applicant_details=types.ApplicantDetails(**data["applicant_details"]),
+            commodity_details=types.CommodityDetails(**data["commodity_details"]),
+            assignee_details=types.AssigneeDetails(**data["assignee_details"]),
+            order_by_datetime=search_row.order_by_datetime,
+        )
+
+    return types.ExportResultRow(
+        app_pk=data["app_pk"],
+        actions=get_export_record_actions(app, user_org_perms),  # type:ignore[arg-type]
+        case_reference=data["case_reference"],
+        application_type=data["application_type"],
+        status=data["status"],
+        certificates=[(reference, url) for reference, url in data["certificates"]],
+        submitted_at=data["submitted_at"],
+        order_by_datetime=search_row.order_by_datetime,
+        origin_countries=data["origin_countries"],
+        organisation_name=data["organisation_name"],
+        application_contact=data["application_contact"],
+        manufacturer_countries=data["manufacturer_countries"],
+        assignee_details=types.AssigneeDetails(**data["assignee_details"]),
+        agent_name=data["agent_name"],
+    )
+
+
+def build_search_row(
+    rec: ImportApplication | ExportApplication, row: types.ResultRow
+) -> ApplicationSearchRow:
+    """Return an (unsaved) search row for the supplied application and result row."""
+
+    result_data = dataclasses.asdict(row)
+
+    # Actions depend on the user performing the search.
+    del result_data["actions"]
+    del result_data["order_by_datetime"]
+
+    return ApplicationSearchRow(
+        application_id=rec.pk,
+        case_type="import" if rec.is_import_application() else "export",
+        process_type=rec.process_type,
+        reference=rec.reference,
+        status=rec.status,
+        order_by_datetime=row.order_by_datetime,
+        result_data=result_data,
+        action_data=_get_action_data(rec),
+    )
+
+
+def _get_action_data(rec: ImportApplication | ExportApplication) -> dict[str, Any]:
+    """Return the application fields used by the search actions."""
+
+    if rec.is_import_application():
+        application_type = rec.application_type.type
+
+        # Only firearms applications have supplementary info (see ProvideSupplementaryReportAction)
+        if application_type == rec.application_type.Types.FIREARMS:
+            supplementary_info_complete = rec.supplementary_info.is_complete
+        else:
+            supplementary_info_complete = None
+
+        return {
+            "importer_id": rec.importer_id,
+            "exporter_id": None,
+            "agent_id": rec.agent_id,
+            "application_type": application_type,
+            "supplementary_info_complete": supplementary_info_complete,
+            "latest_licence_end_date": rec.latest_licence_end_date,
+            "latest_certificate_issue_datetime": None,
+            "decision": rec.decision,
+        }
+
+    return {
+        "importer_id": None,
+        "exporter_id": rec.exporter_id,
+        "agent_id": rec.agent_id,
+        "application_type": None,
+        "supplementary_info_complete": None,
+        "latest_licence_end_date": None,
+        "latest_certificate_issue_datetime": rec.latest_certificate_issue_datetime,
+        "decision": rec.decision,
+    }
+
+
+def _load_search_row_application(search_row: ApplicationSearchRow) -> SearchRowApplication:
+    data = search_row.action_data
+
+    end_date = data["latest_licence_end_date"]
+    issue_datetime = data["latest_certificate_issue_datetime"]
+
+    return SearchRowApplication(
+        pk=search_row.pk,
+        case_type=search_row.case_type,
+        process_type=search_row.process_type,
+        status=search_row.status,
+        decision=data["decision"],
+        importer_id=data["importer_id"],
+        exporter_id=data["exporter_id"],
+        agent_id=data["agent_id"],
+        application_type=SearchRowApplicationType(data["application_type"]),
+        supplementary_info=SearchRowSupplementaryInfo(data["supplementary_info_complete"]),
+        latest_licence_end_date=dt.date.fromisoformat(end_date) if end_date else None,
+        latest_certificate_issue_datetime=(
+            dt.datetime.fromisoformat(issue_datetime) if issue_datetime else None
+        ),
+    )
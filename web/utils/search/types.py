@@ -56,6 +56,64 @@ class ProcessTypeAndPK(NamedTuple):
     pk: int
 
 
+class SearchCursor(NamedTuple):
+    """Keyset position of the last record shown on a page of search results.
+
+    Records are ordered by (order_by_datetime DESC, pk DESC) so the next page is every
+    record that sorts after this pair.
+    """
+
+    order_by_datetime: dt.datetime
+    pk: int
+
+    def encode(self) -> str:
+        return f"{self.order_by_datetime.isoformat()}_{self.pk}"
+
+    @classmethod
+    def decode(cls, value: str) -> Optional["SearchCursor"]:
+        """Load a cursor from a value created by `SearchCursor.encode`.
+
+        Returns None if the value is invalid.
+        """
+
+        try:
+            order_by_datetime, pk = value.rsplit("_", maxsplit=1)
+            cursor = cls(dt.datetime.fromisoformat(order_by_datetime), int(pk))
+        except ValueError:
+            return None
+
+        # Cursors are always created from aware datetimes
+        if cursor.order_by_datetime.tzinfo is None:
+            return None
+
+        return cursor
+
+
+class SearchTotal(NamedTuple):
+    """Number of records matching a search, counted on the first page and reused by later pages."""
+
+    total_rows: int
+    # True when more than total_rows records matched and an exact count wasn't requested
+    capped: bool = False
+
+    def encode(self) -> str:
+        return f"{self.total_rows}{'+' if self.capped else ''}"
+
+    @classmethod
+    def decode(cls, value: str) -> Optional["SearchTotal"]:
+        """Load a total from a value created by `SearchTotal.encode`.
+
+        Returns None if the value is invalid.
+        """
+
+        total_rows, capped = value.removesuffix("+"), value.endswith("+")
+
+        if not total_rows.isdigit():
+            return None
+
+        return cls(int(total_rows), capped)
+
+
 @dataclass
 class CaseStatus:
     case_reference: str
@@ -160,6 +218,10 @@ ResultRow = Union[ImportResultRow, ExportResultRow]
 class SearchResults:
     total_rows: int
     records: list[ResultRow]
+    # True when more than total_rows records matched and an exact count wasn't requested
+    total_rows_capped: bool = False
+    # Position to continue from when fetching the next page (None if this is the last page)
+    next_cursor: SearchCursor | None = None
 
 
 class SpreadsheetRow(NamedTuple):
@@ -1,8 +1,12 @@
+import codecs
+import csv
 import io
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import IO, Any
 
 import xlsxwriter
+from xlsxwriter.format import Format
 
 from web.types import TypedTextChoices
 
@@ -18,7 +22,7 @@ class XlsxSheetConfig:
     header: XlsxHeaderData = field(repr=False, default_factory=XlsxHeaderData)
     column_width: int | None = field(repr=False, default=None)
     sheet_name: str = field(default_factory=str)
-    rows: list[list[str]] | None = field(repr=False, default=None)
+    rows: Iterable[Iterable[Any]] | None = field(repr=False, default=None)
 
 
 def generate_xlsx_file(
@@ -27,34 +31,112 @@ def generate_xlsx_file(
     """Generates an xlsx file from the provided config"""
 
     output = io.BytesIO()
-    with xlsxwriter.Workbook(output, options) as workbook:
-        for sheet in sheets:
-            add_worksheet(workbook, sheet)
+    write_xlsx_file(output, sheets, options)
 
     xlsx_data = output.getvalue()
     return xlsx_data
 
 
+def write_xlsx_file(
+    file_obj: IO[bytes], sheets: list[XlsxSheetConfig], options: dict[str, Any] | None = None
+) -> None:
+    """Writes an xlsx file from the provided config to file_obj.
+
+    The workbook is written in constant memory mode, each row is flushed to a temporary file once
+    it has been written, so the rows of each sheet can be a generator yielding any number of rows.
+    """
+
+    options = {"constant_memory": True, **(options or {})}
+
+    with xlsxwriter.Workbook(file_obj, options) as workbook:
+        for sheet in sheets:
+            add_worksheet(workbook, sheet)
+
+
 def add_worksheet(workbook: xlsxwriter.Workbook, config: XlsxSheetConfig) -> None:
-    worksheet = workbook.add_worksheet(config.sheet_name)
-    header_style = workbook.add_format(config.header.styles)
-    cell_format = workbook.add_format()
-    cell_format.set_align("top")
-    cell_format.set_align("left")
-    for column, value in enumerate(config.header.data):
-        worksheet.write(0, column, value, header_style)
+    XlsxSheetWriter(workbook, config).write_rows(config.rows or [])
+
+
+class XlsxSheetWriter:
+    """Adds a worksheet with a header to a workbook and writes rows to it one at a time.
+
+    Rows can be written as they are produced, with a constant_memory workbook this allows a sheet
+    to be written without holding every row in memory.
+    """
+
+    def __init__(self, workbook: xlsxwriter.Workbook, config: XlsxSheetConfig) -> None:
+        self.worksheet = workbook.add_worksheet(config.sheet_name)
+        header_style = workbook.add_format(config.header.styles)
+        self.cell_format = workbook.add_format()
+        self.cell_format.set_align("top")
+        self.cell_format.set_align("left")
+        for column, value in enumerate(config.header.data):
+            self.worksheet.write(0, column, value, header_style)
+
+        columns = len(config.header.data)
+        if config.column_width and columns:
+            self.worksheet.set_column(0, columns - 1, config.column_width)
 
-    columns = len(config.header.data)
-    if config.column_width and columns:
-        worksheet.set_column(0, columns - 1, config.column_width)
+        self.row_count = 0
 
-    rows = config.rows or []
+        # Strings and numbers are written with their typed write method rather than worksheet.write
+        # which has to work out the type of every cell (and converts formula or url strings).
+        self._write_methods: dict[type, Callable[..., int]] = {
+            str: self._write_string,
+            int: self.worksheet.write_number,
+            float: self.worksheet.write_number,
+        }
+
+    def _write_string(self, row: int, column: int, data: str, cell_format: Format) -> int:
+        # Empty strings are written as blank cells, the same as worksheet.write
+        if data:
+            return self.worksheet.write_string(row, column, data, cell_format)
+
+        return self.worksheet.write_blank(row, column, data, cell_format)
+
+    def write_row(self, row_data: Iterable[Any]) -> None:
+        row = self.row_count + 1
+        write_methods = self._write_methods
+        write = self.worksheet.write
 
-    for row, row_data in enumerate(rows, start=1):
         for column, data in enumerate(row_data):
-            worksheet.write(row, column, data, cell_format)
+            write_methods.get(type(data), write)(row, column, data, self.cell_format)
+
+        self.row_count += 1
+
+    def write_rows(self, rows: Iterable[Iterable[Any]]) -> None:
+        for row_data in rows:
+            self.write_row(row_data)
+
+
+def write_csv_file(file_obj: IO[bytes], header: list[str], rows: Iterable[Iterable[Any]]) -> None:
+    """Writes a utf-8 encoded csv file of the header and rows to file_obj."""
+
+    CsvWriter(file_obj, header).write_rows(rows)
+
+
+class CsvWriter:
+    """Writes a header and then rows one at a time to a utf-8 encoded csv file.
+
+    Rows are written to file_obj as they are produced, so a file of any number of rows can be
+    written without holding them in memory.
+    """
+
+    def __init__(self, file_obj: IO[bytes], header: list[str]) -> None:
+        self.writer = csv.writer(codecs.getwriter("utf-8")(file_obj))
+        self.writer.writerow(header)
+        self.row_count = 0
+
+    def write_row(self, row_data: Iterable[Any]) -> None:
+        self.writer.writerow(row_data)
+        self.row_count += 1
+
+    def write_rows(self, rows: Iterable[Iterable[Any]]) -> None:
+        for row_data in rows:
+            self.write_row(row_data)
 
 
 class MIMETYPE(TypedTextChoices):
     CSV = ("application/csv", "CSV")
     XLSX = ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "XLSX")
+    PARQUET = ("application/vnd.apache.parquet", "Parquet")